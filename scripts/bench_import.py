@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Measure how long fresh interpreters take to import kernel modules."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_ROOT = REPO_ROOT / "src"
+
+_PROBE = """
+import sys, time
+sys.path.insert(0, {src!r})
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+{access}
+accessed = time.perf_counter()
+print((imported - started) * 1000.0, (accessed - imported) * 1000.0, "yaml" in sys.modules)
+"""
+
+
+def run_probe(module: str, access: str, env: Dict[str, str]) -> List[float | bool]:
+    code = _PROBE.format(src=str(SRC_ROOT), module=module, access=access or "pass")
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout.split()
+    return [float(output[0]), float(output[1]), output[2] == "True"]
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark kernel import and first-access latency")
+    parser.add_argument("--module", default="kernel.types", help="Module to import in each run")
+    parser.add_argument(
+        "--access",
+        default="kernel.types.task.TYPE_KEY",
+        help="Expression evaluated after the import (empty to skip)",
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Number of fresh interpreters to start")
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="Use an empty registry cache directory for every run",
+    )
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    import_ms: List[float] = []
+    access_ms: List[float] = []
+    yaml_imported = 0
+    with tempfile.TemporaryDirectory(prefix="kernel-bench-") as scratch:
+        for index in range(args.runs):
+            env = dict(os.environ)
+            env["KERNEL_REGISTRY_CACHE_DIR"] = str(Path(scratch) / (str(index) if args.cold else "shared"))
+            imported, accessed, yaml_loaded = run_probe(args.module, args.access, env)
+            import_ms.append(imported)
+            access_ms.append(accessed)
+            yaml_imported += bool(yaml_loaded)
+
+    summary = {
+        "module": args.module,
+        "access": args.access,
+        "runs": args.runs,
+        "cold": args.cold,
+        "import_ms": {"median": round(statistics.median(import_ms), 2), "min": round(min(import_ms), 2)},
+        "first_access_ms": {"median": round(statistics.median(access_ms), 2), "min": round(min(access_ms), 2)},
+        "runs_importing_yaml": yaml_imported,
+    }
+    print(json.dumps(summary, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
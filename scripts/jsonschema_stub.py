@@ -92,6 +92,8 @@ class Draft7Validator:
             yield from self._validate_array(instance, schema, path, schema_base)
         elif isinstance(instance, dict):
             yield from self._validate_object(instance, schema, path, schema_base)
+        elif isinstance(instance, (int, float)) and not isinstance(instance, bool):
+            yield from self._validate_number(instance, schema, path)
 
         one_of = schema.get("oneOf")
         if one_of is not None:
@@ -131,6 +133,20 @@ class Draft7Validator:
             return f"Expected instance to be one of {schema_type}, got {type(instance).__name__}"
         return f"Expected type {schema_type}, got {type(instance).__name__}"
 
+    def _validate_number(self, instance: float, schema: Dict[str, Any], path: List[Any]) -> Iterator[ValidationError]:
+        minimum = schema.get("minimum")
+        if minimum is not None and instance < minimum:
+            yield ValidationError(f"{instance!r} is less than the minimum of {minimum!r}", list(path))
+        maximum = schema.get("maximum")
+        if maximum is not None and instance > maximum:
+            yield ValidationError(f"{instance!r} is greater than the maximum of {maximum!r}", list(path))
+        exclusive_minimum = schema.get("exclusiveMinimum")
+        if exclusive_minimum is not None and instance <= exclusive_minimum:
+            yield ValidationError(f"{instance!r} is less than or equal to the minimum of {exclusive_minimum!r}", list(path))
+        exclusive_maximum = schema.get("exclusiveMaximum")
+        if exclusive_maximum is not None and instance >= exclusive_maximum:
+            yield ValidationError(f"{instance!r} is greater than or equal to the maximum of {exclusive_maximum!r}", list(path))
+
     def _validate_string(self, instance: str, schema: Dict[str, Any], path: List[Any]) -> Iterator[ValidationError]:
         min_length = schema.get("minLength")
         if min_length is not None and len(instance) < min_length:
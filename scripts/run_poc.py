@@ -21,7 +21,9 @@ if str(SRC_ROOT) not in sys.path:
 
 from kernel.derived import DerivedEvaluator, EvaluationResult
 from kernel.registry import SchemaLoader, TypeRegistry
+from kernel.storage import ItemStore
 from kernel.types import bootstrap_types, get_manifest, list_registered_types
+from kernel.validation.cache import ValidationCache, default_cache_dir, item_digest, jsonschema_engine
 SCHEMA_ROOT = REPO_ROOT / "schema"
 DEFAULT_ITEMS_DIR = REPO_ROOT / "tests" / "fixtures" / "items"
 
@@ -34,18 +36,47 @@ def load_items(directory: Path) -> List[Tuple[Path, MutableMapping[str, object]]
     return items
 
 
-def validate_items(items: Sequence[Tuple[Path, Mapping[str, object]]]) -> Tuple[bool, List[str]]:
+def load_store_items(root: Path) -> List[Tuple[Path, MutableMapping[str, object]]]:
+    """Read every item of the item store at ``root``, verifying its checksum."""
+
+    store = ItemStore(root)
+    return [(store.path_for(item), item) for item in store.iter_items(verify=True)]
+
+
+def validate_items(
+    items: Sequence[Tuple[Path, Mapping[str, object]]],
+    cache_dir: Path | None = None,
+) -> Tuple[bool, List[str]]:
+    """Validate ``items`` against the base schema.
+
+    With ``cache_dir`` set, items whose content and schema graph are unchanged
+    since a previous run reuse the recorded outcome instead of re-validating.
+    """
+
     schema_path = SCHEMA_ROOT / "item_base.json"
     schema = json.loads(schema_path.read_text(encoding="utf-8"))
     if jsonschema is not None:
         base_uri = schema_path.resolve().parent.as_uri() + "/"
         resolver = jsonschema.RefResolver(base_uri=base_uri, referrer=schema)
         validator = jsonschema.Draft7Validator(schema, resolver=resolver)
+        cache = (
+            ValidationCache.for_schema(schema_path, engine=jsonschema_engine(), cache_dir=cache_dir)
+            if cache_dir is not None
+            else None
+        )
         messages: List[str] = []
         for path, payload in items:
-            errors = sorted(validator.iter_errors(payload), key=lambda err: list(err.path))
-            if errors:
-                messages.append(f"{path.name}: {errors[0].message}")
+            digest = item_digest(payload) if cache is not None else ""
+            cached = cache.get(digest) if cache is not None else None
+            if cached is None:
+                errors = sorted(validator.iter_errors(payload), key=lambda err: list(err.path))
+                cached = tuple((tuple(error.path), error.message) for error in errors)
+                if cache is not None:
+                    cache.put(digest, cached)
+            if cached:
+                messages.append(f"{path.name}: {cached[0][1]}")
+        if cache is not None:
+            cache.save()
         return (not messages, messages)
 
     # Fallback validation performs a lightweight structural check.
@@ -114,17 +145,34 @@ def main(argv: Iterable[str] | None = None) -> int:
         default=DEFAULT_ITEMS_DIR,
         help="Directory containing sample item payloads",
     )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="Item store root (e.g. /data) to read items from instead of --items-dir",
+    )
     parser.add_argument(
         "--derived-root",
         type=Path,
         default=SCHEMA_ROOT / "derived",
         help="Directory containing derived metric definitions",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Validation result cache directory (default: $KERNEL_VALIDATION_CACHE_DIR or var/validation)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-validate every item instead of reusing cached results",
+    )
     args = parser.parse_args(list(argv) if argv is not None else None)
 
     ensure_registry(SCHEMA_ROOT)
-    items = load_items(args.items_dir)
-    ok, messages = validate_items(items)
+    items = load_store_items(args.store) if args.store is not None else load_items(args.items_dir)
+    ok, messages = validate_items(items, None if args.no_cache else args.cache_dir or default_cache_dir())
     if not ok:
         for message in messages:
             print(f"Validation error: {message}", file=sys.stderr)
@@ -5,20 +5,17 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable
 
-try:
-    from jsonschema import Draft7Validator, RefResolver  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover - fallback for offline environments
-    from jsonschema_stub import Draft7Validator, RefResolver
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_ROOT = REPO_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
 
-
-def load_schema(schema_path: Path) -> dict:
-    with schema_path.open("r", encoding="utf-8") as fp:
-        schema = json.load(fp)
-    schema["__base_path__"] = schema_path.parent
-    return schema
+from kernel.validation.bulk import DEFAULT_SHARD_SIZE, build_validator, iter_sources, validate_bulk, validator_engine
+from kernel.validation.cache import ValidationCache, content_digest
 
 
 def iter_fixtures(fixtures_dir: Path) -> Iterable[Path]:
@@ -27,25 +24,61 @@ def iter_fixtures(fixtures_dir: Path) -> Iterable[Path]:
             yield path
 
 
-def validate(fixtures: Iterable[Path], schema: dict, resolver: RefResolver) -> int:
-    validator = Draft7Validator(schema, resolver=resolver)
+def validate(fixtures: Iterable[Path], validator: Any, cache: ValidationCache | None = None) -> int:
     failures = 0
     for fixture in fixtures:
-        with fixture.open("r", encoding="utf-8") as fp:
-            payload = json.load(fp)
-        errors = sorted(validator.iter_errors(payload), key=lambda e: e.path)
+        content = fixture.read_bytes()
+        digest = content_digest(content) if cache is not None else ""
+        cached = cache.get(digest) if cache is not None else None
+        if cached is not None:
+            errors = [(list(path), message) for path, message in cached]
+        else:
+            payload = json.loads(content.decode("utf-8"))
+            found = sorted(validator.iter_errors(payload), key=lambda e: e.path)
+            errors = [(list(error.path), error.message) for error in found]
+            if cache is not None:
+                cache.put(digest, errors)
         if errors:
             failures += 1
             print(f"✖ {fixture.relative_to(Path.cwd())}")
-            for error in errors:
-                location = ".".join(str(part) for part in error.path)
-                print(f"    → {location or '<root>'}: {error.message}")
+            for path, message in errors:
+                location = ".".join(str(part) for part in path)
+                print(f"    → {location or '<root>'}: {message}")
         else:
             print(f"✔ {fixture.relative_to(Path.cwd())}")
     return failures
 
 
-def main() -> int:
+def open_cache(args: argparse.Namespace, engine: str) -> ValidationCache | None:
+    if args.no_cache:
+        return None
+    return ValidationCache.for_schema(args.schema.resolve(), engine=engine, cache_dir=args.cache_dir)
+
+
+def run_bulk(args: argparse.Namespace) -> int:
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+    report_out = args.report.open("w", encoding="utf-8") if args.report else sys.stdout
+    try:
+        report = validate_bulk(
+            iter_sources(args.bulk, args.pattern),
+            schema_path=args.schema.resolve(),
+            workers=args.workers,
+            shard_size=args.shard_size,
+            errors_out=report_out,
+            max_errors=args.max_errors,
+            progress=sys.stderr,
+            report_interval=args.report_interval,
+            cache=open_cache(args, validator_engine()),
+        )
+    finally:
+        if report_out is not sys.stdout:
+            report_out.close()
+    print(json.dumps(report.to_dict(), indent=2, sort_keys=True), file=sys.stderr if not args.report else sys.stdout)
+    return 1 if report.invalid or report.failed else 0
+
+
+def main(argv: Iterable[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
         "--fixtures",
@@ -59,15 +92,61 @@ def main() -> int:
         default=Path("schema/item_base.json"),
         help="Schema file to validate against.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--bulk",
+        default=None,
+        metavar="SOURCE",
+        help="Validate a whole item tree (e.g. /data), a .jsonl file or '-' (JSONL on stdin) in parallel.",
+    )
+    parser.add_argument("--pattern", default="*.json", help="Item filename pattern for --bulk trees.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --bulk (defaults to the CPU count, 0 runs in-process).",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help="Items handed to a --bulk worker at once.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="JSONL error report for --bulk (defaults to stdout).",
+    )
+    parser.add_argument("--max-errors", type=int, default=50, help="Errors recorded per invalid --bulk item.")
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between --bulk progress lines on stderr.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Validation result cache directory (default: $KERNEL_VALIDATION_CACHE_DIR or var/validation).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-validate every item instead of reusing results for unchanged items and schemas.",
+    )
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    if args.bulk is not None:
+        return run_bulk(args)
 
-    schema_path = args.schema.resolve()
-    schema = load_schema(schema_path)
-    base_uri = schema_path.parent.resolve().as_uri() + "/"
-    resolver = RefResolver(base_uri=base_uri, referrer=schema)
+    validator = build_validator(args.schema.resolve())
+    cache = open_cache(args, validator_engine())
 
     fixtures_dir = args.fixtures.resolve()
-    failures = validate(iter_fixtures(fixtures_dir), schema, resolver)
+    failures = validate(iter_fixtures(fixtures_dir), validator, cache)
+    if cache is not None:
+        cache.save()
     return 1 if failures else 0
 
 
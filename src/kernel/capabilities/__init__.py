@@ -8,7 +8,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, Mapping, Sequence, Tuple
 
-from kernel.registry import SchemaLoader, TypeRegistry
+from kernel.observability import emit_event
+from kernel.registry import SchemaLoader, SchemaLoadReport, TypeRegistry
+from kernel.registry.snapshot import current_snapshot
 
 __all__ = [
     "CapabilityDefinition",
@@ -16,6 +18,7 @@ __all__ = [
     "get_capability",
     "iter_capabilities",
     "list_capabilities",
+    "reload_capabilities",
 ]
 
 _KEY_PATTERN = re.compile(r"^[a-z]+(?:\.[a-z0-9_]+)+$")
@@ -115,12 +118,18 @@ class CapabilityDefinition:
 
 _registry = TypeRegistry()
 _capabilities_by_key: Dict[str, CapabilityDefinition] = {}
+_capability_sources: Dict[str, str] = {}
 _bootstrap_lock = threading.Lock()
 _bootstrapped = False
+_schema_loader: SchemaLoader | None = None
 
 
 def bootstrap_capabilities(*, force: bool = False) -> None:
-    """Load capability definitions from disk."""
+    """Load capability definitions from disk.
+
+    Unless ``force`` is set, definitions come from the registry snapshot when
+    one exists for the current schema root and still matches its sources.
+    """
 
     global _bootstrapped
 
@@ -132,22 +141,29 @@ def bootstrap_capabilities(*, force: bool = False) -> None:
             return
 
         _capabilities_by_key.clear()
-
-        loader = SchemaLoader(
-            schema_root=_schema_root(),
-            registry=_registry,
-            manifest_dir=_manifest_dir(),
-            manifest_name="capabilities.json",
-        )
-        loader.load()
+        _capability_sources.clear()
+        snapshot = None if force else current_snapshot()
+        if snapshot is not None and snapshot.covers("capabilities", _schema_root()):
+            try:
+                definitions = [CapabilityDefinition(**fields) for fields in snapshot.capabilities]
+            except TypeError as exc:
+                # Written with other definition fields: rebuild from the documents.
+                emit_event("registry.snapshot.invalid", section="capabilities", error=repr(exc))
+            else:
+                for definition in definitions:
+                    _capabilities_by_key[definition.key] = definition
+                _capability_sources.update(snapshot.capability_sources)
+                _bootstrapped = True
+                return
+
+        _loader().load()
 
         for source, payload in _registry:
-            if not isinstance(payload, Mapping):
-                raise ValueError(f"Capability document '{source}' must contain a mapping")
-            definition = CapabilityDefinition.from_mapping(payload, source=source)
+            definition = _definition_from_document(source, payload)
             if definition.key in _capabilities_by_key:
                 raise ValueError(f"Duplicate capability key '{definition.key}' detected")
             _capabilities_by_key[definition.key] = definition
+            _capability_sources[source] = definition.key
 
         for definition in _builtin_capabilities():
             _capabilities_by_key.setdefault(definition.key, definition)
@@ -155,6 +171,44 @@ def bootstrap_capabilities(*, force: bool = False) -> None:
         _bootstrapped = True
 
 
+def reload_capabilities() -> SchemaLoadReport:
+    """Apply added, changed and removed capability documents in place.
+
+    Unlike ``bootstrap_capabilities(force=True)`` only the documents reported
+    as loaded or removed by the :class:`SchemaLoader` are re-validated. The
+    whole change set is validated before the loader commits it, so an invalid
+    edit raises ``ValueError``, leaves the previous definitions in use and is
+    reported again by the next reload.
+    """
+
+    bootstrap_capabilities()
+    with _bootstrap_lock:
+        updated: Dict[str, CapabilityDefinition] = {}
+        owners: Dict[str, str] = {}
+
+        def _validate(report: SchemaLoadReport) -> None:
+            for source in report.loaded:
+                updated[source] = _definition_from_document(source, _registry.get(source))
+            changed = set(updated) | set(report.removed)
+            owners.update((key, source) for source, key in _capability_sources.items() if source not in changed)
+            for source, definition in updated.items():
+                if owners.setdefault(definition.key, source) != source:
+                    raise ValueError(f"Duplicate capability key '{definition.key}' detected")
+
+        report = _loader().load(validate=_validate)
+        changed = set(updated) | set(report.removed)
+        for source in changed:
+            key = _capability_sources.pop(source, None)
+            if key is not None and key not in owners:
+                _capabilities_by_key.pop(key, None)
+        for source, definition in updated.items():
+            _capabilities_by_key[definition.key] = definition
+            _capability_sources[source] = definition.key
+        for definition in _builtin_capabilities():
+            _capabilities_by_key.setdefault(definition.key, definition)
+    return report
+
+
 def get_capability(key: str) -> CapabilityDefinition:
     """Return the capability definition for ``key``."""
 
@@ -179,6 +233,32 @@ def list_capabilities() -> Tuple[str, ...]:
     return tuple(_capabilities_by_key.keys())
 
 
+def _loader() -> SchemaLoader:
+    # Reused across reloads so changes are diffed against what this process
+    # registered rather than the manifest other processes also rewrite.
+    global _schema_loader
+    loader = _schema_loader
+    if (
+        loader is None
+        or loader.registry is not _registry
+        or loader.schema_root != _schema_root()
+        or loader.manifest_dir != _manifest_dir()
+    ):
+        loader = _schema_loader = SchemaLoader(
+            schema_root=_schema_root(),
+            registry=_registry,
+            manifest_dir=_manifest_dir(),
+            manifest_name="capabilities.json",
+        )
+    return loader
+
+
+def _definition_from_document(source: str, payload: object) -> CapabilityDefinition:
+    if not isinstance(payload, Mapping):
+        raise ValueError(f"Capability document '{source}' must contain a mapping")
+    return CapabilityDefinition.from_mapping(payload, source=source)
+
+
 def _normalize_string_list(
     value: object,
     *,
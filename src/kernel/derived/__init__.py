@@ -2,15 +2,25 @@
 from __future__ import annotations
 
 from .evaluator import (
+    BatchEvaluationResult,
     DerivedEvaluator,
     DerivedMetricDefinition,
+    DerivedMetricPlan,
     DerivedTypeDefinition,
+    DerivedTypePlan,
     EvaluationResult,
+    FINGERPRINT_METADATA_KEY,
+    IncrementalEvaluationResult,
 )
 
 __all__ = [
+    "BatchEvaluationResult",
     "DerivedEvaluator",
     "DerivedMetricDefinition",
+    "DerivedMetricPlan",
     "DerivedTypeDefinition",
+    "DerivedTypePlan",
     "EvaluationResult",
+    "FINGERPRINT_METADATA_KEY",
+    "IncrementalEvaluationResult",
 ]
@@ -1,25 +1,40 @@
 """Evaluate derived metrics for kernel items."""
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Sequence, Tuple
 
-try:  # Optional dependency used when available.
-    import yaml  # type: ignore
+try:  # Optional dependency used to vectorise numeric batch columns.
+    import numpy as np  # type: ignore
 except Exception:  # pragma: no cover - optional dependency fallback
-    yaml = None  # type: ignore
+    np = None  # type: ignore
 
-from kernel.observability import emit_event, trace_span
+from kernel.observability import emit_event, event_enabled, trace_span
+from kernel.registry.loader import _yaml
+from kernel.registry.snapshot import current_snapshot
 from kernel.types import get_manifest
 
 __all__ = [
+    "BatchEvaluationResult",
     "DerivedEvaluator",
     "DerivedMetricDefinition",
+    "DerivedMetricPlan",
     "DerivedTypeDefinition",
+    "DerivedTypePlan",
     "EvaluationResult",
+    "FINGERPRINT_METADATA_KEY",
+    "IncrementalEvaluationResult",
 ]
 
+FINGERPRINT_METADATA_KEY = "sys.derived.fingerprints"
+
+MetricFunction = Callable[[Mapping[str, Any], Mapping[str, Any]], Any]
+CompiledOperation = Tuple[MetricFunction, Tuple[str, ...], Tuple[str, ...]]
+ColumnFunction = Callable[[Sequence[Mapping[str, Any]], Mapping[str, Sequence[Any]]], Sequence[Any]]
+
 
 @dataclass(frozen=True)
 class DerivedMetricDefinition:
@@ -85,6 +100,36 @@ class DerivedTypeDefinition:
         return cls(type_key=type_key, metrics=tuple(metrics))
 
 
+@dataclass(frozen=True)
+class DerivedMetricPlan:
+    """Compiled execution step for a single derived metric.
+
+    ``evaluate`` is the operation handler bound to the metric configuration at
+    load time; it receives the item and the values computed so far.
+    ``evaluate_column`` computes the metric for a whole batch given the columns
+    computed so far. ``metric_inputs`` lists every upstream metric the step
+    reads and ``signature`` identifies the definition for fingerprinting.
+    """
+
+    key: str
+    operation: str
+    evaluate: MetricFunction
+    evaluate_column: ColumnFunction
+    path: Tuple[str, ...]
+    depends_on: Tuple[str, ...]
+    sources: Tuple[str, ...]
+    metric_inputs: Tuple[str, ...]
+    signature: bytes
+
+
+@dataclass(frozen=True)
+class DerivedTypePlan:
+    """Metric plans for an item type in dependency order."""
+
+    type_key: str
+    metrics: Tuple[DerivedMetricPlan, ...]
+
+
 @dataclass(frozen=True)
 class EvaluationResult:
     """Result of a derived metric evaluation run."""
@@ -101,33 +146,159 @@ class EvaluationResult:
         }
 
 
+@dataclass(frozen=True)
+class IncrementalEvaluationResult(EvaluationResult):
+    """Evaluation result carrying the input fingerprints of every metric.
+
+    ``recomputed`` lists the metrics whose inputs changed; all other values
+    were carried over from the item's existing ``derived`` block.
+    """
+
+    fingerprints: Mapping[str, str]
+    recomputed: Tuple[str, ...]
+
+    def apply(self, item: MutableMapping[str, Any]) -> None:
+        """Store values under ``derived`` and fingerprints under ``metadata``."""
+
+        derived = item.get("derived")
+        item["derived"] = {**(derived if isinstance(derived, Mapping) else {}), **self.values}
+        metadata = item.get("metadata")
+        metadata = dict(metadata) if isinstance(metadata, Mapping) else {}
+        metadata[FINGERPRINT_METADATA_KEY] = dict(self.fingerprints)
+        item["metadata"] = metadata
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = super().to_dict()
+        payload["fingerprints"] = dict(self.fingerprints)
+        payload["recomputed"] = list(self.recomputed)
+        return payload
+
+
+@dataclass(frozen=True)
+class BatchEvaluationResult:
+    """Columnar result of evaluating a homogeneous batch of items.
+
+    ``columns`` maps each metric key to one value per item, aligned with
+    ``item_ids``. Numeric columns are NumPy arrays when NumPy is installed.
+    Provenance is identical for every row and therefore stored once per metric.
+    """
+
+    type_key: str
+    item_ids: Tuple[Any, ...]
+    columns: Mapping[str, Sequence[Any]]
+    provenance: Mapping[str, Tuple[str, ...]]
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def column(self, key: str) -> List[Any]:
+        """Return the values of metric ``key`` as plain Python objects."""
+
+        return _column_list(self.columns[key])
+
+    def row(self, index: int) -> EvaluationResult:
+        """Return the result for the item at ``index``."""
+
+        values = {key: _native(column[index]) for key, column in self.columns.items()}
+        return EvaluationResult(type_key=self.type_key, values=values, provenance=self.provenance)
+
+    def rows(self) -> Iterator[EvaluationResult]:
+        for index in range(len(self.item_ids)):
+            yield self.row(index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type_key,
+            "item_ids": list(self.item_ids),
+            "columns": {key: _column_list(column) for key, column in self.columns.items()},
+            "provenance": {key: list(value) for key, value in self.provenance.items()},
+        }
+
+
 class DerivedEvaluator:
     """Evaluate derived metrics declared under ``schema/derived``."""
 
-    def __init__(self, schema_root: str | Path | None = None) -> None:
+    def __init__(self, schema_root: str | Path | None = None, *, use_snapshot: bool = True) -> None:
         self.schema_root = Path(schema_root or _default_schema_root())
+        self.use_snapshot = use_snapshot
         self._definitions: Dict[str, DerivedTypeDefinition] = {}
+        self._plans: Dict[str, DerivedTypePlan] = {}
+        self._sources: Dict[str, str] = {}
         self.load_definitions()
 
     # ------------------------------------------------------------------
     # public API
     # ------------------------------------------------------------------
     def load_definitions(self) -> None:
-        """Load derived definitions from disk."""
+        """Load derived definitions and compile execution plans.
+
+        Definitions come from the registry snapshot when ``use_snapshot`` is
+        set and a current snapshot covers this schema root; otherwise every
+        YAML file under the root is read.
+        """
 
         self._definitions.clear()
+        self._plans.clear()
+        self._sources.clear()
+        snapshot = current_snapshot() if self.use_snapshot else None
+        if snapshot is not None and snapshot.covers("derived", self.schema_root):
+            sources = {type_key: str(self.schema_root / name) for name, type_key in snapshot.derived_sources.items()}
+            try:
+                definitions = [_definition_from_fields(fields) for fields in snapshot.derived]
+                located = [(definition, sources[definition.type_key]) for definition in definitions]
+            except (KeyError, TypeError) as exc:
+                # Written with other definition fields: rebuild from the YAML files.
+                emit_event("registry.snapshot.invalid", section="derived", error=repr(exc))
+            else:
+                for definition, source in located:
+                    self._definitions[definition.type_key] = definition
+                    self._plans[definition.type_key] = self._compile(definition, source=source)
+                    self._sources[source] = definition.type_key
+                return
         if not self.schema_root.exists():
             return
         for path in sorted(self.schema_root.glob("*.yaml")):
-            document = _load_yaml(path)
-            if not isinstance(document, Mapping):
-                raise ValueError(f"Derived definition '{path}' must contain a mapping")
-            definition = DerivedTypeDefinition.from_mapping(document, source=str(path))
-            # Ensure referenced type exists and is bootstrapped
-            get_manifest(definition.type_key)
+            definition = self._read_definition(path)
             if definition.type_key in self._definitions:
                 raise ValueError(f"Duplicate derived definition for type '{definition.type_key}'")
             self._definitions[definition.type_key] = definition
+            self._plans[definition.type_key] = self._compile(definition, source=str(path))
+            self._sources[str(path)] = definition.type_key
+
+    def reload_definitions(self, paths: Iterable[str | Path]) -> Tuple[str, ...]:
+        """Re-read only the definition files in ``paths`` and return affected types.
+
+        Paths that no longer exist drop their definitions. Every changed file
+        is parsed and compiled before anything is swapped in, so an invalid
+        edit raises ``ValueError`` and keeps the previous plans in use.
+        """
+
+        changed = {str(Path(path)) for path in paths if Path(path).suffix == ".yaml"}
+        updated: Dict[str, Tuple[DerivedTypeDefinition, DerivedTypePlan]] = {}
+        for source in sorted(changed):
+            path = Path(source)
+            if path.exists():
+                definition = self._read_definition(path)
+                updated[source] = (definition, self._compile(definition, source=source))
+        owners = {key: source for source, key in self._sources.items() if source not in changed}
+        for source, (definition, _) in updated.items():
+            if owners.setdefault(definition.type_key, source) != source:
+                raise ValueError(f"Duplicate derived definition for type '{definition.type_key}'")
+
+        affected = set()
+        for source in changed:
+            type_key = self._sources.pop(source, None)
+            if type_key is not None:
+                affected.add(type_key)
+                if type_key not in owners:
+                    self._definitions.pop(type_key, None)
+                    self._plans.pop(type_key, None)
+        for source, (definition, plan) in updated.items():
+            self._definitions[definition.type_key] = definition
+            self._plans[definition.type_key] = plan
+            self._sources[source] = definition.type_key
+            affected.add(definition.type_key)
+        return tuple(sorted(affected))
 
     def list_types(self) -> Tuple[str, ...]:
         return tuple(sorted(self._definitions))
@@ -138,33 +309,106 @@ class DerivedEvaluator:
         except KeyError as exc:  # pragma: no cover - defensive
             raise KeyError(f"No derived definition registered for '{type_key}'") from exc
 
+    def plan_for(self, type_key: str) -> DerivedTypePlan:
+        try:
+            return self._plans[type_key]
+        except KeyError as exc:
+            raise KeyError(f"No derived definition registered for '{type_key}'") from exc
+
     def evaluate_item(self, item: Mapping[str, Any]) -> EvaluationResult:
         type_key = _require_item_type(item)
-        definition = self.definition_for(type_key)
+        plan = self.plan_for(type_key)
         computed: Dict[str, Any] = {}
         provenance: Dict[str, Tuple[str, ...]] = {}
         item_id = item.get("id") if isinstance(item, Mapping) else None
+        emit_metrics = event_enabled("derived.metric")
         with trace_span("derived.evaluate_item", type_key=type_key, item_id=item_id) as span_id:
-            for metric in definition.metrics:
-                value, sources = self._compute_metric(metric, item, computed)
-                computed[metric.key] = value
-                provenance[metric.key] = tuple(sources)
-                emit_event(
-                    "derived.metric",
-                    span_id=span_id,
-                    type_key=type_key,
-                    item_id=item_id,
-                    metric=metric.key,
-                    value=value,
-                    sources=list(sources),
-                )
-        emit_event(
-            "derived.evaluation_complete",
+            for step in plan.metrics:
+                value = step.evaluate(item, computed)
+                computed[step.key] = value
+                provenance[step.key] = step.sources
+                if emit_metrics:
+                    emit_event(
+                        "derived.metric",
+                        span_id=span_id,
+                        type_key=type_key,
+                        item_id=item_id,
+                        metric=step.key,
+                        value=value,
+                        sources=list(step.sources),
+                    )
+        if event_enabled("derived.evaluation_complete"):
+            emit_event(
+                "derived.evaluation_complete",
+                type_key=type_key,
+                item_id=item_id,
+                metrics=sorted(computed),
+            )
+        return EvaluationResult(type_key=type_key, values=computed, provenance=provenance)
+
+    def evaluate_incremental(self, item: Mapping[str, Any]) -> IncrementalEvaluationResult:
+        """Re-evaluate only the metrics whose inputs changed since the last run.
+
+        Each metric is fingerprinted from its definition, the resolved input
+        subtree at its ``path`` and the values of its upstream metrics. Values
+        are reused from ``item["derived"]`` when the fingerprint matches the one
+        stored under ``metadata["sys.derived.fingerprints"]``.
+        """
+
+        type_key = _require_item_type(item)
+        plan = self.plan_for(type_key)
+        previous_values = item.get("derived")
+        if not isinstance(previous_values, Mapping):
+            previous_values = {}
+        metadata = item.get("metadata")
+        previous_fingerprints = None
+        if isinstance(metadata, Mapping):
+            previous_fingerprints = metadata.get(FINGERPRINT_METADATA_KEY)
+        if not isinstance(previous_fingerprints, Mapping):
+            previous_fingerprints = {}
+
+        computed: Dict[str, Any] = {}
+        provenance: Dict[str, Tuple[str, ...]] = {}
+        fingerprints: Dict[str, str] = {}
+        recomputed: List[str] = []
+        item_id = item.get("id")
+        emit_metrics = event_enabled("derived.metric")
+        with trace_span("derived.evaluate_incremental", type_key=type_key, item_id=item_id) as span_id:
+            for step in plan.metrics:
+                fingerprint = _fingerprint(step, item, computed)
+                fingerprints[step.key] = fingerprint
+                provenance[step.key] = step.sources
+                if previous_fingerprints.get(step.key) == fingerprint and step.key in previous_values:
+                    computed[step.key] = previous_values[step.key]
+                    continue
+                value = step.evaluate(item, computed)
+                computed[step.key] = value
+                recomputed.append(step.key)
+                if emit_metrics:
+                    emit_event(
+                        "derived.metric",
+                        span_id=span_id,
+                        type_key=type_key,
+                        item_id=item_id,
+                        metric=step.key,
+                        value=value,
+                        sources=list(step.sources),
+                    )
+        if event_enabled("derived.evaluation_complete"):
+            emit_event(
+                "derived.evaluation_complete",
+                type_key=type_key,
+                item_id=item_id,
+                metrics=sorted(computed),
+                recomputed=recomputed,
+            )
+        return IncrementalEvaluationResult(
             type_key=type_key,
-            item_id=item_id,
-            metrics=sorted(computed),
+            values=computed,
+            provenance=provenance,
+            fingerprints=fingerprints,
+            recomputed=tuple(recomputed),
         )
-        return EvaluationResult(type_key=type_key, values=computed, provenance=provenance)
 
     def evaluate_many(
         self, items: Iterable[Mapping[str, Any]]
@@ -176,128 +420,226 @@ class DerivedEvaluator:
             results.append((item, self.evaluate_item(item)))
         return results
 
+    def evaluate_batch(
+        self,
+        items: Sequence[Mapping[str, Any]],
+        *,
+        item_type: str | None = None,
+    ) -> BatchEvaluationResult:
+        """Evaluate a batch of items sharing one ``item_type`` column by column.
+
+        Each metric is computed for the whole batch before the next one, so
+        dependent metrics such as ``ratio`` and ``rate`` operate on complete
+        columns. No per-item events are emitted.
+        """
+
+        if item_type is None:
+            if not items:
+                raise ValueError("An 'item_type' is required to evaluate an empty batch")
+            item_type = _require_item_type(items[0])
+        for item in items:
+            if _require_item_type(item) != item_type:
+                raise ValueError(
+                    f"Batch for '{item_type}' contains an item of type '{item.get('item_type')}'"
+                )
+        plan = self.plan_for(item_type)
+        columns: Dict[str, Sequence[Any]] = {}
+        with trace_span("derived.evaluate_batch", type_key=item_type, count=len(items)):
+            for step in plan.metrics:
+                columns[step.key] = step.evaluate_column(items, columns)
+        emit_event(
+            "derived.batch_complete",
+            type_key=item_type,
+            count=len(items),
+            metrics=sorted(columns),
+        )
+        return BatchEvaluationResult(
+            type_key=item_type,
+            item_ids=tuple(item.get("id") for item in items),
+            columns=columns,
+            provenance={step.key: step.sources for step in plan.metrics},
+        )
+
     # ------------------------------------------------------------------
-    # helpers
+    # compilation
     # ------------------------------------------------------------------
-    def _compute_metric(
-        self,
-        metric: DerivedMetricDefinition,
-        item: Mapping[str, Any],
-        computed: Mapping[str, Any],
-    ) -> Tuple[Any, Tuple[str, ...]]:
-        for dependency in metric.depends_on:
-            if dependency not in computed:
+    def _read_definition(self, path: Path) -> DerivedTypeDefinition:
+        document = _load_yaml(path)
+        if not isinstance(document, Mapping):
+            raise ValueError(f"Derived definition '{path}' must contain a mapping")
+        definition = DerivedTypeDefinition.from_mapping(document, source=str(path))
+        # Ensure referenced type exists and is bootstrapped
+        get_manifest(definition.type_key)
+        return definition
+
+    def _compile(self, definition: DerivedTypeDefinition, *, source: str) -> DerivedTypePlan:
+        steps: List[DerivedMetricPlan] = []
+        for metric in _order_metrics(definition, source=source):
+            operation = metric.operation.lower()
+            handler = getattr(self, f"_op_{operation}", None)
+            if handler is None:
                 raise ValueError(
-                    f"Metric '{metric.key}' depends on '{dependency}' but it has not been computed"
+                    f"Unsupported operation '{metric.operation}' in metric '{metric.key}' ({source})"
                 )
-        operation = metric.operation.lower()
-        handler = getattr(self, f"_op_{operation}", None)
-        if handler is None:
-            raise ValueError(f"Unsupported operation '{metric.operation}' in metric '{metric.key}'")
-        value, provenance = handler(metric, item, computed)
-        return value, tuple(provenance)
-
-    def _op_length(
-        self,
-        metric: DerivedMetricDefinition,
-        item: Mapping[str, Any],
-        computed: Mapping[str, Any],
-    ) -> Tuple[int, Tuple[str, ...]]:
+            evaluate, path, sources = handler(metric)
+            metric_inputs = dict.fromkeys(metric.depends_on)
+            metric_inputs.update(
+                (source[len("metric:") :], None) for source in sources if source.startswith("metric:")
+            )
+            column_handler = getattr(self, f"_column_{operation}", None)
+            if column_handler is not None:
+                evaluate_column = column_handler(metric)
+            else:
+                evaluate_column = _row_wise(evaluate)
+            steps.append(
+                DerivedMetricPlan(
+                    key=metric.key,
+                    operation=operation,
+                    evaluate=evaluate,
+                    evaluate_column=evaluate_column,
+                    path=path,
+                    depends_on=metric.depends_on,
+                    sources=tuple(sources),
+                    metric_inputs=tuple(metric_inputs),
+                    signature=_definition_signature(metric),
+                )
+            )
+        return DerivedTypePlan(type_key=definition.type_key, metrics=tuple(steps))
+
+    # Each ``_op_<operation>`` handler validates the metric configuration once
+    # and returns ``(evaluate, path_parts, sources)``. Operations may add a
+    # ``_column_<operation>`` handler returning a vectorised column function;
+    # otherwise batches fall back to calling ``evaluate`` row by row.
+
+    def _op_length(self, metric: DerivedMetricDefinition) -> CompiledOperation:
         path = _require_path(metric)
-        value = _resolve_path(item, path, default=[])
-        if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
-            result = len(value)
-        elif isinstance(value, Mapping):
-            result = len(value)
-        else:
-            result = 0
-        return result, (f"path:{path}",)
+        parts = _split_path(path)
 
-    def _op_count_where(
-        self,
-        metric: DerivedMetricDefinition,
-        item: Mapping[str, Any],
-        computed: Mapping[str, Any],
-    ) -> Tuple[int, Tuple[str, ...]]:
+        def evaluate(item: Mapping[str, Any], computed: Mapping[str, Any]) -> int:
+            value = _resolve_path(item, parts)
+            if isinstance(value, (Sequence, Mapping)) and not isinstance(value, (str, bytes)):
+                return len(value)
+            return 0
+
+        return evaluate, parts, (f"path:{path}",)
+
+    def _op_count_where(self, metric: DerivedMetricDefinition) -> CompiledOperation:
         path = _require_path(metric)
-        field = _require_config_key(metric, "field")
+        parts = _split_path(path)
+        field_parts = _split_path(_require_config_key(metric, "field"))
         needle = metric.config.get("equals", True)
-        values = _resolve_path(item, path, default=[])
-        count = 0
-        if isinstance(values, Sequence) and not isinstance(values, (str, bytes)):
+
+        def evaluate(item: Mapping[str, Any], computed: Mapping[str, Any]) -> int:
+            values = _resolve_path(item, parts)
+            if not isinstance(values, Sequence) or isinstance(values, (str, bytes)):
+                return 0
+            count = 0
             for entry in values:
-                if not isinstance(entry, Mapping):
-                    continue
-                current: Any = entry
-                for part in field.split("."):
-                    if isinstance(current, Mapping) and part in current:
-                        current = current[part]
-                    else:
-                        current = object()
-                        break
-                if current == needle:
+                if _lookup_field(entry, field_parts) == needle:
                     count += 1
-        return count, (f"path:{path}",)
+            return count
 
-    def _op_ratio(
-        self,
-        metric: DerivedMetricDefinition,
-        item: Mapping[str, Any],
-        computed: Mapping[str, Any],
-    ) -> Tuple[float, Tuple[str, ...]]:
+        return evaluate, parts, (f"path:{path}",)
+
+    def _op_ratio(self, metric: DerivedMetricDefinition) -> CompiledOperation:
         numerator_key = _require_config_key(metric, "numerator")
         denominator_key = _require_config_key(metric, "denominator")
-        numerator = computed.get(numerator_key, 0)
-        denominator = computed.get(denominator_key, 0)
         default = metric.config.get("default", 0.0)
         precision = metric.config.get("precision")
-        if not denominator:
-            value = default
-        else:
-            value = numerator / denominator
-            if isinstance(precision, int):
+        if not isinstance(precision, int):
+            precision = None
+
+        def evaluate(item: Mapping[str, Any], computed: Mapping[str, Any]) -> float:
+            denominator = computed.get(denominator_key, 0)
+            if not denominator:
+                return default
+            value = computed.get(numerator_key, 0) / denominator
+            if precision is not None:
                 value = round(value, precision)
-        return value, (f"metric:{numerator_key}", f"metric:{denominator_key}")
+            return value
 
-    def _op_word_count(
-        self,
-        metric: DerivedMetricDefinition,
-        item: Mapping[str, Any],
-        computed: Mapping[str, Any],
-    ) -> Tuple[int, Tuple[str, ...]]:
+        return evaluate, (), (f"metric:{numerator_key}", f"metric:{denominator_key}")
+
+    def _op_word_count(self, metric: DerivedMetricDefinition) -> CompiledOperation:
         path = _require_path(metric)
-        value = _resolve_path(item, path)
-        text = _extract_text(value)
-        count = _count_words(text)
-        return count, (f"path:{path}",)
+        parts = _split_path(path)
 
-    def _op_rate(
-        self,
-        metric: DerivedMetricDefinition,
-        item: Mapping[str, Any],
-        computed: Mapping[str, Any],
-    ) -> Tuple[float, Tuple[str, ...]]:
+        def evaluate(item: Mapping[str, Any], computed: Mapping[str, Any]) -> int:
+            return _count_words(_extract_text(_resolve_path(item, parts)))
+
+        return evaluate, parts, (f"path:{path}",)
+
+    def _op_rate(self, metric: DerivedMetricDefinition) -> CompiledOperation:
         metric_key = _require_config_key(metric, "metric")
         rate = metric.config.get("per", 1)
         if not isinstance(rate, (int, float)) or rate == 0:
             raise ValueError(f"Metric '{metric.key}' in operation 'rate' must specify a non-zero 'per'")
-        base = computed.get(metric_key, 0)
-        value = base / rate
         precision = metric.config.get("precision")
-        if isinstance(precision, int):
-            value = round(value, precision)
-        return value, (f"metric:{metric_key}",)
+        if not isinstance(precision, int):
+            precision = None
 
-    def _op_exists(
-        self,
-        metric: DerivedMetricDefinition,
-        item: Mapping[str, Any],
-        computed: Mapping[str, Any],
-    ) -> Tuple[bool, Tuple[str, ...]]:
+        def evaluate(item: Mapping[str, Any], computed: Mapping[str, Any]) -> float:
+            value = computed.get(metric_key, 0) / rate
+            if precision is not None:
+                value = round(value, precision)
+            return value
+
+        return evaluate, (), (f"metric:{metric_key}",)
+
+    def _column_ratio(self, metric: DerivedMetricDefinition) -> ColumnFunction:
+        numerator_key = _require_config_key(metric, "numerator")
+        denominator_key = _require_config_key(metric, "denominator")
+        default = metric.config.get("default", 0.0)
+        precision = metric.config.get("precision")
+        if not isinstance(precision, int):
+            precision = None
+        fallback = _row_wise(self._op_ratio(metric)[0])
+
+        def evaluate_column(
+            items: Sequence[Mapping[str, Any]], columns: Mapping[str, Sequence[Any]]
+        ) -> Sequence[Any]:
+            numerators = _numeric_column(columns.get(numerator_key), len(items))
+            denominators = _numeric_column(columns.get(denominator_key), len(items))
+            if numerators is None or denominators is None or not _is_number(default):
+                return fallback(items, columns)
+            defined = denominators != 0
+            values = np.full(len(items), default, dtype=float)
+            np.divide(numerators, denominators, out=values, where=defined)
+            if precision is not None:
+                values = _round_column(values, precision, defined)
+            return values
+
+        return evaluate_column
+
+    def _column_rate(self, metric: DerivedMetricDefinition) -> ColumnFunction:
+        metric_key = _require_config_key(metric, "metric")
+        rate = metric.config.get("per", 1)
+        precision = metric.config.get("precision")
+        if not isinstance(precision, int):
+            precision = None
+        fallback = _row_wise(self._op_rate(metric)[0])
+
+        def evaluate_column(
+            items: Sequence[Mapping[str, Any]], columns: Mapping[str, Sequence[Any]]
+        ) -> Sequence[Any]:
+            base = _numeric_column(columns.get(metric_key), len(items))
+            if base is None:
+                return fallback(items, columns)
+            values = base / rate
+            if precision is not None:
+                values = _round_column(values, precision)
+            return values
+
+        return evaluate_column
+
+    def _op_exists(self, metric: DerivedMetricDefinition) -> CompiledOperation:
         path = _require_path(metric)
-        value = _resolve_path(item, path)
-        exists = bool(value)
-        return exists, (f"path:{path}",)
+        parts = _split_path(path)
+
+        def evaluate(item: Mapping[str, Any], computed: Mapping[str, Any]) -> bool:
+            return bool(_resolve_path(item, parts))
+
+        return evaluate, parts, (f"path:{path}",)
 
 
 # ----------------------------------------------------------------------
@@ -311,6 +653,9 @@ def _require_str(payload: Mapping[str, Any], key: str, source: str) -> str:
     return value.strip()
 
 
+_MISSING = object()
+
+
 def _require_item_type(item: Mapping[str, Any]) -> str:
     type_key = item.get("item_type")
     if not isinstance(type_key, str) or not type_key:
@@ -318,6 +663,14 @@ def _require_item_type(item: Mapping[str, Any]) -> str:
     return type_key
 
 
+def _definition_from_fields(fields: Mapping[str, Any]) -> DerivedTypeDefinition:
+    metrics = tuple(
+        DerivedMetricDefinition(**{**metric, "depends_on": tuple(metric["depends_on"])})
+        for metric in fields["metrics"]
+    )
+    return DerivedTypeDefinition(type_key=fields["type_key"], metrics=metrics)
+
+
 def _default_schema_root() -> Path:
     return Path(__file__).resolve().parents[3] / "schema" / "derived"
 
@@ -326,17 +679,19 @@ def _load_yaml(path: Path) -> Any:
     content = path.read_text(encoding="utf-8")
     if not content.strip():
         return {}
+    yaml = _yaml()  # imported on first use; snapshot boots never need it
     if yaml is not None:
         loaded = yaml.safe_load(content)
     else:  # Fallback to JSON subset
-        import json
-
         loaded = json.loads(content)
     return loaded
 
 
-def _resolve_path(data: Any, path: str, default: Any = None) -> Any:
-    parts = path.split(".") if path else []
+def _split_path(path: str) -> Tuple[str, ...]:
+    return tuple(path.split(".")) if path else ()
+
+
+def _resolve_path(data: Any, parts: Tuple[str, ...], default: Any = None) -> Any:
     current: Any = data
     index = 0
     while index < len(parts):
@@ -347,6 +702,8 @@ def _resolve_path(data: Any, path: str, default: Any = None) -> Any:
             current = current[part]
             index += 1
             continue
+        # Metadata keys such as ``cap.directory.profile.last_contact_at`` contain
+        # dots themselves, so fall back to the longest joined key that exists.
         matched = False
         for end in range(len(parts), index, -1):
             candidate = ".".join(parts[index:end])
@@ -360,6 +717,154 @@ def _resolve_path(data: Any, path: str, default: Any = None) -> Any:
     return current
 
 
+class _ColumnRow(Mapping[str, Any]):
+    """Read-only view of one row across the columns computed so far."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: Mapping[str, Sequence[Any]], index: int) -> None:
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._columns[key][self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+
+def _row_wise(evaluate: MetricFunction) -> ColumnFunction:
+    def evaluate_column(
+        items: Sequence[Mapping[str, Any]], columns: Mapping[str, Sequence[Any]]
+    ) -> Sequence[Any]:
+        return [evaluate(item, _ColumnRow(columns, index)) for index, item in enumerate(items)]
+
+    return evaluate_column
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _numeric_column(column: Sequence[Any] | None, size: int) -> Any:
+    """Return ``column`` as a float array, or ``None`` when NumPy cannot be used."""
+
+    if np is None:
+        return None
+    if column is None:
+        return np.zeros(size, dtype=float)
+    try:
+        return np.asarray(column, dtype=float)
+    except (TypeError, ValueError):
+        return None
+
+
+def _round_column(values: Any, precision: int, where: Any = None) -> Any:
+    """Round like the scalar operations do.
+
+    ``np.round`` scales by a power of ten before rounding half-to-even, so
+    values such as ``7.325`` come out differently than with Python ``round``.
+    Rounding element by element keeps batch results identical to
+    :meth:`DerivedEvaluator.evaluate_item`.
+    """
+
+    rounded = values.tolist()
+    mask = [True] * len(rounded) if where is None else where.tolist()
+    return np.array(
+        [round(value, precision) if keep else value for value, keep in zip(rounded, mask)],
+        dtype=float,
+    )
+
+
+def _native(value: Any) -> Any:
+    if np is not None and isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _column_list(column: Sequence[Any]) -> List[Any]:
+    if np is not None and isinstance(column, np.ndarray):
+        return column.tolist()
+    return list(column)
+
+
+def _definition_signature(metric: DerivedMetricDefinition) -> bytes:
+    payload = {
+        "key": metric.key,
+        "operation": metric.operation.lower(),
+        "config": metric.config,
+        "depends_on": list(metric.depends_on),
+    }
+    return json.dumps(payload, sort_keys=True, default=repr).encode("utf-8")
+
+
+def _fingerprint(step: DerivedMetricPlan, item: Mapping[str, Any], computed: Mapping[str, Any]) -> str:
+    digest = hashlib.blake2b(step.signature, digest_size=16)
+    if step.path:
+        value = _resolve_path(item, step.path, _MISSING)
+        if value is _MISSING:
+            digest.update(b"\x00missing")
+        else:
+            digest.update(b"\x00path")
+            digest.update(_canonical_json(value))
+    for key in step.metric_inputs:
+        digest.update(b"\x00metric")
+        digest.update(_canonical_json(computed.get(key)))
+    return digest.hexdigest()
+
+
+def _canonical_json(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=repr).encode("utf-8")
+
+
+def _lookup_field(entry: Any, parts: Tuple[str, ...]) -> Any:
+    if not isinstance(entry, Mapping):
+        return _MISSING
+    current: Any = entry
+    for part in parts:
+        if isinstance(current, Mapping) and part in current:
+            current = current[part]
+        else:
+            return _MISSING
+    return current
+
+
+def _order_metrics(
+    definition: DerivedTypeDefinition, *, source: str
+) -> Tuple[DerivedMetricDefinition, ...]:
+    """Return metrics so that every metric follows its ``depends_on`` entries.
+
+    Declaration order is preserved wherever the dependencies allow it.
+    """
+
+    by_key = {metric.key: metric for metric in definition.metrics}
+    for metric in definition.metrics:
+        for dependency in metric.depends_on:
+            if dependency not in by_key:
+                raise ValueError(
+                    f"Metric '{metric.key}' in {source} depends on unknown metric '{dependency}'"
+                )
+    ordered: List[DerivedMetricDefinition] = []
+    placed: Dict[str, None] = {}
+    pending = list(definition.metrics)
+    while pending:
+        remaining: List[DerivedMetricDefinition] = []
+        for metric in pending:
+            if all(dependency in placed for dependency in metric.depends_on):
+                ordered.append(metric)
+                placed[metric.key] = None
+            else:
+                remaining.append(metric)
+        if len(remaining) == len(pending):
+            keys = ", ".join(metric.key for metric in remaining)
+            raise ValueError(f"Circular 'depends_on' between metrics {keys} in {source}")
+        pending = remaining
+    return tuple(ordered)
+
+
 def _extract_text(value: Any) -> str:
     if isinstance(value, str):
         return value
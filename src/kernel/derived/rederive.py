@@ -0,0 +1,275 @@
+"""Recompute ``derived`` blocks for a corpus of item files in parallel."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Sequence, Set, TextIO
+
+from kernel.files import iter_item_files
+from kernel.observability import SpanContext, current_span, emit_event, trace_span
+
+from .evaluator import DerivedEvaluator
+
+__all__ = ["RederiveReport", "ShardResult", "rederive", "main"]
+
+DEFAULT_SHARD_SIZE = 256
+
+_WORKER_EVALUATOR: DerivedEvaluator | None = None
+
+
+@dataclass
+class ShardResult:
+    """Outcome of re-deriving one shard of item files."""
+
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    failed: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return self.updated + self.unchanged + self.skipped + len(self.failed)
+
+
+@dataclass
+class RederiveReport:
+    """Aggregated summary of a re-derivation run."""
+
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    failed: List[Dict[str, str]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.updated + self.unchanged + self.skipped + len(self.failed)
+
+    @property
+    def items_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
+    def merge(self, shard: ShardResult) -> None:
+        self.updated += shard.updated
+        self.unchanged += shard.unchanged
+        self.skipped += shard.skipped
+        self.failed.extend(shard.failed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "failed": list(self.failed),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "items_per_second": round(self.items_per_second, 1),
+        }
+
+
+def rederive(
+    paths: Iterable[Path | str],
+    *,
+    derived_root: Path | str | None = None,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    dry_run: bool = False,
+    progress: TextIO | None = None,
+    report_interval: float = 5.0,
+) -> RederiveReport:
+    """Re-derive every item in ``paths`` and write changed ``derived`` blocks back.
+
+    With ``workers`` set to ``0`` shards are processed in the calling process;
+    otherwise a :class:`ProcessPoolExecutor` with one evaluator per worker is
+    used and at most ``2 * workers`` shards are in flight at any time.
+    """
+
+    if shard_size < 1:
+        raise ValueError("'shard_size' must be at least 1")
+    worker_count = (os.cpu_count() or 1) if workers is None else workers
+    schema_root = str(derived_root) if derived_root is not None else None
+    report = RederiveReport()
+    started = time.monotonic()
+    last_report = started
+
+    def _record(shard: ShardResult) -> None:
+        nonlocal last_report
+        report.merge(shard)
+        now = time.monotonic()
+        if progress is not None and now - last_report >= report_interval:
+            last_report = now
+            elapsed = now - started
+            rate = report.processed / elapsed if elapsed > 0 else 0.0
+            progress.write(
+                f"rederive: {report.processed} item(s), {report.updated} updated, "
+                f"{len(report.failed)} failed, {rate:.1f} items/s\n"
+            )
+            progress.flush()
+
+    with trace_span("derived.rederive", workers=worker_count, shard_size=shard_size, dry_run=dry_run):
+        shards = _iter_shards(paths, shard_size)
+        parent = current_span()
+        if worker_count == 0:
+            _init_worker(schema_root)
+            for shard in shards:
+                _record(_process_shard(shard, dry_run, parent))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=worker_count,
+                initializer=_init_worker,
+                initargs=(schema_root,),
+            ) as executor:
+                pending: Set[Future[ShardResult]] = set()
+                for shard in shards:
+                    pending.add(executor.submit(_process_shard, shard, dry_run, parent))
+                    if len(pending) >= worker_count * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            _record(future.result())
+                for future in pending:
+                    _record(future.result())
+
+    report.elapsed_seconds = time.monotonic() - started
+    emit_event("derived.rederive_complete", **report.to_dict())
+    return report
+
+
+def _iter_shards(paths: Iterable[Path | str], size: int) -> Iterator[List[str]]:
+    shard: List[str] = []
+    for path in paths:
+        shard.append(str(path))
+        if len(shard) >= size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+def _init_worker(schema_root: str | None) -> None:
+    global _WORKER_EVALUATOR
+    _WORKER_EVALUATOR = DerivedEvaluator(schema_root=schema_root)
+
+
+def _process_shard(paths: Sequence[str], dry_run: bool, parent: SpanContext | None = None) -> ShardResult:
+    with trace_span("derived.rederive_shard", parent_context=parent, size=len(paths)):
+        return _rederive_paths(paths, dry_run)
+
+
+def _rederive_paths(paths: Sequence[str], dry_run: bool) -> ShardResult:
+    evaluator = _WORKER_EVALUATOR
+    if evaluator is None:  # pragma: no cover - initializer always runs first
+        raise RuntimeError("Worker evaluator has not been initialised")
+    result = ShardResult()
+    supported = set(evaluator.list_types())
+    batches: Dict[str, List[tuple[str, MutableMapping[str, Any]]]] = defaultdict(list)
+
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                item = json.load(handle)
+        except (OSError, ValueError) as exc:
+            result.failed.append({"path": path, "error": str(exc)})
+            continue
+        item_type = item.get("item_type") if isinstance(item, Mapping) else None
+        # A list or mapping here would make the membership test raise.
+        if not isinstance(item_type, str) or item_type not in supported:
+            result.skipped += 1
+            continue
+        batches[item_type].append((path, item))
+
+    for item_type, entries in batches.items():
+        try:
+            evaluation = evaluator.evaluate_batch([item for _, item in entries], item_type=item_type)
+            rows = list(zip(entries, evaluation.rows()))
+        except Exception:  # noqa: BLE001 - isolate the offending item below
+            rows = []
+            for path, item in entries:
+                try:
+                    single = evaluator.evaluate_batch([item], item_type=item_type)
+                except Exception as exc:  # noqa: BLE001 - one bad item must not abort the shard
+                    result.failed.append({"path": path, "error": str(exc)})
+                    continue
+                rows.append(((path, item), single.row(0)))
+        for (path, item), row in rows:
+            current = item.get("derived")
+            derived = dict(current) if isinstance(current, Mapping) else {}
+            derived.update(row.values)
+            if derived == current:
+                result.unchanged += 1
+                continue
+            item["derived"] = derived
+            if not dry_run:
+                try:
+                    _write_item(Path(path), item)
+                except OSError as exc:
+                    result.failed.append({"path": path, "error": str(exc)})
+                    continue
+            result.updated += 1
+    return result
+
+
+def _write_item(path: Path, item: Mapping[str, Any]) -> None:
+    temporary = path.with_name(f".{path.name}.tmp")
+    with temporary.open("w", encoding="utf-8") as handle:
+        json.dump(item, handle, indent=2, ensure_ascii=False)
+        handle.write("\n")
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute derived values for stored items")
+    parser.add_argument("root", type=Path, help="Item file or directory tree to re-derive (e.g. /data)")
+    parser.add_argument(
+        "--derived-root",
+        type=Path,
+        default=None,
+        help="Directory containing derived metric definitions",
+    )
+    parser.add_argument("--pattern", default="*.json", help="Filename pattern of item payloads")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (defaults to the CPU count, 0 runs in-process)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help="Number of item files handed to a worker at once",
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between progress lines on stderr",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate without writing files back")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    report = rederive(
+        iter_item_files(args.root, args.pattern),
+        derived_root=args.derived_root,
+        workers=args.workers,
+        shard_size=args.shard_size,
+        dry_run=args.dry_run,
+        progress=sys.stderr,
+        report_interval=args.report_interval,
+    )
+    print(json.dumps(report.to_dict(), indent=2, sort_keys=True))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
@@ -0,0 +1,27 @@
+"""Filesystem helpers shared by the tools that walk item trees."""
+from __future__ import annotations
+
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterator
+
+__all__ = ["iter_item_files"]
+
+
+def iter_item_files(root: Path | str, pattern: str = "*.json") -> Iterator[Path]:
+    """Yield files below ``root`` matching ``pattern`` in a stable order.
+
+    Directories are walked lazily so very large trees never need to be
+    materialised in memory.
+    """
+
+    root_path = Path(root)
+    if root_path.is_file():
+        yield root_path
+        return
+    for directory, subdirectories, filenames in os.walk(root_path):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if fnmatch(filename, pattern):
+                yield Path(directory) / filename
@@ -0,0 +1,37 @@
+"""Append-only journal of item mutations and JSON Patch helpers."""
+from __future__ import annotations
+
+from .log import JournalEntry, JournalReader, JournalWriter, ReplayReport, replay
+from .patch import apply_patch
+from .snapshot import (
+    CompactionReport,
+    Compactor,
+    JournalSnapshot,
+    RestoreReport,
+    load_latest_snapshot,
+    restore,
+    retire_segments,
+    write_snapshot,
+)
+from .sync import OverlapIndex, SyncConflict, SyncPlan, plan_sync
+
+__all__ = [
+    "CompactionReport",
+    "Compactor",
+    "JournalEntry",
+    "JournalReader",
+    "JournalSnapshot",
+    "JournalWriter",
+    "OverlapIndex",
+    "ReplayReport",
+    "RestoreReport",
+    "SyncConflict",
+    "SyncPlan",
+    "apply_patch",
+    "load_latest_snapshot",
+    "plan_sync",
+    "replay",
+    "restore",
+    "retire_segments",
+    "write_snapshot",
+]
@@ -0,0 +1,465 @@
+"""Segmented, checksummed, append-only journal of item mutations (ADR-003)."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Sequence, Tuple
+
+from kernel.observability import emit_event, trace_span
+
+from .patch import apply_patch
+
+__all__ = [
+    "DEFAULT_SEGMENT_BYTES",
+    "JournalEntry",
+    "JournalReader",
+    "JournalWriter",
+    "ReplayReport",
+    "replay",
+    "main",
+]
+
+DEFAULT_SEGMENT_BYTES = 64 << 20
+SEGMENT_SUFFIX = ".journal"
+
+# Each record is ``length | crc32 | sequence`` followed by ``length`` bytes of
+# JSON. The CRC covers the payload and then the sequence.
+_HEADER = struct.Struct("<IIQ")
+_SEQUENCE = struct.Struct("<Q")
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """One mutation: a JSON Patch applied to an item by an author and persona.
+
+    ``sequence`` is assigned by the writer and is ``None`` until appended.
+    """
+
+    item_id: str
+    patch: Tuple[Mapping[str, Any], ...]
+    author: str
+    timestamp: str
+    persona: str
+    sequence: int | None = None
+
+    @classmethod
+    def create(
+        cls,
+        item_id: str,
+        patch: Sequence[Mapping[str, Any]],
+        *,
+        author: str,
+        persona: str,
+        timestamp: str | None = None,
+    ) -> "JournalEntry":
+        """Build an entry, stamping it with the current UTC time by default."""
+
+        return cls.from_mapping(
+            {
+                "item_id": item_id,
+                "patch": list(patch),
+                "author": author,
+                "persona": persona,
+                "timestamp": timestamp or _utc_now(),
+            }
+        )
+
+    @classmethod
+    def from_mapping(cls, payload: Mapping[str, Any], *, sequence: int | None = None) -> "JournalEntry":
+        values: Dict[str, str] = {}
+        for key in ("item_id", "author", "timestamp", "persona"):
+            value = payload.get(key)
+            if not isinstance(value, str) or not value:
+                raise ValueError(f"Journal entry '{key}' must be a non-empty string")
+            values[key] = value
+        patch = payload.get("patch")
+        if not isinstance(patch, (list, tuple)) or any(not isinstance(op, Mapping) or "op" not in op for op in patch):
+            raise ValueError("Journal entry 'patch' must be a list of JSON Patch operations")
+        return cls(patch=tuple(patch), sequence=sequence, **values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "item_id": self.item_id,
+            "patch": [dict(operation) for operation in self.patch],
+            "author": self.author,
+            "timestamp": self.timestamp,
+            "persona": self.persona,
+        }
+
+
+def _encode(entry: JournalEntry) -> Tuple[bytes, int]:
+    """Return the record payload of ``entry`` and its running CRC."""
+
+    payload = json.dumps(entry.to_dict(), ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return payload, zlib.crc32(payload)
+
+
+def _frame(sequence: int, payload: bytes, payload_crc: int) -> bytes:
+    checksum = zlib.crc32(_SEQUENCE.pack(sequence), payload_crc)
+    return _HEADER.pack(len(payload), checksum, sequence) + payload
+
+
+def _segment_name(first_sequence: int) -> str:
+    return f"{first_sequence:020d}{SEGMENT_SUFFIX}"
+
+
+def _list_segments(directory: Path) -> List[Tuple[int, Path]]:
+    if not directory.exists():
+        return []
+    segments = []
+    for path in directory.iterdir():
+        if path.suffix == SEGMENT_SUFFIX and path.stem.isdigit():
+            segments.append((int(path.stem), path))
+    return sorted(segments)
+
+
+def _scan(content: bytes | memoryview, *, verify: bool = True) -> Iterator[Tuple[int, int, memoryview]]:
+    """Yield ``(end_offset, sequence, payload)`` for every intact record.
+
+    Stops silently at the first truncated or corrupt record; callers compare
+    the last ``end_offset`` with the content length to detect a torn tail.
+    """
+
+    view = memoryview(content)
+    offset = 0
+    total = len(view)
+    header_size = _HEADER.size
+    while offset + header_size <= total:
+        length, checksum, sequence = _HEADER.unpack_from(view, offset)
+        start = offset + header_size
+        end = start + length
+        if end > total:
+            return
+        payload = view[start:end]
+        if verify and zlib.crc32(_SEQUENCE.pack(sequence), zlib.crc32(payload)) != checksum:
+            return
+        yield end, sequence, payload
+        offset = end
+
+
+class JournalWriter:
+    """Append entries durably, batching concurrent appends into one ``fsync``.
+
+    Appends from any number of threads go into a shared buffer. The first
+    thread that finds no commit in progress becomes the leader: it writes
+    the whole buffer, ``fsync``-s once, and wakes every thread whose entry
+    was in that batch. Meanwhile new appends accumulate for the next commit,
+    so throughput grows with concurrency instead of being capped by the
+    device's ``fsync`` rate. ``commit_delay`` makes the leader wait that
+    many seconds before writing, to gather larger batches.
+
+    Segments are named after their first sequence number. A commit that
+    starts with the current segment at ``segment_bytes`` or more opens a new
+    segment first. On open, a torn tail left by a crash in the last segment
+    is truncated. ``durable=False`` skips ``fsync`` (tests and benchmarks).
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        *,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        durable: bool = True,
+        commit_delay: float = 0.0,
+    ) -> None:
+        if segment_bytes < 1:
+            raise ValueError("'segment_bytes' must be at least 1")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.durable = durable
+        self.commit_delay = commit_delay
+        self.commits = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = bytearray()
+        self._pending_first: int | None = None
+        self._committing = False
+        self._failure: BaseException | None = None
+        self._closed = False
+        next_sequence, self._segment_path, self._segment_size = self._recover()
+        self._next_sequence = next_sequence
+        self._durable_sequence = next_sequence - 1
+        self._handle = self._segment_path.open("ab") if self._segment_path is not None else None
+
+    @property
+    def next_sequence(self) -> int:
+        with self._cond:
+            return self._next_sequence
+
+    def append(self, entry: JournalEntry) -> int:
+        """Append ``entry`` and return its sequence once it is durable."""
+
+        return self.append_many([entry])[-1]
+
+    def append_many(self, entries: Sequence[JournalEntry]) -> List[int]:
+        """Append ``entries`` contiguously and return their sequences once durable."""
+
+        if not entries:
+            return []
+        # Serialise outside the lock; only sequence numbering is serialised.
+        encoded = [_encode(entry) for entry in entries]
+        with self._cond:
+            self._check_open()
+            first = self._next_sequence
+            for offset, (payload, payload_crc) in enumerate(encoded):
+                self._pending += _frame(first + offset, payload, payload_crc)
+            if self._pending_first is None:
+                self._pending_first = first
+            self._next_sequence = first + len(entries)
+            last = self._next_sequence - 1
+            while self._durable_sequence < last:
+                self._check_open()
+                if self._committing:
+                    self._cond.wait()
+                    continue
+                self._commit_locked()
+        return list(range(first, last + 1))
+
+    def close(self) -> None:
+        with self._cond:
+            while self._committing:
+                self._cond.wait()
+            if self._pending and self._failure is None:
+                self._commit_locked()
+            self._closed = True
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def __enter__(self) -> "JournalWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _check_open(self) -> None:
+        if self._failure is not None:
+            raise RuntimeError("Journal writer failed; reopen it to recover") from self._failure
+        if self._closed:
+            raise RuntimeError("Journal writer is closed")
+
+    def _commit_locked(self) -> None:
+        # Called with the condition held; releases it while doing I/O.
+        self._committing = True
+        self._cond.release()
+        try:
+            if self.commit_delay > 0:
+                time.sleep(self.commit_delay)
+        finally:
+            self._cond.acquire()
+        batch, first = bytes(self._pending), self._pending_first
+        last = self._next_sequence - 1
+        self._pending = bytearray()
+        self._pending_first = None
+        self._cond.release()
+        try:
+            self._write(batch, first if first is not None else last + 1)
+        except BaseException as exc:
+            self._cond.acquire()
+            self._failure = exc
+            self._committing = False
+            self._cond.notify_all()
+            raise
+        self._cond.acquire()
+        self.commits += 1
+        self._durable_sequence = last
+        self._committing = False
+        self._cond.notify_all()
+
+    def _write(self, batch: bytes, first: int) -> None:
+        if self._handle is None or self._segment_size >= self.segment_bytes:
+            self._rotate(first)
+        handle = self._handle
+        assert handle is not None
+        handle.write(batch)
+        handle.flush()
+        if self.durable:
+            os.fsync(handle.fileno())
+        self._segment_size += len(batch)
+
+    def _rotate(self, first: int) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        self._segment_path = self.directory / _segment_name(first)
+        self._handle = self._segment_path.open("ab")
+        self._segment_size = 0
+        if self.durable:
+            _fsync_directory(self.directory)
+        emit_event("journal.segment_opened", segment=str(self._segment_path), first_sequence=first)
+
+    def _recover(self) -> Tuple[int, Path | None, int]:
+        segments = _list_segments(self.directory)
+        if not segments:
+            return 0, None, 0
+        first, path = segments[-1]
+        content = path.read_bytes()
+        end, last = 0, first - 1
+        for end, last, _ in _scan(content):
+            pass
+        if end < len(content):
+            with path.open("r+b") as handle:
+                handle.truncate(end)
+                if self.durable:
+                    os.fsync(handle.fileno())
+            emit_event("journal.tail_truncated", segment=str(path), offset=end, dropped=len(content) - end)
+        elif self.durable:
+            # A writer that died between ``write`` and ``fsync`` left records
+            # only in the page cache; make them durable before numbering past them.
+            with path.open("rb") as handle:
+                os.fsync(handle.fileno())
+        return last + 1, path, end
+
+
+class JournalReader:
+    """Sequentially read and verify journal segments.
+
+    Each segment is read in one call and records are decoded straight from
+    the buffer. A truncated or corrupt record ends the last segment (a torn
+    write that was never acknowledged); anywhere else it raises
+    ``ValueError``.
+    """
+
+    def __init__(self, directory: Path | str, *, verify: bool = True) -> None:
+        self.directory = Path(directory)
+        self.verify = verify
+
+    def segments(self) -> List[Path]:
+        return [path for _, path in _list_segments(self.directory)]
+
+    def __iter__(self) -> Iterator[JournalEntry]:
+        return self.iter_entries()
+
+    def iter_entries(self, start: int = 0) -> Iterator[JournalEntry]:
+        """Yield entries with ``sequence >= start`` in sequence order."""
+
+        segments = _list_segments(self.directory)
+        # Skip whole segments that end before ``start``.
+        while len(segments) > 1 and segments[1][0] <= start:
+            segments.pop(0)
+        for index, (_, path) in enumerate(segments):
+            with path.open("rb", buffering=0) as handle:
+                content = handle.read()
+            end = 0
+            for end, sequence, payload in _scan(content, verify=self.verify):
+                if sequence >= start:
+                    yield JournalEntry.from_mapping(json.loads(bytes(payload)), sequence=sequence)
+            if end < len(content) and index < len(segments) - 1:
+                raise ValueError(f"{path}: corrupt journal record at offset {end}")
+
+
+@dataclass
+class ReplayReport:
+    """Summary of a journal replay."""
+
+    applied: int = 0
+    items: int = 0
+    last_sequence: int | None = None
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def entries_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.applied + len(self.failed)) / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "applied": self.applied,
+            "items": self.items,
+            "last_sequence": self.last_sequence,
+            "failed": list(self.failed),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "entries_per_second": round(self.entries_per_second, 1),
+        }
+
+
+def replay(
+    entries: Iterable[JournalEntry],
+    items: MutableMapping[str, Any] | None = None,
+) -> Tuple[MutableMapping[str, Any], ReplayReport]:
+    """Apply ``entries`` in order to ``items`` (``item_id -> payload``).
+
+    ``items`` is updated in place; a new dictionary is used when omitted. An
+    item that does not exist yet starts as ``{}``, so its first entry is
+    normally an ``add`` at the root pointer ``""``. Entries whose patch fails
+    are recorded in ``failed`` and leave the item unchanged.
+    """
+
+    state: MutableMapping[str, Any] = {} if items is None else items
+    report = ReplayReport()
+    touched = set()
+    started = time.monotonic()
+    with trace_span("journal.replay"):
+        for entry in entries:
+            report.last_sequence = entry.sequence
+            patch = entry.patch
+            # A single operation other than ``move`` fails before mutating
+            # anything, so the (common) one-op entry can skip the copy.
+            in_place = len(patch) == 1 and patch[0].get("op") != "move"
+            try:
+                state[entry.item_id] = apply_patch(state.get(entry.item_id, {}), patch, in_place=in_place)
+            except (ValueError, KeyError, TypeError) as exc:
+                report.failed.append({"sequence": entry.sequence, "item_id": entry.item_id, "error": str(exc)})
+                continue
+            report.applied += 1
+            touched.add(entry.item_id)
+    report.items = len(touched)
+    report.elapsed_seconds = time.monotonic() - started
+    emit_event("journal.replay_complete", **{key: value for key, value in report.to_dict().items() if key != "failed"})
+    return state, report
+
+
+def _fsync_directory(directory: Path) -> None:
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or replay an item journal")
+    parser.add_argument("directory", type=Path, help="Journal directory")
+    parser.add_argument("--start", type=int, default=0, help="First sequence number to read")
+    parser.add_argument("--replay", action="store_true", help="Apply the entries and report replay throughput")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    reader = JournalReader(args.directory)
+    started = time.monotonic()
+    if args.replay:
+        _, report = replay(reader.iter_entries(args.start))
+        summary: Dict[str, Any] = report.to_dict()
+    else:
+        count, last = 0, None
+        for entry in reader.iter_entries(args.start):
+            count, last = count + 1, entry.sequence
+        elapsed = time.monotonic() - started
+        summary = {
+            "entries": count,
+            "last_sequence": last,
+            "elapsed_seconds": round(elapsed, 3),
+            "entries_per_second": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+    summary["segments"] = len(reader.segments())
+    print(json.dumps(summary, indent=2, sort_keys=True))
+    return 1 if summary.get("failed") else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
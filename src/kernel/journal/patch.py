@@ -0,0 +1,122 @@
+"""Apply RFC 6902 JSON Patch operations to item payloads."""
+from __future__ import annotations
+
+import copy
+from typing import Any, Iterable, List, Mapping, Tuple
+
+from kernel.validation import parse_pointer
+
+__all__ = ["apply_patch"]
+
+
+def apply_patch(document: Any, patch: Iterable[Mapping[str, Any]], *, in_place: bool = False) -> Any:
+    """Return ``document`` with every operation of ``patch`` applied in order.
+
+    Supports ``add``, ``remove``, ``replace``, ``move``, ``copy`` and
+    ``test``. A failing operation raises ``ValueError``; with ``in_place``
+    unset, ``document`` itself is never modified. Replays that own their
+    documents pass ``in_place=True`` to skip the defensive copy.
+    """
+
+    if not in_place:
+        document = copy.deepcopy(document)
+    for operation in patch:
+        op = operation.get("op")
+        path = parse_pointer(_string(operation, "path"))
+        if op == "add":
+            document = _add(document, path, _value(operation))
+        elif op == "remove":
+            document = _remove(document, path)[0]
+        elif op == "replace":
+            # Read the value first so a malformed operation fails before the removal.
+            value = _value(operation)
+            document = _remove(document, path)[0]
+            document = _add(document, path, value)
+        elif op == "move":
+            source = parse_pointer(_string(operation, "from"))
+            if path[: len(source)] == source and path != source:
+                raise ValueError(f"Cannot move {operation['from']!r} into its own child {operation['path']!r}")
+            document, value = _remove(document, source)
+            document = _add(document, path, value)
+        elif op == "copy":
+            value = _resolve(document, parse_pointer(_string(operation, "from")))
+            document = _add(document, path, copy.deepcopy(value))
+        elif op == "test":
+            if _resolve(document, path) != operation.get("value"):
+                raise ValueError(f"Test failed at {operation['path']!r}")
+        else:
+            raise ValueError(f"Unsupported patch operation: {op!r}")
+    return document
+
+
+def _string(operation: Mapping[str, Any], key: str) -> str:
+    value = operation.get(key)
+    if not isinstance(value, str):
+        raise ValueError(f"Patch operation needs a string {key!r}: {dict(operation)!r}")
+    return value
+
+
+def _value(operation: Mapping[str, Any]) -> Any:
+    if "value" not in operation:
+        raise ValueError(f"Patch operation needs a 'value': {dict(operation)!r}")
+    return copy.deepcopy(operation["value"])
+
+
+def _resolve(document: Any, path: Tuple[str, ...]) -> Any:
+    target = document
+    for token in path:
+        target = _child(target, token, path)
+    return target
+
+
+def _child(container: Any, token: str, path: Tuple[str, ...]) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise ValueError(f"Path {_format(path)} does not exist")
+        return container[token]
+    if isinstance(container, list):
+        return container[_index(container, token, path)]
+    raise ValueError(f"Path {_format(path)} does not exist")
+
+
+def _index(container: List[Any], token: str, path: Tuple[str, ...], *, append: bool = False) -> int:
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise ValueError(f"Invalid array index {token!r} in {_format(path)}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise ValueError(f"Array index out of range in {_format(path)}")
+    return index
+
+
+def _add(document: Any, path: Tuple[str, ...], value: Any) -> Any:
+    if not path:
+        return value
+    parent = _resolve(document, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, path, append=True), value)
+    else:
+        raise ValueError(f"Path {_format(path[:-1])} is not a container")
+    return document
+
+
+def _remove(document: Any, path: Tuple[str, ...]) -> Tuple[Any, Any]:
+    if not path:
+        return None, document
+    parent = _resolve(document, path[:-1])
+    token = path[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise ValueError(f"Path {_format(path)} does not exist")
+        return document, parent.pop(token)
+    if isinstance(parent, list):
+        return document, parent.pop(_index(parent, token, path))
+    raise ValueError(f"Path {_format(path)} does not exist")
+
+
+def _format(path: Tuple[str, ...]) -> str:
+    return repr("".join("/" + token.replace("~", "~0").replace("/", "~1") for token in path))
@@ -0,0 +1,446 @@
+"""Compacted snapshots of journal state and the compactor that writes them."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Tuple
+
+from kernel.observability import emit_event, trace_span
+
+from .log import JournalReader, ReplayReport, _fsync_directory, _list_segments, replay
+
+__all__ = [
+    "DEFAULT_COMPACT_INTERVAL",
+    "DEFAULT_KEEP_SNAPSHOTS",
+    "DEFAULT_MIN_ENTRIES",
+    "SNAPSHOT_FORMAT",
+    "CompactionReport",
+    "Compactor",
+    "JournalSnapshot",
+    "RestoreReport",
+    "list_snapshots",
+    "load_latest_snapshot",
+    "prune_snapshots",
+    "read_snapshot",
+    "restore",
+    "retire_segments",
+    "write_snapshot",
+    "main",
+]
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+DEFAULT_KEEP_SNAPSHOTS = 2
+DEFAULT_COMPACT_INTERVAL = 300.0
+DEFAULT_MIN_ENTRIES = 10_000
+
+# ``magic | format | sha256(body)`` followed by a JSON body. Once segments
+# are retired a snapshot is the only copy of the older history, so the body
+# is plain JSON rather than an interpreter-specific encoding.
+_MAGIC = b"KERNJSNP"
+_DIGEST_SIZE = 32
+
+
+@dataclass(frozen=True)
+class JournalSnapshot:
+    """Item state after applying every entry up to ``watermark`` inclusive."""
+
+    path: Path
+    watermark: int
+    created_at: str
+    items: Mapping[str, Any]
+
+
+def _snapshot_name(watermark: int) -> str:
+    return f"{watermark:020d}{SNAPSHOT_SUFFIX}"
+
+
+def list_snapshots(directory: Path | str) -> List[Tuple[int, Path]]:
+    """Return ``(watermark, path)`` for every snapshot, oldest first."""
+
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    snapshots = []
+    for path in directory.iterdir():
+        if path.suffix == SNAPSHOT_SUFFIX and path.stem.isdigit():
+            snapshots.append((int(path.stem), path))
+    return sorted(snapshots)
+
+
+def write_snapshot(
+    directory: Path | str,
+    items: Mapping[str, Any],
+    watermark: int,
+    *,
+    durable: bool = True,
+) -> Path:
+    """Atomically write ``items`` as the state at sequence ``watermark``."""
+
+    if watermark < 0:
+        raise ValueError("'watermark' must be a journal sequence number")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    created_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    body = json.dumps(
+        {"watermark": watermark, "created_at": created_at, "items": items},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    target = directory / _snapshot_name(watermark)
+    temporary = directory / f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with temporary.open("wb") as handle:
+            handle.write(_MAGIC + SNAPSHOT_FORMAT.to_bytes(2, "big") + hashlib.sha256(body).digest())
+            handle.write(body)
+            handle.flush()
+            if durable:
+                os.fsync(handle.fileno())
+        os.replace(temporary, target)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    if durable:
+        _fsync_directory(directory)
+    emit_event("journal.snapshot_written", path=str(target), watermark=watermark, items=len(items), bytes=len(body))
+    return target
+
+
+def read_snapshot(path: Path | str) -> JournalSnapshot:
+    """Read and verify one snapshot, raising ``ValueError`` if it is invalid."""
+
+    target = Path(path)
+    payload = json.loads(bytes(_verified_body(target)))
+    return JournalSnapshot(
+        path=target,
+        watermark=int(payload["watermark"]),
+        created_at=str(payload["created_at"]),
+        items=payload["items"],
+    )
+
+
+def _verified_body(target: Path) -> memoryview:
+    content = target.read_bytes()
+    header = len(_MAGIC) + 2 + _DIGEST_SIZE
+    if len(content) < header or not content.startswith(_MAGIC):
+        raise ValueError(f"{target}: not a journal snapshot")
+    version = int.from_bytes(content[len(_MAGIC) : len(_MAGIC) + 2], "big")
+    if version != SNAPSHOT_FORMAT:
+        raise ValueError(f"{target}: unsupported snapshot format {version}")
+    body = memoryview(content)[header:]
+    if hashlib.sha256(body).digest() != content[len(_MAGIC) + 2 : header]:
+        raise ValueError(f"{target}: snapshot checksum mismatch")
+    return body
+
+
+def load_latest_snapshot(directory: Path | str) -> JournalSnapshot | None:
+    """Return the newest readable snapshot, falling back past damaged ones."""
+
+    for _, path in reversed(list_snapshots(directory)):
+        try:
+            return read_snapshot(path)
+        except (OSError, ValueError, KeyError) as exc:
+            emit_event("journal.snapshot_invalid", path=str(path), error=str(exc))
+    return None
+
+
+def prune_snapshots(directory: Path | str, keep: int = DEFAULT_KEEP_SNAPSHOTS) -> List[Path]:
+    """Delete all but the newest ``keep`` snapshots and return the removed paths."""
+
+    if keep < 1:
+        raise ValueError("'keep' must be at least 1")
+    removed = [path for _, path in list_snapshots(directory)[:-keep]]
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+def retire_segments(journal_dir: Path | str, watermark: int, *, durable: bool = True) -> List[Path]:
+    """Delete journal segments whose entries are all at or below ``watermark``.
+
+    A segment is covered once the next segment starts at ``watermark + 1``
+    or earlier. The last segment is never removed, since the writer appends
+    to it.
+    """
+
+    directory = Path(journal_dir)
+    segments = _list_segments(directory)
+    retired = []
+    for (_, path), (next_first, _) in zip(segments, segments[1:]):
+        if next_first > watermark + 1:
+            break
+        path.unlink(missing_ok=True)
+        retired.append(path)
+    if retired:
+        if durable:
+            _fsync_directory(directory)
+        emit_event("journal.segments_retired", count=len(retired), watermark=watermark)
+    return retired
+
+
+def _sync_segments(journal_dir: Path, after: int) -> None:
+    """``fsync`` every segment that may hold entries after sequence ``after``.
+
+    Segments are read through the page cache, so the compactor can replay
+    records the writer has written but not yet made durable. Once synced
+    they survive a power loss, and the writer's recovery resumes above them
+    instead of handing their sequence numbers out again.
+    """
+
+    segments = _list_segments(journal_dir)
+    for index, (_, path) in enumerate(segments):
+        if index + 1 < len(segments) and segments[index + 1][0] <= after + 1:
+            continue
+        with path.open("rb") as handle:
+            os.fsync(handle.fileno())
+
+
+@dataclass
+class RestoreReport:
+    """Where a restore started and how much of the journal it replayed."""
+
+    snapshot: str | None = None
+    watermark: int | None = None
+    snapshot_items: int = 0
+    replay: ReplayReport = field(default_factory=ReplayReport)
+    load_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "snapshot": self.snapshot,
+            "watermark": self.watermark,
+            "snapshot_items": self.snapshot_items,
+            "replay": self.replay.to_dict(),
+            "load_seconds": round(self.load_seconds, 3),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+
+def restore(
+    journal_dir: Path | str,
+    snapshot_dir: Path | str,
+) -> Tuple[MutableMapping[str, Any], RestoreReport]:
+    """Load the latest snapshot and replay only the journal tail after it.
+
+    Without a snapshot the whole journal is replayed. Raises ``ValueError``
+    when segments needed to bridge the snapshot and the journal were already
+    retired.
+    """
+
+    report = RestoreReport()
+    started = time.monotonic()
+    with trace_span("journal.restore"):
+        snapshot = load_latest_snapshot(snapshot_dir)
+        items: MutableMapping[str, Any] = {}
+        start = 0
+        if snapshot is not None:
+            items = dict(snapshot.items)
+            start = snapshot.watermark + 1
+            report.snapshot = str(snapshot.path)
+            report.watermark = snapshot.watermark
+            report.snapshot_items = len(items)
+        report.load_seconds = time.monotonic() - started
+        segments = _list_segments(Path(journal_dir))
+        if segments and segments[0][0] > start:
+            raise ValueError(
+                f"Journal starts at sequence {segments[0][0]} but replay needs {start}; "
+                "the segments in between were retired without a covering snapshot"
+            )
+        items, report.replay = replay(JournalReader(journal_dir).iter_entries(start), items)
+    report.elapsed_seconds = time.monotonic() - started
+    emit_event(
+        "journal.restore_complete",
+        snapshot=report.snapshot,
+        watermark=report.watermark,
+        replayed=report.replay.applied + len(report.replay.failed),
+        items=len(items),
+        elapsed_seconds=round(report.elapsed_seconds, 3),
+    )
+    return items, report
+
+
+@dataclass
+class CompactionReport:
+    """Outcome of one compaction pass."""
+
+    watermark: int | None = None
+    items: int = 0
+    replayed: int = 0
+    snapshot: str | None = None
+    retired_segments: List[str] = field(default_factory=list)
+    pruned_snapshots: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "watermark": self.watermark,
+            "items": self.items,
+            "replayed": self.replayed,
+            "snapshot": self.snapshot,
+            "retired_segments": list(self.retired_segments),
+            "pruned_snapshots": list(self.pruned_snapshots),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+
+class Compactor:
+    """Periodically snapshot journal state and retire covered segments.
+
+    The compactor restores once, then keeps the item state in memory and on
+    each pass replays only the entries appended since the previous pass. A
+    snapshot is written when at least ``min_entries`` entries arrived since
+    the last one. Each compaction verifies the snapshots on disk, keeps the
+    newest ``keep`` (at least two) that pass their checksum and deletes the
+    rest. Segments are retired only once ``keep`` verified snapshots exist,
+    and only up to the oldest of them, so a damaged newest snapshot can
+    always fall back to the previous one. With ``durable`` set, the segments
+    holding the entries a snapshot adds are ``fsync``-ed before it is
+    written, so a power loss cannot leave the journal ending below a
+    snapshot's watermark. :meth:`start` runs passes from a
+    daemon thread every ``interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        journal_dir: Path | str,
+        snapshot_dir: Path | str,
+        *,
+        interval: float = DEFAULT_COMPACT_INTERVAL,
+        min_entries: int = DEFAULT_MIN_ENTRIES,
+        keep: int = DEFAULT_KEEP_SNAPSHOTS,
+        durable: bool = True,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("'interval' must be positive")
+        if keep < 2:
+            raise ValueError("'keep' must be at least 2 so a damaged snapshot has a fallback")
+        self.journal_dir = Path(journal_dir)
+        self.snapshot_dir = Path(snapshot_dir)
+        self.interval = interval
+        self.min_entries = min_entries
+        self.keep = keep
+        self.durable = durable
+        self._items: MutableMapping[str, Any] | None = None
+        self._watermark: int | None = None
+        self._snapshot_watermark: int | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self, *, force: bool = False) -> CompactionReport:
+        """Catch up with the journal and compact if enough entries arrived."""
+
+        with self._lock, trace_span("journal.compact"):
+            report = CompactionReport()
+            started = time.monotonic()
+            if self._items is None:
+                self._items, restored = restore(self.journal_dir, self.snapshot_dir)
+                self._watermark = restored.replay.last_sequence
+                if self._watermark is None:
+                    self._watermark = restored.watermark
+                self._snapshot_watermark = restored.watermark
+                report.replayed = restored.replay.applied + len(restored.replay.failed)
+            else:
+                start = 0 if self._watermark is None else self._watermark + 1
+                _, tail = replay(JournalReader(self.journal_dir).iter_entries(start), self._items)
+                if tail.last_sequence is not None:
+                    self._watermark = tail.last_sequence
+                report.replayed = tail.applied + len(tail.failed)
+
+            watermark = self._watermark
+            covered = -1 if self._snapshot_watermark is None else self._snapshot_watermark
+            pending = 0 if watermark is None else watermark - covered
+            if watermark is not None and pending > 0 and (force or pending >= self.min_entries):
+                if self.durable:
+                    _sync_segments(self.journal_dir, covered)
+                report.snapshot = str(write_snapshot(self.snapshot_dir, self._items, watermark, durable=self.durable))
+                self._snapshot_watermark = watermark
+                kept, discarded = self._select_snapshots()
+                for path in discarded:
+                    path.unlink(missing_ok=True)
+                report.pruned_snapshots = [str(path) for path in discarded]
+                if len(kept) >= self.keep:
+                    report.retired_segments = [
+                        str(path) for path in retire_segments(self.journal_dir, kept[0], durable=self.durable)
+                    ]
+            report.watermark = watermark
+            report.items = len(self._items)
+            report.elapsed_seconds = time.monotonic() - started
+            return report
+
+    def _select_snapshots(self) -> Tuple[List[int], List[Path]]:
+        """Return the watermarks of the newest ``keep`` valid snapshots and every other path."""
+
+        kept: List[int] = []
+        discarded: List[Path] = []
+        for watermark, path in reversed(list_snapshots(self.snapshot_dir)):
+            if len(kept) < self.keep:
+                try:
+                    _verified_body(path)
+                except (OSError, ValueError) as exc:
+                    emit_event("journal.snapshot_invalid", path=str(path), error=str(exc))
+                else:
+                    kept.append(watermark)
+                    continue
+            discarded.append(path)
+        return kept[::-1], discarded[::-1]
+
+    def start(self) -> "Compactor":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="kernel-journal-compactor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 30.0) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def __enter__(self) -> "Compactor":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as exc:  # noqa: BLE001 - retry on the next pass
+                emit_event("journal.compaction_failed", error=str(exc), error_type=type(exc).__name__)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Restore or compact an item journal")
+    parser.add_argument("command", choices=["restore", "compact"])
+    parser.add_argument("journal", type=Path, help="Journal directory")
+    parser.add_argument("--snapshots", type=Path, help="Snapshot directory (default: <journal>/snapshots)")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP_SNAPSHOTS, help="Snapshots to keep when compacting")
+    parser.add_argument("--no-fsync", action="store_true", help="Skip fsync (scratch journals only)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    snapshot_dir = args.snapshots or args.journal / "snapshots"
+    if args.command == "restore":
+        items, restored = restore(args.journal, snapshot_dir)
+        summary = restored.to_dict()
+        summary["items"] = len(items)
+        print(json.dumps(summary, indent=2, sort_keys=True))
+        return 1 if restored.replay.failed else 0
+
+    compactor = Compactor(args.journal, snapshot_dir, keep=args.keep, durable=not args.no_fsync)
+    print(json.dumps(compactor.run_once(force=True).to_dict(), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+"""Merge journals from several nodes and flag overlapping concurrent edits (ADR-003)."""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, MutableMapping, Tuple
+
+from kernel.observability import emit_event, trace_span
+from kernel.validation import parse_pointer
+
+from .log import JournalEntry, JournalReader, ReplayReport, replay
+
+__all__ = ["MergedEntry", "OverlapIndex", "SyncConflict", "SyncPlan", "plan_sync", "main"]
+
+Pointer = Tuple[str, ...]
+Origin = FrozenSet[str]
+
+_PATCH_OPS = frozenset({"add", "remove", "replace", "move", "copy", "test"})
+
+
+class _TrieNode:
+    __slots__ = ("children", "writers", "subtree")
+
+    def __init__(self) -> None:
+        # Latest entry per origin that wrote exactly here / anywhere below.
+        # Most nodes are leaves written by one origin, so the maps are
+        # created on first use.
+        self.children: Dict[str, _TrieNode] | None = None
+        self.writers: Dict[Origin, int] | None = None
+        self.subtree: Dict[Origin, int] = {}
+
+
+def _concurrent(writers: Mapping[Origin, int] | None, origin: Origin) -> int | None:
+    if writers:
+        for other, ref in writers.items():
+            if other.isdisjoint(origin):
+                return ref
+    return None
+
+
+class OverlapIndex:
+    """Prefix trie of the JSON Pointers written to one item.
+
+    Each trie node remembers, per origin, the latest entry that wrote at
+    that pointer and the latest entry that wrote anywhere below it. An
+    origin is the set of nodes whose journals contain an entry; two entries
+    are concurrent when no node saw both. :meth:`add` walks the pointer
+    once, so checking a patch costs ``O(patch size * distinct origins)``
+    however many entries were indexed before.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+
+    def add(self, pointer: Pointer, origin: Origin, ref: int) -> int | None:
+        """Record a write and return a concurrent overlapping ``ref``, if any.
+
+        A write overlaps an earlier one at the same pointer, at an ancestor
+        or at a descendant.
+        """
+
+        node = self._root
+        conflict = None
+        for token in pointer:
+            if conflict is None:
+                conflict = _concurrent(node.writers, origin)
+            node.subtree[origin] = ref
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(token)
+            if child is None:
+                child = node.children[token] = _TrieNode()
+            node = child
+        if conflict is None:
+            conflict = _concurrent(node.writers, origin)
+        if conflict is None:
+            conflict = _concurrent(node.subtree, origin)
+        if node.writers is None:
+            node.writers = {}
+        node.writers[origin] = ref
+        node.subtree[origin] = ref
+        return conflict
+
+
+@dataclass(frozen=True)
+class MergedEntry:
+    """A journal entry in merged order and the nodes whose journals hold it."""
+
+    entry: JournalEntry
+    nodes: Tuple[str, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"nodes": list(self.nodes), **self.entry.to_dict()}
+
+
+@dataclass(frozen=True)
+class SyncConflict:
+    """Two concurrent entries that write overlapping pointers of one item."""
+
+    item_id: str
+    pointer: str
+    entry: MergedEntry
+    other: MergedEntry
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "item_id": self.item_id,
+            "pointer": self.pointer,
+            "entry": self.entry.to_dict(),
+            "other": self.other.to_dict(),
+        }
+
+
+@dataclass(frozen=True)
+class SyncPlan:
+    """Dry-run result of merging node journals.
+
+    ``entries`` is the deduplicated merge in timestamp order. Items with at
+    least one conflict are queued for human resolution: :meth:`apply` skips
+    every entry of those items so they stay at their last synced state.
+    """
+
+    entries: Tuple[MergedEntry, ...]
+    conflicts: Tuple[SyncConflict, ...]
+    duplicates: int
+
+    @property
+    def conflicted_items(self) -> Tuple[str, ...]:
+        return tuple(sorted({conflict.item_id for conflict in self.conflicts}))
+
+    def apply(
+        self,
+        items: MutableMapping[str, Any] | None = None,
+    ) -> Tuple[MutableMapping[str, Any], ReplayReport]:
+        """Replay the merged entries of conflict-free items onto ``items``."""
+
+        held = set(self.conflicted_items)
+        return replay((merged.entry for merged in self.entries if merged.entry.item_id not in held), items)
+
+    def to_dict(self) -> Dict[str, Any]:
+        held = set(self.conflicted_items)
+        items = {merged.entry.item_id for merged in self.entries}
+        return {
+            "entries": len(self.entries),
+            "duplicates": self.duplicates,
+            "items": len(items),
+            "merged_items": sorted(items - held),
+            "conflicted_items": sorted(held),
+            "conflicts": [conflict.to_dict() for conflict in self.conflicts],
+        }
+
+
+def _parse_timestamp(value: str) -> datetime:
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise ValueError(f"Invalid journal timestamp {value!r}") from exc
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def _written_pointers(patch: Iterable[Mapping[str, Any]]) -> List[Pointer]:
+    """Return the pointers a patch writes, widened for positional array edits.
+
+    ``add``, ``remove``, ``move`` and ``copy`` at an array index (or ``-``)
+    shift every later element, so they are recorded at the array itself and
+    overlap any concurrent write into it. A ``replace`` keeps its index.
+    """
+
+    written: Dict[Pointer, None] = {}
+    for operation in patch:
+        op = operation.get("op")
+        if op not in _PATCH_OPS:
+            raise ValueError(f"Unsupported patch operation: {op!r}")
+        if op == "test":
+            continue
+        for key in ("path", "from") if op == "move" else ("path",):
+            pointer = parse_pointer(operation[key])
+            if op != "replace" and pointer and (pointer[-1] == "-" or pointer[-1].isdigit()):
+                pointer = pointer[:-1]
+            written[pointer] = None
+    return list(written)
+
+
+def _format_pointer(pointer: Pointer) -> str:
+    return "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in pointer)
+
+
+def plan_sync(journals: Mapping[str, Iterable[JournalEntry]]) -> SyncPlan:
+    """Merge the entries each node recorded since the last sync.
+
+    ``journals`` maps a node name to its entries in journal order. Entries
+    that several journals already share (because they were pulled earlier)
+    are merged once. The rest are ordered by timestamp, then node and
+    sequence. An entry conflicts with an earlier one when they write
+    overlapping pointers of the same item and no node saw both. Inserting
+    into or removing from an array counts as a write to the whole array,
+    since it moves the elements other edits address by index.
+    """
+
+    started = time.monotonic()
+    with trace_span("journal.sync.plan"):
+        seen: Dict[Tuple[str, ...], int] = {}
+        collected: List[Tuple[Tuple[Any, ...], JournalEntry, List[str]]] = []
+        duplicates = 0
+        for node in sorted(journals):
+            for position, entry in enumerate(journals[node]):
+                key = (
+                    entry.item_id,
+                    entry.timestamp,
+                    entry.author,
+                    entry.persona,
+                    json.dumps(entry.patch, sort_keys=True, separators=(",", ":")),
+                )
+                index = seen.get(key)
+                if index is not None:
+                    if node not in collected[index][2]:
+                        collected[index][2].append(node)
+                    duplicates += 1
+                    continue
+                seen[key] = len(collected)
+                sequence = entry.sequence if entry.sequence is not None else position
+                collected.append(((_parse_timestamp(entry.timestamp), node, sequence), entry, [node]))
+        collected.sort(key=lambda record: record[0])
+        entries = tuple(MergedEntry(entry=entry, nodes=tuple(nodes)) for _, entry, nodes in collected)
+
+        indexes: Dict[str, OverlapIndex] = {}
+        conflicted: set = set()
+        conflicts: List[SyncConflict] = []
+        for ref, merged in enumerate(entries):
+            item_id = merged.entry.item_id
+            if item_id in conflicted:
+                continue
+            index = indexes.get(item_id)
+            if index is None:
+                index = indexes[item_id] = OverlapIndex()
+            origin = frozenset(merged.nodes)
+            for pointer in _written_pointers(merged.entry.patch):
+                other = index.add(pointer, origin, ref)
+                if other is not None:
+                    conflicts.append(
+                        SyncConflict(item_id=item_id, pointer=_format_pointer(pointer), entry=merged, other=entries[other])
+                    )
+                    conflicted.add(item_id)
+                    indexes.pop(item_id)
+                    break
+    plan = SyncPlan(entries=entries, conflicts=tuple(conflicts), duplicates=duplicates)
+    emit_event(
+        "journal.sync_planned",
+        nodes=len(journals),
+        entries=len(entries),
+        duplicates=duplicates,
+        conflicts=len(conflicts),
+        elapsed_seconds=round(time.monotonic() - started, 3),
+    )
+    return plan
+
+
+def _node_argument(value: str) -> Tuple[str, str]:
+    name, separator, rest = value.partition("=")
+    if not separator or not name or not rest:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {value!r}")
+    return name, rest
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Dry-run a merge of several node journals")
+    parser.add_argument("journals", nargs="+", type=_node_argument, help="NAME=DIRECTORY for each node")
+    parser.add_argument(
+        "--start",
+        action="append",
+        default=[],
+        type=_node_argument,
+        help="NAME=SEQUENCE: first entry of that node's journal not yet synced (repeatable)",
+    )
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    starts = {name: int(value) for name, value in args.start}
+    journals = {
+        name: JournalReader(directory).iter_entries(starts.get(name, 0)) for name, directory in args.journals
+    }
+    plan = plan_sync(journals)
+    print(json.dumps(plan.to_dict(), indent=2, sort_keys=True))
+    return 1 if plan.conflicts else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
@@ -0,0 +1,357 @@
+"""Lightweight observability helpers for structured logging and tracing."""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Protocol, Tuple
+
+from .metrics import Counter, Gauge, Histogram, MetricsRegistry, get_metrics
+from .sinks import AsyncJsonlSink
+from .tracing import (
+    ChromeTraceRecorder,
+    SpanContext,
+    SpanRecord,
+    _current_span,
+    current_span,
+    new_span_id,
+)
+
+_LOGGER = logging.getLogger("kernel")
+
+__all__ = [
+    "AsyncJsonlSink",
+    "ChromeTraceRecorder",
+    "Counter",
+    "EventSink",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "SpanContext",
+    "SpanRecord",
+    "add_event_sink",
+    "add_span_recorder",
+    "configure_events",
+    "current_span",
+    "emit_event",
+    "event_enabled",
+    "get_metrics",
+    "new_span_id",
+    "remove_event_sink",
+    "remove_span_recorder",
+    "trace_span",
+]
+
+SPAN_DURATION_METRIC = "span_duration_ms"
+SPAN_ERROR_METRIC = "span_errors_total"
+
+_default_level = logging.INFO
+_event_levels: Dict[str, int] = {}
+_sample_rates: Dict[str, float] = {}
+_resolved: Dict[str, Tuple[int, float]] = {}
+_random = random.Random()
+_sinks: Tuple["EventSink", ...] = ()
+_span_recorders: Tuple[ChromeTraceRecorder, ...] = ()
+
+
+class EventSink(Protocol):
+    """Destination receiving event records instead of the ``kernel`` logger."""
+
+    level: int
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def add_event_sink(sink: EventSink) -> EventSink:
+    """Route events to ``sink`` instead of the ``kernel`` logger.
+
+    While at least one sink is installed :func:`emit_event` hands the record to
+    every sink whose ``level`` admits the event and skips the logger, so the
+    caller pays neither serialisation nor I/O. Installed sinks are closed (and
+    thereby flushed) at interpreter shutdown.
+    """
+
+    global _sinks
+    if sink not in _sinks:
+        _sinks = _sinks + (sink,)
+        atexit.register(sink.close)
+    return sink
+
+
+def remove_event_sink(sink: EventSink, *, close: bool = True) -> None:
+    """Uninstall ``sink``, closing it unless ``close`` is false."""
+
+    global _sinks
+    _sinks = tuple(installed for installed in _sinks if installed is not sink)
+    atexit.unregister(sink.close)
+    if close:
+        sink.close()
+
+
+def add_span_recorder(recorder: ChromeTraceRecorder) -> ChromeTraceRecorder:
+    """Record every finished :func:`trace_span` in ``recorder``."""
+
+    global _span_recorders
+    if recorder not in _span_recorders:
+        _span_recorders = _span_recorders + (recorder,)
+    return recorder
+
+
+def remove_span_recorder(recorder: ChromeTraceRecorder) -> None:
+    global _span_recorders
+    _span_recorders = tuple(installed for installed in _span_recorders if installed is not recorder)
+
+
+def configure_events(
+    *,
+    levels: Mapping[str, int | str] | None = None,
+    sample_rates: Mapping[str, float] | None = None,
+    default_level: int | str | None = None,
+    reset: bool = False,
+) -> None:
+    """Configure per-event log levels and sampling.
+
+    Keys are event names or dotted prefixes: ``"derived"`` applies to every
+    ``derived.*`` event unless a more specific entry such as
+    ``"derived.metric"`` exists, and ``"*"`` matches any event. A sample rate
+    of ``0.01`` emits roughly one event in a hundred; ``0`` disables the event.
+
+    Parameters
+    ----------
+    levels:
+        Mapping of event name or prefix to a :mod:`logging` level.
+    sample_rates:
+        Mapping of event name or prefix to a probability between 0 and 1.
+    default_level:
+        Level used for events without a matching ``levels`` entry.
+    reset:
+        Discard the previous configuration before applying the new one.
+    """
+
+    global _default_level
+    if reset:
+        _event_levels.clear()
+        _sample_rates.clear()
+        _default_level = logging.INFO
+    if default_level is not None:
+        _default_level = _coerce_level(default_level)
+    for name, level in (levels or {}).items():
+        _event_levels[name] = _coerce_level(level)
+    for name, rate in (sample_rates or {}).items():
+        if not isinstance(rate, (int, float)) or not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sample rate for '{name}' must be a number between 0 and 1")
+        _sample_rates[name] = float(rate)
+    _resolved.clear()
+
+
+def event_enabled(event: str) -> bool:
+    """Return whether ``event`` would currently reach a log handler.
+
+    Hot paths use this to skip building payloads for filtered events.
+    """
+
+    level, rate = _resolve(event)
+    return rate > 0.0 and _has_listener(level)
+
+
+def emit_event(event: str, **payload: Any) -> Dict[str, Any]:
+    """Emit a structured log event.
+
+    Parameters
+    ----------
+    event:
+        Event name, e.g. ``"derived.metric"``.
+    payload:
+        Arbitrary serialisable keyword arguments.
+
+    Returns
+    -------
+    dict
+        The record that was emitted. This makes it easy to re-use in tests or
+        downstream processing.
+    """
+
+    record: Dict[str, Any] = {"event": event, **payload}
+    level, rate = _resolve(event)
+    if rate <= 0.0 or not _has_listener(level):
+        return record
+    if rate < 1.0:
+        if _random.random() >= rate:
+            return record
+        record["sample_rate"] = rate
+    if _sinks:
+        queued = dict(record, ts=time.time(), level=logging.getLevelName(level))
+        for sink in _sinks:
+            if level >= sink.level:
+                sink.submit(queued)
+        return record
+    try:
+        message = json.dumps(record, sort_keys=True)
+    except TypeError:
+        # Fall back to repr for objects that are not JSON serialisable yet.
+        serialisable = {key: repr(value) for key, value in record.items()}
+        message = json.dumps(serialisable, sort_keys=True)
+    _LOGGER.log(level, message)
+    return record
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[str]:
+    """Context manager emitting start/end events with duration metadata.
+
+    Spans nest through a context variable: a span opened inside another one
+    shares its ``trace_id`` and records the enclosing span as ``parent_id``.
+    Pass ``parent_context`` (a :class:`SpanContext`) to continue a trace from
+    another thread or process, and ``span_id`` to force an id.
+
+    Every span also records its duration in the ``span_duration_ms``
+    histogram of :func:`get_metrics`, labelled with the span name, counts
+    spans that exit with an exception in ``span_errors_total`` and is handed
+    to every recorder installed with :func:`add_span_recorder`.
+    """
+
+    parent = attributes.pop("parent_context", None) or _current_span.get()
+    span_id = attributes.pop("span_id", None) or new_span_id()
+    if parent is None:
+        context = SpanContext(trace_id=span_id, span_id=span_id)
+    else:
+        context = SpanContext(trace_id=parent.trace_id, span_id=span_id, parent_id=parent.span_id)
+    token = _current_span.set(context)
+    start_us = time.time_ns() // 1000
+    start_time = time.perf_counter()
+    if event_enabled("trace.start"):
+        emit_event(
+            "trace.start",
+            span=name,
+            span_id=span_id,
+            trace_id=context.trace_id,
+            parent_id=context.parent_id,
+            attributes=attributes,
+        )
+    try:
+        yield span_id
+    except Exception:
+        get_metrics().counter(SPAN_ERROR_METRIC, "Spans that exited with an exception.", span=name).inc()
+        raise
+    finally:
+        _current_span.reset(token)
+        duration_ms = (time.perf_counter() - start_time) * 1000.0
+        histogram = get_metrics().histogram(SPAN_DURATION_METRIC, "Span durations in milliseconds.", span=name)
+        histogram.observe(duration_ms)
+        if _span_recorders:
+            record = SpanRecord(
+                name=name,
+                trace_id=context.trace_id,
+                span_id=span_id,
+                parent_id=context.parent_id,
+                start_us=start_us,
+                duration_us=int(duration_ms * 1000.0),
+                pid=os.getpid(),
+                thread_id=threading.get_ident(),
+                attributes=attributes,
+            )
+            for recorder in _span_recorders:
+                recorder.record(record)
+        if event_enabled("trace.end"):
+            emit_event(
+                "trace.end",
+                span=name,
+                span_id=span_id,
+                trace_id=context.trace_id,
+                parent_id=context.parent_id,
+                start_us=start_us,
+                duration_ms=round(duration_ms, 3),
+                pid=os.getpid(),
+                thread_id=threading.get_ident(),
+                attributes=attributes,
+            )
+
+
+def _resolve(event: str) -> Tuple[int, float]:
+    cached = _resolved.get(event)
+    if cached is None:
+        cached = (_lookup(_event_levels, event, _default_level), _lookup(_sample_rates, event, 1.0))
+        _resolved[event] = cached
+    return cached
+
+
+def _lookup(table: Mapping[str, Any], event: str, default: Any) -> Any:
+    name = event
+    while True:
+        if name in table:
+            return table[name]
+        if "." not in name:
+            break
+        name = name.rsplit(".", 1)[0]
+    return table.get("*", default)
+
+
+def _has_listener(level: int) -> bool:
+    if _sinks:
+        return any(level >= sink.level for sink in _sinks)
+    return _is_listening(level)
+
+
+def _is_listening(level: int) -> bool:
+    if not _LOGGER.isEnabledFor(level):
+        return False
+    # Without handlers records only reach ``logging.lastResort``.
+    return _LOGGER.hasHandlers() or (logging.lastResort is not None and level >= logging.lastResort.level)
+
+
+def _coerce_level(level: int | str) -> int:
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(str(level).upper())
+    if not isinstance(resolved, int):
+        raise ValueError(f"Unknown log level '{level}'")
+    return resolved
+
+
+def _parse_env_mapping(variable: str) -> Dict[str, str]:
+    raw = os.environ.get(variable, "")
+    entries: Dict[str, str] = {}
+    for chunk in raw.split(","):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        name, separator, value = chunk.partition("=")
+        if not separator or not name.strip() or not value.strip():
+            raise ValueError(f"Invalid entry '{chunk}' in {variable}; expected 'event=value'")
+        entries[name.strip()] = value.strip()
+    return entries
+
+
+def _export_metrics_at_exit(path: str) -> None:
+    try:
+        get_metrics().write(path)
+    except OSError as exc:  # pragma: no cover - best effort during shutdown
+        _LOGGER.warning("Could not export metrics to %s: %s", path, exc)
+
+
+if os.environ.get("KERNEL_EVENT_SINK"):
+    add_event_sink(
+        AsyncJsonlSink(
+            os.environ["KERNEL_EVENT_SINK"],
+            overflow=os.environ.get("KERNEL_EVENT_SINK_OVERFLOW", "drop"),
+        ).start()
+    )
+
+if os.environ.get("KERNEL_METRICS_EXPORT"):
+    atexit.register(_export_metrics_at_exit, os.environ["KERNEL_METRICS_EXPORT"])
+
+configure_events(
+    levels=_parse_env_mapping("KERNEL_EVENT_LEVELS"),
+    sample_rates={
+        name: float(value) for name, value in _parse_env_mapping("KERNEL_EVENT_SAMPLE_RATES").items()
+    },
+)
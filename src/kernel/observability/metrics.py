@@ -0,0 +1,352 @@
+"""In-process counters, gauges and fixed-bucket histograms."""
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+__all__ = [
+    "DEFAULT_LATENCY_BUCKETS_MS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "get_metrics",
+]
+
+DEFAULT_LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+)
+
+_NAME_PATTERN = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_LABEL_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, labels: Labels) -> None:
+        self.name = name
+        self.labels = labels
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError(f"Counter '{self.name}' cannot be decreased")
+        with self._lock:
+            self._value += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"labels": dict(self.labels), "value": self._value}
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, labels: Labels) -> None:
+        self.name = name
+        self.labels = labels
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"labels": dict(self.labels), "value": self._value}
+
+
+class Histogram:
+    """Distribution of observations over fixed upper bucket bounds."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, labels: Labels, buckets: Sequence[float]) -> None:
+        bounds = tuple(float(bound) for bound in buckets)
+        if not bounds or any(later <= earlier for earlier, later in zip(bounds, bounds[1:])):
+            raise ValueError(f"Histogram '{name}' requires strictly increasing bucket bounds")
+        self.name = name
+        self.labels = labels
+        self.buckets = bounds
+        # One slot per bound plus the implicit ``+Inf`` bucket.
+        self._counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q`` quantile by interpolating within its bucket."""
+
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("Quantile must be between 0 and 1")
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            low, high = self._min, self._max
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else min(low, 0.0)
+                upper = self.buckets[index] if index < len(self.buckets) else high
+                estimate = lower + (upper - lower) * ((rank - cumulative) / bucket_count)
+                return min(max(estimate, low), high)
+            cumulative += bucket_count
+        return high
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            total_sum = self._sum
+        cumulative = 0
+        buckets: List[Tuple[str, int]] = []
+        for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+            cumulative += bucket_count
+            buckets.append((_format_bound(bound), cumulative))
+        return {
+            "labels": dict(self.labels),
+            "count": total,
+            "sum": total_sum,
+            "buckets": dict(buckets),
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Collection of named metrics keyed by name and label values."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[Tuple[str, Labels], Counter | Gauge | Histogram] = {}
+        self._kinds: Dict[str, str] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "", **labels: str) -> Counter:
+        return self._get(Counter, name, description, labels)  # type: ignore[return-value]
+
+    def gauge(self, name: str, description: str = "", **labels: str) -> Gauge:
+        return self._get(Gauge, name, description, labels)  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS,
+        **labels: str,
+    ) -> Histogram:
+        return self._get(Histogram, name, description, labels, buckets=buckets)  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        """Remove all registered metrics."""
+
+        with self._lock:
+            self._metrics.clear()
+            self._kinds.clear()
+            self._descriptions.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable view of every metric."""
+
+        payload: Dict[str, Any] = {}
+        for name, kind, metrics in self._grouped():
+            payload[name] = {
+                "type": kind,
+                "description": self._descriptions.get(name, ""),
+                "series": [metric.snapshot() for metric in metrics],
+            }
+        return payload
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+
+        lines: List[str] = []
+        for name, kind, metrics in self._grouped():
+            description = self._descriptions.get(name)
+            if description:
+                lines.append(f"# HELP {name} {_escape(description, quote=False)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for metric in metrics:
+                if isinstance(metric, Histogram):
+                    snapshot = metric.snapshot()
+                    for bound, cumulative in snapshot["buckets"].items():
+                        labels = _format_labels(metric.labels + (("le", bound),))
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = _format_labels(metric.labels)
+                    lines.append(f"{name}_sum{labels} {_format_value(snapshot['sum'])}")
+                    lines.append(f"{name}_count{labels} {snapshot['count']}")
+                else:
+                    lines.append(f"{name}{_format_labels(metric.labels)} {_format_value(metric.value)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path: Path | str, *, format: str | None = None) -> Path:
+        """Write a snapshot to ``path`` as ``"prometheus"`` or ``"json"``.
+
+        The format defaults to Prometheus text for ``.prom``/``.txt`` files and
+        JSON otherwise. A ``{pid}`` placeholder in ``path`` is replaced with the
+        current process id so pool workers do not overwrite each other.
+        """
+
+        target = Path(str(path).replace("{pid}", str(os.getpid())))
+        if format is None:
+            format = "prometheus" if target.suffix.lower() in {".prom", ".txt"} else "json"
+        if format == "prometheus":
+            content = self.to_prometheus()
+        elif format == "json":
+            content = json.dumps(self.snapshot(), indent=2, sort_keys=True) + "\n"
+        else:
+            raise ValueError(f"Unsupported metrics format '{format}'")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.tmp")
+        temporary.write_text(content, encoding="utf-8")
+        os.replace(temporary, target)
+        return target
+
+    # ------------------------------------------------------------------
+    # helpers
+    # ------------------------------------------------------------------
+    def _get(
+        self,
+        cls: type,
+        name: str,
+        description: str,
+        labels: Mapping[str, str],
+        **options: Any,
+    ) -> Counter | Gauge | Histogram:
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        metric = self._metrics.get(key)
+        if metric is not None and isinstance(metric, cls):
+            return metric
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                if not _NAME_PATTERN.fullmatch(name):
+                    raise ValueError(f"Invalid metric name '{name}'")
+                for label in labels:
+                    if not _LABEL_PATTERN.fullmatch(label) or label == "le":
+                        raise ValueError(f"Invalid label name '{label}' for metric '{name}'")
+                kind = self._kinds.setdefault(name, cls.kind)
+                if kind != cls.kind:
+                    raise ValueError(f"Metric '{name}' is already registered as a {kind}")
+                metric = cls(name, key[1], **options)
+                self._metrics[key] = metric
+                if description:
+                    self._descriptions.setdefault(name, description)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.kind}")
+        return metric
+
+    def _grouped(self) -> Iterable[Tuple[str, str, List[Counter | Gauge | Histogram]]]:
+        with self._lock:
+            entries = sorted(self._metrics.items())
+            kinds = dict(self._kinds)
+        grouped: Dict[str, List[Counter | Gauge | Histogram]] = {}
+        for (name, _), metric in entries:
+            grouped.setdefault(name, []).append(metric)
+        return [(name, kinds[name], metrics) for name, metrics in grouped.items()]
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry fed by :func:`trace_span`."""
+
+    return _default_registry
+
+
+def _format_bound(bound: float) -> str:
+    if math.isinf(bound):
+        return "+Inf"
+    return repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return "{" + rendered + "}"
+
+
+def _escape(value: str, *, quote: bool = True) -> str:
+    escaped = value.replace("\\", "\\\\").replace("\n", "\\n")
+    if quote:
+        escaped = escaped.replace('"', '\\"')
+    return escaped
@@ -0,0 +1,205 @@
+"""Background event sinks that keep log I/O off the caller's thread."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Mapping
+
+from .metrics import get_metrics
+
+__all__ = ["AsyncJsonlSink", "OVERFLOW_POLICIES"]
+
+OVERFLOW_POLICIES = ("drop", "block")
+
+_LOGGER = logging.getLogger("kernel")
+_live_sinks: "weakref.WeakSet[AsyncJsonlSink]" = weakref.WeakSet()
+
+
+class AsyncJsonlSink:
+    """Buffer event records in memory and append them to a JSONL file.
+
+    :meth:`submit` only appends the record to a bounded buffer; a daemon
+    writer thread serialises records in batches and flushes them to ``path``.
+    When the buffer is full the ``"drop"`` policy discards the new record and
+    counts it in ``dropped`` (and the ``event_sink_dropped_total`` metric),
+    while ``"block"`` makes the caller wait for the writer to catch up.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        capacity: int = 65536,
+        batch_size: int = 1024,
+        flush_interval: float = 0.5,
+        overflow: str = "drop",
+        level: int = logging.INFO,
+    ) -> None:
+        if capacity < 1 or batch_size < 1:
+            raise ValueError("'capacity' and 'batch_size' must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy '{overflow}'; expected one of {OVERFLOW_POLICIES}")
+        self.path = Path(path)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.level = level
+        self.dropped = 0
+        self.written = 0
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._in_flight = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._reset_state()
+        _live_sinks.add(self)
+
+    # ------------------------------------------------------------------
+    # public API
+    # ------------------------------------------------------------------
+    def start(self) -> "AsyncJsonlSink":
+        """Open the target file and start the writer thread."""
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Sink has been closed")
+            if self._thread is not None:
+                return self
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Unbuffered append: every batch is a single write() call, which
+            # keeps lines from forked workers sharing the file intact.
+            self._handle = self.path.open("ab", buffering=0)
+            self._thread = threading.Thread(target=self._run, name="kernel-event-sink", daemon=True)
+            self._thread.start()
+            # Deferred: importing multiprocessing costs several milliseconds.
+            from multiprocessing import util as multiprocessing_util
+
+            multiprocessing_util.register_after_fork(self, AsyncJsonlSink._close_at_worker_exit)
+        return self
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Queue ``record`` for writing; return ``False`` if it was dropped."""
+
+        with self._condition:
+            if self._closed:
+                return False
+            while len(self._buffer) >= self.capacity:
+                if self.overflow == "drop":
+                    self.dropped += 1
+                    get_metrics().counter(
+                        "event_sink_dropped_total", "Events dropped by a full sink buffer."
+                    ).inc()
+                    return False
+                self._condition.wait()
+                if self._closed:
+                    return False
+            self._buffer.append(record)
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify_all()
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued record has been written."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._buffer or self._in_flight:
+                if self._thread is None:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Flush outstanding records, stop the writer and close the file."""
+
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        handle = getattr(self, "_handle", None)
+        if handle is not None and not handle.closed:
+            handle.close()
+
+    # ------------------------------------------------------------------
+    # writer thread
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._buffer and not self._closed:
+                    self._condition.wait(self.flush_interval)
+                if not self._buffer and self._closed:
+                    return
+                batch: List[Dict[str, Any]] = []
+                while self._buffer and len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+                self._in_flight = len(batch)
+                # Wake producers blocked on a full buffer.
+                self._condition.notify_all()
+            try:
+                if batch:
+                    self._write(batch)
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self._condition.notify_all()
+
+    def _write(self, batch: List[Mapping[str, Any]]) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(json.dumps(record, sort_keys=True, default=repr))
+            except ValueError:
+                lines.append(json.dumps({key: repr(value) for key, value in record.items()}, sort_keys=True))
+        try:
+            self._handle.write(("\n".join(lines) + "\n").encode("utf-8"))
+        except (OSError, ValueError) as exc:
+            self.dropped += len(batch)
+            _LOGGER.warning("Event sink could not write to %s: %s", self.path, exc)
+            return
+        self.written += len(batch)
+
+    def _reset_state(self) -> None:
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+
+    def _after_fork(self) -> None:
+        # Only the forking thread survives in the child: drop records queued by
+        # the parent and restart the writer against the same file.
+        self._reset_state()
+        self._buffer.clear()
+        self._in_flight = 0
+        running = self._thread is not None and not self._closed
+        self._thread = None
+        if running:
+            self.start()
+
+    def _close_at_worker_exit(self) -> None:
+        # multiprocessing children leave through os._exit(), which skips atexit
+        # hooks but still runs the finalizers registered after the fork.
+        from multiprocessing import util as multiprocessing_util
+
+        multiprocessing_util.Finalize(self, self.close, exitpriority=10)
+
+
+def _reinitialise_after_fork() -> None:
+    for sink in list(_live_sinks):
+        sink._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinitialise_after_fork)
@@ -0,0 +1,188 @@
+"""Span context propagation and Chrome trace-event export."""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
+
+__all__ = [
+    "ChromeTraceRecorder",
+    "SpanContext",
+    "SpanRecord",
+    "current_span",
+    "iter_span_records",
+    "new_span_id",
+    "write_chrome_trace",
+]
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifiers of the active span and the trace it belongs to."""
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """Finished span with wall-clock start and duration in microseconds."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_us: int
+    duration_us: int
+    pid: int
+    thread_id: int
+    attributes: Mapping[str, Any] = field(default_factory=dict)
+
+    def to_chrome_event(self) -> Dict[str, Any]:
+        args: Dict[str, Any] = {"trace_id": self.trace_id, "span_id": self.span_id}
+        if self.parent_id is not None:
+            args["parent_id"] = self.parent_id
+        args.update(self.attributes)
+        return {
+            "name": self.name,
+            "cat": self.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": self.start_us,
+            "dur": self.duration_us,
+            "pid": self.pid,
+            "tid": self.thread_id,
+            "args": args,
+        }
+
+
+_current_span: ContextVar[SpanContext | None] = ContextVar("kernel_current_span", default=None)
+_span_counter = itertools.count(1)
+_span_prefix = os.urandom(4).hex()
+
+
+def new_span_id() -> str:
+    """Return a process-unique span id without touching the OS entropy pool.
+
+    Ids combine a random per-process prefix, reseeded after ``fork``, with a
+    monotonically increasing counter.
+    """
+
+    return f"{_span_prefix}{next(_span_counter):08x}"
+
+
+def current_span() -> SpanContext | None:
+    """Return the context of the innermost active :func:`trace_span`."""
+
+    return _current_span.get()
+
+
+class ChromeTraceRecorder:
+    """Collect finished spans in memory for export as Chrome trace events.
+
+    The output opens in ``chrome://tracing``, Perfetto or speedscope. Spans
+    beyond ``max_spans`` are counted in ``dropped`` instead of being kept.
+    """
+
+    def __init__(self, max_spans: int = 1_000_000) -> None:
+        self.max_spans = max_spans
+        self.dropped = 0
+        self._spans: List[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: SpanRecord) -> None:
+        with self._lock:
+            if len(self._spans) >= self.max_spans:
+                self.dropped += 1
+                return
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[SpanRecord]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self.dropped = 0
+
+    def write(self, path: Path | str) -> Path:
+        return write_chrome_trace(self.spans, path)
+
+
+def write_chrome_trace(spans: Iterable[SpanRecord], path: Path | str) -> Path:
+    """Write ``spans`` as a Chrome trace-event JSON document."""
+
+    events = [span.to_chrome_event() for span in sorted(spans, key=lambda span: span.start_us)]
+    target = Path(str(path).replace("{pid}", str(os.getpid())))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"traceEvents": events, "displayTimeUnit": "ms"}
+    target.write_text(json.dumps(payload, default=repr) + "\n", encoding="utf-8")
+    return target
+
+
+def iter_span_records(records: Iterable[Mapping[str, Any]]) -> Iterator[SpanRecord]:
+    """Rebuild spans from ``trace.end`` events, e.g. read back from a JSONL sink."""
+
+    for record in records:
+        if record.get("event") != "trace.end" or "start_us" not in record:
+            continue
+        attributes = record.get("attributes")
+        yield SpanRecord(
+            name=str(record.get("span")),
+            trace_id=str(record.get("trace_id", record.get("span_id"))),
+            span_id=str(record.get("span_id")),
+            parent_id=record.get("parent_id"),
+            start_us=int(record["start_us"]),
+            duration_us=int(round(float(record.get("duration_ms", 0.0)) * 1000.0)),
+            pid=int(record.get("pid", 0)),
+            thread_id=int(record.get("thread_id", 0)),
+            attributes=attributes if isinstance(attributes, Mapping) else {},
+        )
+
+
+def _reseed_after_fork() -> None:
+    global _span_prefix
+    _span_prefix = os.urandom(4).hex()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+
+def _iter_jsonl(paths: Iterable[Path]) -> Iterator[Mapping[str, Any]]:
+    for path in paths:
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, Mapping):
+                    yield record
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert kernel JSONL event logs into a Chrome trace")
+    parser.add_argument("events", nargs="+", type=Path, help="JSONL event files written by an event sink")
+    parser.add_argument("--output", "-o", type=Path, required=True, help="Chrome trace JSON to write")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    spans = list(iter_span_records(_iter_jsonl(args.events)))
+    write_chrome_trace(spans, args.output)
+    print(json.dumps({"spans": len(spans), "output": str(args.output)}, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
@@ -53,6 +53,24 @@ class TypeRegistry:
         return iter(self._entries.items())
 
 
+from .cache import ParsedSchemaCache
+from .graph import SchemaDependencyGraph, extract_refs
 from .loader import SchemaLoadReport, SchemaLoader
-
-__all__ = ["TypeRegistry", "SchemaLoader", "SchemaLoadReport"]
+from .snapshot import RegistrySnapshot, build_snapshot, current_snapshot, read_snapshot
+from .watch import SchemaChange, SchemaWatcher, watch_schemas
+
+__all__ = [
+    "ParsedSchemaCache",
+    "RegistrySnapshot",
+    "SchemaChange",
+    "SchemaDependencyGraph",
+    "SchemaWatcher",
+    "TypeRegistry",
+    "SchemaLoader",
+    "SchemaLoadReport",
+    "build_snapshot",
+    "current_snapshot",
+    "extract_refs",
+    "read_snapshot",
+    "watch_schemas",
+]
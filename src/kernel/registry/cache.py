@@ -0,0 +1,73 @@
+"""Content-addressed on-disk cache of parsed schema documents."""
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Mapping
+
+__all__ = ["CACHE_FORMAT", "ParsedSchemaCache"]
+
+CACHE_FORMAT = 1
+
+_INTERPRETER = tuple(sys.version_info[:2])
+
+
+class ParsedSchemaCache:
+    """Store parsed schema payloads keyed by source checksum and parser.
+
+    Entries live at ``<root>/<checksum[:2]>/<checksum>.<parser>.marshal`` and
+    are written atomically, so concurrent loaders (threads, pool workers or
+    separate CLI invocations) can share one directory. The parser tag keeps
+    e.g. PyYAML and the built-in YAML subset parser from sharing entries.
+    Payloads that :mod:`marshal` cannot encode, such as YAML timestamps, are
+    simply not cached. Unreadable or stale entries count as misses, and the
+    directory can be deleted at any time.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+
+    def path_for(self, checksum: str, parser: str) -> Path:
+        return self.root / checksum[:2] / f"{checksum}.{parser}.marshal"
+
+    def get(self, checksum: str, parser: str) -> Mapping[str, Any] | None:
+        """Return the cached payload or ``None`` on a miss."""
+
+        try:
+            with self.path_for(checksum, parser).open("rb") as handle:
+                envelope = marshal.load(handle)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if (
+            not isinstance(envelope, tuple)
+            or len(envelope) != 3
+            or envelope[0] != CACHE_FORMAT
+            or tuple(envelope[1]) != _INTERPRETER
+        ):
+            return None
+        return envelope[2]
+
+    def put(self, checksum: str, parser: str, payload: Mapping[str, Any]) -> bool:
+        """Persist ``payload``; return ``False`` when it cannot be cached."""
+
+        try:
+            encoded = marshal.dumps((CACHE_FORMAT, _INTERPRETER, payload))
+        except ValueError:
+            return False
+        target = self.path_for(checksum, parser)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temporary = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with temporary.open("wb") as handle:
+                    handle.write(encoded)
+                os.replace(temporary, target)
+            except BaseException:
+                temporary.unlink(missing_ok=True)
+                raise
+        except OSError:
+            return False
+        return True
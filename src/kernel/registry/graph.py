@@ -0,0 +1,152 @@
+"""``$ref`` dependency graph between registered schema documents."""
+from __future__ import annotations
+
+import posixpath
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+__all__ = ["SchemaDependencyGraph", "extract_refs"]
+
+
+def extract_refs(document: Any, key: str) -> Set[str]:
+    """Return the registry keys referenced through ``$ref`` inside ``document``.
+
+    References are resolved relative to ``key`` (``./timestamp.json`` inside
+    ``fields/task.json`` becomes ``fields/timestamp.json``). JSON-Pointer
+    fragments are dropped and purely local (``#/...``) or absolute URI
+    references are ignored.
+    """
+
+    base = posixpath.dirname(key)
+    refs: Set[str] = set()
+    stack = [document]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Mapping):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                target = ref.split("#", 1)[0]
+                if target and "://" not in target and not target.startswith("/"):
+                    refs.add(posixpath.normpath(posixpath.join(base, target)))
+            stack.extend(value for value in node.values() if isinstance(value, (Mapping, list)))
+        elif isinstance(node, list):
+            stack.extend(value for value in node if isinstance(value, (Mapping, list)))
+    refs.discard(key)
+    return refs
+
+
+class SchemaDependencyGraph:
+    """Track which schema documents reference which through ``$ref``.
+
+    Edges point from a document to the documents it references. The reverse
+    index answers "what must be rebuilt when this file changes": see
+    :meth:`affected_by`.
+    """
+
+    def __init__(self) -> None:
+        self._references: Dict[str, frozenset[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._references
+
+    def __len__(self) -> int:
+        return len(self._references)
+
+    def update(self, key: str, references: Iterable[str]) -> None:
+        """Replace the outgoing edges of ``key``."""
+
+        new = frozenset(references)
+        with self._lock:
+            for target in self._references.get(key, frozenset()) - new:
+                dependents = self._dependents.get(target)
+                if dependents is not None:
+                    dependents.discard(key)
+                    if not dependents:
+                        del self._dependents[target]
+            for target in new:
+                self._dependents.setdefault(target, set()).add(key)
+            self._references[key] = new
+
+    def remove(self, key: str) -> None:
+        """Drop ``key`` and its outgoing edges; edges pointing to it remain."""
+
+        with self._lock:
+            self.update(key, ())
+            del self._references[key]
+
+    def references(self, key: str, *, transitive: bool = False) -> Tuple[str, ...]:
+        """Return the documents ``key`` references, optionally transitively."""
+
+        with self._lock:
+            if not transitive:
+                return tuple(sorted(self._references.get(key, ())))
+            return tuple(sorted(self._walk([key], self._references) - {key}))
+
+    def dependents(self, key: str, *, transitive: bool = True) -> Tuple[str, ...]:
+        """Return the documents that reference ``key``, transitively by default."""
+
+        with self._lock:
+            if not transitive:
+                return tuple(sorted(self._dependents.get(key, ())))
+            return tuple(sorted(self._walk([key], self._dependents) - {key}))
+
+    def affected_by(self, changed: Iterable[str]) -> Tuple[str, ...]:
+        """Return ``changed`` plus every transitive dependent.
+
+        Keys are ordered so that each document comes after the documents it
+        references (ties and cycles are broken alphabetically), which is the
+        order in which compiled artefacts should be rebuilt.
+        """
+
+        with self._lock:
+            affected = self._walk(changed, self._dependents)
+            return self._topological(affected)
+
+    def unresolved(self) -> Dict[str, Tuple[str, ...]]:
+        """Return references that point at documents not in the graph."""
+
+        with self._lock:
+            missing: Dict[str, Tuple[str, ...]] = {}
+            for key, targets in sorted(self._references.items()):
+                absent = tuple(sorted(target for target in targets if target not in self._references))
+                if absent:
+                    missing[key] = absent
+            return missing
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {key: sorted(targets) for key, targets in sorted(self._references.items())}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._references.clear()
+            self._dependents.clear()
+
+    @staticmethod
+    def _walk(start: Iterable[str], edges: Mapping[str, Iterable[str]]) -> Set[str]:
+        seen: Set[str] = set()
+        stack = list(start)
+        while stack:
+            key = stack.pop()
+            if key in seen:
+                continue
+            seen.add(key)
+            stack.extend(edges.get(key, ()))
+        return seen
+
+    def _topological(self, keys: Set[str]) -> Tuple[str, ...]:
+        pending = {key: {target for target in self._references.get(key, ()) if target in keys} for key in keys}
+        ordered: List[str] = []
+        while pending:
+            ready = sorted(key for key, targets in pending.items() if not targets)
+            if not ready:
+                # Reference cycle: release the alphabetically first member.
+                ready = [min(pending)]
+            for key in ready:
+                del pending[key]
+                for targets in pending.values():
+                    targets.discard(key)
+            ordered.extend(ready)
+        return tuple(ordered)
@@ -3,22 +3,49 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import importlib.util
 import json
+import os
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Mapping
-
-try:  # Optional dependency, used only when available.
-    import yaml  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    yaml = None  # type: ignore
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Sequence
 
 from kernel.observability import emit_event, trace_span
 
 from . import TypeRegistry
+from .cache import ParsedSchemaCache
+from .graph import SchemaDependencyGraph, extract_refs
 
 SUPPORTED_EXTENSIONS = {".json", ".yaml", ".yml"}
+PARALLEL_THRESHOLD = 64
+READ_CHUNK_SIZE = 1 << 20
+
+InvalidationListener = Callable[[Sequence[str]], None]
+
+_ABSENT = object()
+
+
+@lru_cache(maxsize=None)
+def _yaml() -> Any:
+    """Return PyYAML, imported on first use, or ``None`` when unavailable.
+
+    Deferring the import keeps ``import kernel.types`` cheap for processes
+    that are served entirely from the parsed-schema cache.
+    """
+
+    try:  # Optional dependency, used only when available.
+        import yaml  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return yaml
+
+
+@lru_cache(maxsize=None)
+def _yaml_available() -> bool:
+    # Checked without importing PyYAML so parsed-cache hits never load it.
+    return importlib.util.find_spec("yaml") is not None
 
 
 @dataclass
@@ -28,17 +55,52 @@ class SchemaLoadReport:
     loaded: List[str] = field(default_factory=list)
     unchanged: List[str] = field(default_factory=list)
     removed: List[str] = field(default_factory=list)
+    invalidated: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, List[str]]:
         return {
             "loaded": list(self.loaded),
             "unchanged": list(self.unchanged),
             "removed": list(self.removed),
+            "invalidated": list(self.invalidated),
         }
 
 
+class _PreparedSchema(NamedTuple):
+    key: str
+    entry: Dict[str, object]
+    data: Mapping[str, object] | None
+    hashed: bool
+    cached: bool = False
+
+
 class SchemaLoader:
-    """Load schema files into a :class:`TypeRegistry` with persistence."""
+    """Load schema files into a :class:`TypeRegistry` with persistence.
+
+    Files are read, hashed and (when changed) parsed on a thread pool once a
+    tree holds at least ``PARALLEL_THRESHOLD`` documents; ``max_workers=1``
+    forces serial loading. Results are always registered in sorted path order.
+
+    The manifest records each file's size, ``mtime_ns`` and inode next to its
+    checksum. When all three still match, the recorded checksum is trusted and
+    the file is not read at all; ``load(verify=True)`` re-hashes every file.
+
+    Parsed payloads are kept in a :class:`ParsedSchemaCache` under
+    ``<manifest_dir>/parsed`` so a fresh process can fill its registry without
+    parsing (or even opening) unchanged schema files. Pass
+    ``parsed_cache=False`` to disable it.
+
+    ``graph`` tracks the ``$ref`` edges between documents. After each run,
+    ``SchemaLoadReport.invalidated`` lists every loaded or removed document
+    plus everything that references it, directly or transitively, in rebuild
+    order; listeners registered with :meth:`subscribe_invalidations` receive
+    the same list so compiled validators can rebuild just those entries.
+
+    The manifest is shared by every process using ``manifest_dir``, so once a
+    loader has run it decides what changed from the checksums it registered
+    itself (``checksums``); only its first run trusts the manifest. Keep one
+    loader per registry for hot reloads.
+    """
 
     def __init__(
         self,
@@ -46,17 +108,49 @@ class SchemaLoader:
         registry: TypeRegistry,
         manifest_dir: Path | str = "var/registry",
         manifest_name: str | None = None,
+        max_workers: int | None = None,
+        parsed_cache: bool = True,
     ) -> None:
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("'max_workers' must be at least 1")
         self.schema_root = Path(schema_root)
         self.registry = registry
+        self.max_workers = max_workers
         self.manifest_dir = Path(manifest_dir)
         self.manifest_dir.mkdir(parents=True, exist_ok=True)
         suffix = "json" if manifest_name is None else Path(manifest_name).suffix.lstrip(".") or "json"
         if manifest_name is None:
             manifest_name = f"schemas.{suffix}"
         self.manifest_path = self.manifest_dir / manifest_name
+        self.parsed_cache = ParsedSchemaCache(self.manifest_dir / "parsed") if parsed_cache else None
+        self.graph = SchemaDependencyGraph()
+        self.checksums: Dict[str, str] = {}
+        self._synced = False
+        self._invalidation_listeners: List[InvalidationListener] = []
+
+    def subscribe_invalidations(self, listener: InvalidationListener) -> InvalidationListener:
+        """Call ``listener`` with the invalidated keys after every run that has any."""
+
+        self._invalidation_listeners.append(listener)
+        return listener
+
+    def load(
+        self,
+        *,
+        verify: bool = False,
+        validate: Callable[[SchemaLoadReport], None] | None = None,
+    ) -> SchemaLoadReport:
+        """Synchronise the registry with the schema root.
+
+        With ``verify`` set every file is read and hashed even when its size,
+        modification time and inode match the manifest.
+
+        ``validate`` is called with the report once the registry holds the
+        new documents. If it raises, the registry is restored, the manifest
+        is left untouched and the exception propagates, so the next run
+        reports the same documents as loaded or removed again.
+        """
 
-    def load(self) -> SchemaLoadReport:
         with trace_span(
             "registry.load_schemas",
             schema_root=str(self.schema_root),
@@ -64,17 +158,30 @@ class SchemaLoader:
         ) as span_id:
             manifest = self._read_manifest()
             report = SchemaLoadReport()
-            discovered = {}
-
-            for path in self._discover_schema_files():
-                key = path.relative_to(self.schema_root).as_posix()
-                checksum = self._checksum(path)
-                previous_checksum = manifest.get("schemas", {}).get(key, {}).get("checksum")
-                should_skip = previous_checksum == checksum and key in self.registry
-
-                if should_skip:
+            replaced: Dict[str, Any] = {}
+            discovered: Dict[str, Dict[str, object]] = {}
+            hashed = 0
+            cache_hits = 0
+            previous = manifest.get("schemas", {})
+            # Another process may have rewritten the manifest since this loader
+            # filled the registry, so its own checksums decide what is current.
+            if self._synced:
+                known: Mapping[str, object] = self.checksums
+            else:
+                known = {key: entry.get("checksum") for key, entry in previous.items()}
+            # Files modified in the same timestamp tick as the manifest write
+            # cannot be told apart by stat alone ("racily clean"), so they are
+            # always hashed.
+            trusted_before = self._manifest_mtime_ns() if not verify else 0
+
+            for prepared in self._prepare_all(self._discover_schema_files(), previous, known, trusted_before):
+                key = prepared.key
+                checksum = prepared.entry["checksum"]
+                discovered[key] = prepared.entry
+                hashed += prepared.hashed
+                cache_hits += prepared.cached
+                if prepared.data is None:
                     report.unchanged.append(key)
-                    discovered[key] = {"checksum": checksum}
                     emit_event(
                         "registry.schema.skipped",
                         span_id=span_id,
@@ -83,10 +190,9 @@ class SchemaLoader:
                     )
                     continue
 
-                data = self._load_schema(path)
-                self.registry.register(key, data, overwrite=True)
+                replaced[key] = self.registry.get(key) if key in self.registry else _ABSENT
+                self.registry.register(key, prepared.data, overwrite=True)
                 report.loaded.append(key)
-                discovered[key] = {"checksum": checksum}
                 emit_event(
                     "registry.schema.loaded",
                     span_id=span_id,
@@ -94,9 +200,9 @@ class SchemaLoader:
                     checksum=checksum,
                 )
 
-            for key in sorted(set(manifest.get("schemas", {})) - set(discovered)):
+            for key in sorted(set(known) - set(discovered)):
                 if key in self.registry:
-                    self.registry.deregister(key)
+                    replaced[key] = self.registry.deregister(key)
                 report.removed.append(key)
                 emit_event(
                     "registry.schema.removed",
@@ -104,7 +210,25 @@ class SchemaLoader:
                     key=key,
                 )
 
+            if validate is not None:
+                try:
+                    validate(report)
+                except Exception:
+                    self._restore(replaced)
+                    raise
+
+            report.invalidated = self._update_graph(report)
+            if report.invalidated:
+                emit_event(
+                    "registry.schema.invalidated",
+                    span_id=span_id,
+                    keys=report.invalidated[:20],
+                    count=len(report.invalidated),
+                )
+
             self._write_manifest(discovered)
+            self.checksums = {key: str(entry["checksum"]) for key, entry in discovered.items()}
+            self._synced = True
             emit_event(
                 "registry.schema.manifest_written",
                 span_id=span_id,
@@ -117,25 +241,127 @@ class SchemaLoader:
                 loaded=len(report.loaded),
                 skipped=len(report.unchanged),
                 removed=len(report.removed),
+                invalidated=len(report.invalidated),
+                hashed=hashed,
+                cache_hits=cache_hits,
             )
+        if report.invalidated:
+            for listener in list(self._invalidation_listeners):
+                listener(tuple(report.invalidated))
         return report
 
-    def _discover_schema_files(self) -> Iterable[Path]:
+    def graph_checksum(self, key: str) -> str:
+        """Return a digest of ``key`` and every document it references, transitively.
+
+        It is built from the manifest checksums of the last :meth:`load`, so it
+        changes exactly when a document a validator for ``key`` depends on does.
+        """
+
+        if key not in self.checksums:
+            raise KeyError(f"'{key}' has not been loaded")
+        digest = hashlib.sha256()
+        for name in (key, *self.graph.references(key, transitive=True)):
+            digest.update(f"{name}\0{self.checksums.get(name, 'missing')}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _restore(self, replaced: Mapping[str, Any]) -> None:
+        for key, payload in replaced.items():
+            if payload is _ABSENT:
+                if key in self.registry:
+                    self.registry.deregister(key)
+            else:
+                self.registry.register(key, payload, overwrite=True)
+
+    def _update_graph(self, report: SchemaLoadReport) -> List[str]:
+        for key in report.loaded:
+            self.graph.update(key, extract_refs(self.registry.get(key), key))
+        for key in report.unchanged:
+            # A fresh loader over an already populated registry only sees
+            # unchanged files; their edges come from the registered payload.
+            if key not in self.graph:
+                self.graph.update(key, extract_refs(self.registry.get(key), key))
+        for key in report.removed:
+            if key in self.graph:
+                self.graph.remove(key)
+        return list(self.graph.affected_by([*report.loaded, *report.removed]))
+
+    def _prepare_all(
+        self,
+        paths: List[Path],
+        previous: Mapping[str, Mapping[str, object]],
+        known: Mapping[str, object],
+        trusted_before: int,
+    ) -> Iterable[_PreparedSchema]:
+        workers = self.max_workers
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) + 4) if len(paths) >= PARALLEL_THRESHOLD else 1
+
+        def _prepare(path: Path) -> _PreparedSchema:
+            key = path.relative_to(self.schema_root).as_posix()
+            stat = os.stat(path)
+            entry: Dict[str, object] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "inode": stat.st_ino,
+            }
+            recorded = previous.get(key, {})
+            previous_checksum = recorded.get("checksum")
+            content: bytes | None = None
+            if previous_checksum and _stat_matches(recorded, entry, trusted_before):
+                entry["checksum"] = previous_checksum
+            else:
+                content = self._read_bytes(path)
+                entry["checksum"] = hashlib.sha256(content).hexdigest()
+            hashed = content is not None
+            if entry["checksum"] == known.get(key) and key in self.registry:
+                return _PreparedSchema(key, entry, None, hashed)
+            checksum = str(entry["checksum"])
+            parser = self._parser_tag(path)
+            if self.parsed_cache is not None:
+                data = self.parsed_cache.get(checksum, parser)
+                if data is not None:
+                    return _PreparedSchema(key, entry, data, hashed, cached=True)
+            if content is None:
+                content = self._read_bytes(path)
+            data = self._parse_schema(path, content.decode("utf-8"))
+            if self.parsed_cache is not None:
+                self.parsed_cache.put(checksum, parser, data)
+            return _PreparedSchema(key, entry, data, hashed)
+
+        if workers == 1 or len(paths) < 2:
+            return [_prepare(path) for path in paths]
+        from concurrent.futures import ThreadPoolExecutor  # deferred: only large trees use threads
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="schema-loader") as executor:
+            # ``map`` yields in submission order, so registration stays deterministic
+            # and the first failing file (in path order) raises.
+            return list(executor.map(_prepare, paths))
+
+    def _discover_schema_files(self) -> List[Path]:
         if not self.schema_root.exists():
             return []
+        # ``os.walk`` classifies entries from the directory listing, so discovery
+        # itself does not stat every file.
         files: List[Path] = []
-        for path in sorted(self.schema_root.rglob("*")):
-            if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS:
-                files.append(path)
-        return files
+        for directory, _, filenames in os.walk(self.schema_root):
+            for filename in filenames:
+                path = Path(directory) / filename
+                if path.suffix.lower() in SUPPORTED_EXTENSIONS:
+                    files.append(path)
+        return sorted(files)
 
-    def _load_schema(self, path: Path) -> Mapping[str, object]:
+    @staticmethod
+    def _parser_tag(path: Path) -> str:
+        if path.suffix.lower() == ".json":
+            return "json"
+        return "yaml" if _yaml_available() else "yaml-subset"
+
+    def _parse_schema(self, path: Path, content: str) -> Mapping[str, object]:
         suffix = path.suffix.lower()
-        with path.open("r", encoding="utf-8") as handle:
-            content = handle.read()
         if suffix == ".json":
             return json.loads(content)
         if suffix in {".yaml", ".yml"}:
+            yaml = _yaml()
             if yaml is None:
                 return self._load_simple_yaml(content)
             data = yaml.safe_load(content)
@@ -171,14 +397,20 @@ class SchemaLoader:
                 result[key] = current_list
         return result
 
-    def _checksum(self, path: Path) -> str:
-        digest = hashlib.sha256()
-        with path.open("rb") as handle:
-            for chunk in iter(lambda: handle.read(4096), b""):
-                digest.update(chunk)
-        return digest.hexdigest()
-
-    def _read_manifest(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+    @staticmethod
+    def _read_bytes(path: Path) -> bytes:
+        # Schema documents are small: read each one in a single call and reuse
+        # the bytes for both the checksum and parsing.
+        with path.open("rb", buffering=READ_CHUNK_SIZE) as handle:
+            return handle.read()
+
+    def _manifest_mtime_ns(self) -> int:
+        try:
+            return self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Dict[str, object]]]:
         if not self.manifest_path.exists():
             return {}
         suffix = self.manifest_path.suffix.lower()
@@ -187,6 +419,7 @@ class SchemaLoader:
             if not content:
                 return {}
             if suffix in {".yaml", ".yml"}:
+                yaml = _yaml()
                 if yaml is None:
                     raise RuntimeError("PyYAML is required to read YAML manifests")
                 loaded = yaml.safe_load(content) or {}
@@ -198,15 +431,16 @@ class SchemaLoader:
             loaded["schemas"] = {}
         return loaded
 
-    def _write_manifest(self, schemas: Mapping[str, Mapping[str, str]]) -> None:
+    def _write_manifest(self, schemas: Mapping[str, Mapping[str, object]]) -> None:
         payload = {
             "version": 1,
             "generated_at": datetime.utcnow().isoformat() + "Z",
-            "schemas": {key: {"checksum": value["checksum"]} for key, value in schemas.items()},
+            "schemas": {key: dict(value) for key, value in schemas.items()},
         }
         suffix = self.manifest_path.suffix.lower()
         with self.manifest_path.open("w", encoding="utf-8") as handle:
             if suffix in {".yaml", ".yml"}:
+                yaml = _yaml()
                 if yaml is None:
                     raise RuntimeError("PyYAML is required to write YAML manifests")
                 yaml.safe_dump(payload, handle)
@@ -215,6 +449,12 @@ class SchemaLoader:
                 handle.write("\n")
 
 
+def _stat_matches(recorded: Mapping[str, object], current: Mapping[str, object], trusted_before: int) -> bool:
+    if any(recorded.get(name) != current[name] for name in ("size", "mtime_ns", "inode")):
+        return False
+    return int(current["mtime_ns"]) < trusted_before
+
+
 def main(argv: Iterable[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Load schemas into the registry")
     parser.add_argument("--schema-root", default="schema", help="Directory containing schema documents")
@@ -228,11 +468,32 @@ def main(argv: Iterable[str] | None = None) -> int:
         default=None,
         help="Optional manifest filename (defaults to schemas.json)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Threads used to hash and parse schema files (defaults to automatic)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Re-hash every schema instead of trusting unchanged size/mtime/inode",
+    )
+    parser.add_argument(
+        "--no-parsed-cache",
+        action="store_true",
+        help="Parse every changed schema instead of reusing the on-disk parsed cache",
+    )
     parser.add_argument(
         "--registry-dump",
         default=None,
         help="Optional path to write the loaded registry contents as JSON",
     )
+    parser.add_argument(
+        "--dependency-graph",
+        default=None,
+        help="Optional path to write the $ref dependency graph as JSON",
+    )
     args = parser.parse_args(list(argv) if argv is not None else None)
 
     registry = TypeRegistry()
@@ -241,8 +502,10 @@ def main(argv: Iterable[str] | None = None) -> int:
         registry=registry,
         manifest_dir=Path(args.manifest_dir),
         manifest_name=args.manifest_name,
+        max_workers=args.workers,
+        parsed_cache=not args.no_parsed_cache,
     )
-    report = loader.load()
+    report = loader.load(verify=args.verify)
 
     summary = report.to_dict()
     print(json.dumps(summary, indent=2, sort_keys=True))
@@ -253,6 +516,12 @@ def main(argv: Iterable[str] | None = None) -> int:
         registry_payload = {name: value for name, value in registry.list()}
         dump_path.write_text(json.dumps(registry_payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
+    if args.dependency_graph:
+        graph_path = Path(args.dependency_graph)
+        graph_path.parent.mkdir(parents=True, exist_ok=True)
+        graph_payload = {"references": loader.graph.to_dict(), "unresolved": loader.graph.unresolved()}
+        graph_path.write_text(json.dumps(graph_payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
     return 0
 
 
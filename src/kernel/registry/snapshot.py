@@ -0,0 +1,310 @@
+"""Single-file snapshot of the validated capability, type and derived registries."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from kernel.observability import emit_event, trace_span
+
+from .loader import SUPPORTED_EXTENSIONS
+
+__all__ = [
+    "RegistrySnapshot",
+    "SNAPSHOT_FORMAT",
+    "build_snapshot",
+    "current_snapshot",
+    "default_snapshot_path",
+    "read_snapshot",
+    "main",
+]
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_NAME = "registry.snapshot"
+
+_MAGIC = b"KERNSNAP"
+_DIGEST_SIZE = 32
+_DISABLED = {"0", "off", "false", "no"}
+
+SourceEntry = Dict[str, Any]
+
+_current_lock = threading.Lock()
+_current: Dict[Path, "RegistrySnapshot | None"] = {}
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """Validated registry content plus fingerprints of the files it came from.
+
+    ``roots`` maps each section (``capabilities``, ``types``, ``derived``) to
+    its schema directory and ``sources`` maps each section to the files found
+    there with their checksum, size, ``mtime_ns`` and inode. Definitions are
+    stored as plain mappings so reading a snapshot never imports the modules
+    that own the dataclasses.
+    """
+
+    format: int
+    created_at: str
+    roots: Mapping[str, str]
+    sources: Mapping[str, Mapping[str, SourceEntry]]
+    capabilities: Tuple[Mapping[str, Any], ...]
+    capability_sources: Mapping[str, str]
+    types: Tuple[Mapping[str, Any], ...]
+    type_sources: Mapping[str, str]
+    derived: Tuple[Mapping[str, Any], ...]
+    derived_sources: Mapping[str, str]
+    trusted_before_ns: int = field(default=0, compare=False)
+
+    def stale_sources(self) -> List[str]:
+        """Return ``section/path`` entries whose files no longer match.
+
+        Files whose size, ``mtime_ns`` and inode are unchanged (and that are
+        older than the snapshot file) are trusted without being read; every
+        other file is re-hashed.
+        """
+
+        stale: List[str] = []
+        for section, recorded in self.sources.items():
+            root = Path(self.roots[section])
+            current = _scan_section(section, root)
+            for name in sorted(set(recorded) | set(current)):
+                entry = recorded.get(name)
+                state = current.get(name)
+                if entry is None or state is None:
+                    stale.append(f"{section}/{name}")
+                    continue
+                if _stat_key(entry) == _stat_key(state) and state["mtime_ns"] < self.trusted_before_ns:
+                    continue
+                if _hash_file(root / name) != entry["checksum"]:
+                    stale.append(f"{section}/{name}")
+        return stale
+
+    def is_current(self) -> bool:
+        return not self.stale_sources()
+
+    def covers(self, section: str, root: Path | str) -> bool:
+        """Return whether the snapshot was built from ``root`` for ``section``."""
+
+        recorded = self.roots.get(section)
+        return recorded is not None and os.path.abspath(recorded) == os.path.abspath(root)
+
+    def to_summary(self) -> Dict[str, Any]:
+        return {
+            "format": self.format,
+            "created_at": self.created_at,
+            "roots": dict(self.roots),
+            "sources": {section: len(entries) for section, entries in self.sources.items()},
+            "capabilities": len(self.capabilities),
+            "types": len(self.types),
+            "derived": len(self.derived),
+        }
+
+
+def default_snapshot_path() -> Path:
+    """Return ``KERNEL_REGISTRY_SNAPSHOT`` or ``registry.snapshot`` in the cache dir."""
+
+    override = os.environ.get("KERNEL_REGISTRY_SNAPSHOT")
+    if override and override.strip().lower() not in _DISABLED:
+        return Path(override)
+    cache_dir = os.environ.get("KERNEL_REGISTRY_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir) / SNAPSHOT_NAME
+    return Path(os.environ.get("TMPDIR", "/tmp")) / "kernel-registry" / SNAPSHOT_NAME
+
+
+def build_snapshot(
+    path: Path | str | None = None,
+    *,
+    derived_root: Path | str | None = None,
+) -> RegistrySnapshot:
+    """Bootstrap every registry from disk and write the result to ``path``."""
+
+    # Imported lazily: these packages are built on top of kernel.registry.
+    from kernel import capabilities
+    from kernel.derived import DerivedEvaluator
+    from kernel.derived.evaluator import _default_schema_root
+    from kernel.types import base as types_base
+
+    target = Path(path) if path is not None else default_snapshot_path()
+    roots = {
+        "capabilities": capabilities._schema_root(),
+        "types": types_base._schema_root(),
+        "derived": Path(derived_root) if derived_root is not None else _default_schema_root(),
+    }
+    with trace_span("registry.snapshot.build", path=str(target)):
+        # Fingerprint first: anything edited while we build makes the snapshot stale.
+        sources = {section: _fingerprint_section(section, root) for section, root in roots.items()}
+        types_base.bootstrap_types(force=True)
+        evaluator = DerivedEvaluator(schema_root=roots["derived"], use_snapshot=False)
+        derived_root_path = evaluator.schema_root
+
+        snapshot = RegistrySnapshot(
+            format=SNAPSHOT_FORMAT,
+            created_at=datetime.utcnow().isoformat() + "Z",
+            roots={section: str(root) for section, root in roots.items()},
+            sources=sources,
+            capabilities=tuple(asdict(item) for item in capabilities._capabilities_by_key.values()),
+            capability_sources=dict(capabilities._capability_sources),
+            types=tuple(asdict(item) for item in types_base._manifests_by_type.values()),
+            type_sources=dict(types_base._type_sources),
+            derived=tuple(asdict(evaluator.definition_for(key)) for key in evaluator.list_types()),
+            derived_sources={
+                Path(source).relative_to(derived_root_path).as_posix(): type_key
+                for source, type_key in evaluator._sources.items()
+            },
+        )
+        _write(target, snapshot)
+    with _current_lock:
+        _current.pop(target, None)
+    emit_event("registry.snapshot.built", path=str(target), **snapshot.to_summary())
+    return snapshot
+
+
+def read_snapshot(path: Path | str | None = None) -> RegistrySnapshot | None:
+    """Read a snapshot file, returning ``None`` if it is missing or invalid."""
+
+    target = Path(path) if path is not None else default_snapshot_path()
+    try:
+        with target.open("rb") as handle:
+            content = handle.read()
+            trusted_before = os.fstat(handle.fileno()).st_mtime_ns
+    except OSError:
+        return None
+    header = len(_MAGIC) + 2 + _DIGEST_SIZE
+    if len(content) < header or not content.startswith(_MAGIC):
+        return None
+    version = int.from_bytes(content[len(_MAGIC) : len(_MAGIC) + 2], "big")
+    digest = content[len(_MAGIC) + 2 : header]
+    body = memoryview(content)[header:]
+    if version != SNAPSHOT_FORMAT or hashlib.sha256(body).digest() != digest:
+        emit_event("registry.snapshot.invalid", path=str(target), format=version)
+        return None
+    try:
+        payload = marshal.loads(body)
+        return RegistrySnapshot(**payload, trusted_before_ns=trusted_before)
+    except (EOFError, ValueError, TypeError):
+        emit_event("registry.snapshot.invalid", path=str(target), format=version)
+        return None
+
+
+def current_snapshot(path: Path | str | None = None) -> RegistrySnapshot | None:
+    """Return the snapshot at ``path`` if it still matches its sources.
+
+    The result is memoised per process so the capability, type and derived
+    bootstraps share one read and one freshness check. Setting
+    ``KERNEL_REGISTRY_SNAPSHOT`` to ``off`` disables snapshots entirely.
+    """
+
+    if os.environ.get("KERNEL_REGISTRY_SNAPSHOT", "").strip().lower() in _DISABLED:
+        return None
+    target = Path(path) if path is not None else default_snapshot_path()
+    with _current_lock:
+        if target in _current:
+            return _current[target]
+        snapshot = read_snapshot(target)
+        if snapshot is not None:
+            stale = snapshot.stale_sources()
+            if stale:
+                emit_event("registry.snapshot.stale", path=str(target), stale=stale[:20], count=len(stale))
+                snapshot = None
+            else:
+                emit_event("registry.snapshot.loaded", path=str(target))
+        _current[target] = snapshot
+        return snapshot
+
+
+def _write(target: Path, snapshot: RegistrySnapshot) -> None:
+    payload = asdict(snapshot)
+    payload.pop("trusted_before_ns")
+    body = marshal.dumps(payload)
+    content = _MAGIC + SNAPSHOT_FORMAT.to_bytes(2, "big") + hashlib.sha256(body).digest() + body
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with temporary.open("wb") as handle:
+        handle.write(content)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, target)
+
+
+def _scan_section(section: str, root: Path) -> Dict[str, SourceEntry]:
+    state: Dict[str, SourceEntry] = {}
+    if not root.is_dir():
+        return state
+    if section == "derived":
+        # Mirrors DerivedEvaluator.load_definitions, which only reads top-level YAML files.
+        candidates: Iterable[Path] = (path for path in root.glob("*.yaml") if path.is_file())
+    else:
+        candidates = (
+            Path(directory) / filename
+            for directory, _, filenames in os.walk(root)
+            for filename in filenames
+            if Path(filename).suffix.lower() in SUPPORTED_EXTENSIONS
+        )
+    for path in candidates:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        state[path.relative_to(root).as_posix()] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "inode": stat.st_ino,
+        }
+    return state
+
+
+def _fingerprint_section(section: str, root: Path) -> Dict[str, SourceEntry]:
+    entries = _scan_section(section, root)
+    for name, entry in entries.items():
+        entry["checksum"] = _hash_file(root / name)
+    return dict(sorted(entries.items()))
+
+
+def _stat_key(entry: Mapping[str, Any]) -> Tuple[Any, Any, Any]:
+    return entry.get("size"), entry.get("mtime_ns"), entry.get("inode")
+
+
+def _hash_file(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or inspect the kernel registry snapshot")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="Validate every schema and write a snapshot")
+    build.add_argument("--output", type=Path, default=None, help="Snapshot file (defaults to the cache dir)")
+    build.add_argument("--derived-root", type=Path, default=None, help="Directory of derived definitions")
+    verify = subcommands.add_parser("verify", help="Check whether a snapshot still matches its sources")
+    verify.add_argument("--path", type=Path, default=None, help="Snapshot file (defaults to the cache dir)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    if args.command == "build":
+        target = args.output or default_snapshot_path()
+        snapshot = build_snapshot(target, derived_root=args.derived_root)
+        print(json.dumps({"path": str(target), **snapshot.to_summary()}, indent=2, sort_keys=True))
+        return 0
+
+    target = args.path or default_snapshot_path()
+    snapshot = read_snapshot(target)
+    if snapshot is None:
+        print(json.dumps({"path": str(target), "valid": False}, indent=2, sort_keys=True))
+        return 1
+    stale = snapshot.stale_sources()
+    summary = {"path": str(target), "valid": True, "current": not stale, "stale": stale, **snapshot.to_summary()}
+    print(json.dumps(summary, indent=2, sort_keys=True))
+    return 0 if not stale else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
@@ -0,0 +1,207 @@
+"""Watch schema directories and apply edits to the live registries."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Protocol, Sequence, Tuple
+
+from kernel.observability import emit_event
+
+from .loader import SUPPORTED_EXTENSIONS
+
+__all__ = ["DEFAULT_POLL_INTERVAL", "SchemaChange", "SchemaWatcher", "watch_schemas"]
+
+DEFAULT_POLL_INTERVAL = 0.1
+
+FileState = Tuple[int, int, int]
+ChangeHandler = Callable[[Sequence["SchemaChange"]], None]
+
+
+@dataclass(frozen=True)
+class SchemaChange:
+    """Files added, modified or removed below one watched root."""
+
+    root: str
+    directory: Path
+    added: Tuple[str, ...] = ()
+    modified: Tuple[str, ...] = ()
+    removed: Tuple[str, ...] = ()
+
+    def paths(self) -> Tuple[Path, ...]:
+        """Return absolute paths of every changed file."""
+
+        return tuple(self.directory / name for name in (*self.added, *self.modified, *self.removed))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "root": self.root,
+            "added": list(self.added),
+            "modified": list(self.modified),
+            "removed": list(self.removed),
+        }
+
+
+class SchemaWatcher:
+    """Detect schema edits by comparing ``stat`` snapshots of named roots.
+
+    :meth:`poll` walks every root, compares size, ``mtime_ns`` and inode with
+    the previous snapshot and hands the resulting :class:`SchemaChange` list to
+    every subscribed handler. :meth:`start` polls from a daemon thread every
+    ``interval`` seconds; a walk of a few hundred schema files costs well under
+    a millisecond, so short intervals are cheap.
+    """
+
+    def __init__(self, roots: Mapping[str, Path | str], *, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        if interval <= 0:
+            raise ValueError("'interval' must be positive")
+        self.roots = {name: Path(directory) for name, directory in roots.items()}
+        self.interval = interval
+        self._handlers: List[ChangeHandler] = []
+        self._snapshots = {name: _snapshot(directory) for name, directory in self.roots.items()}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._poll_lock = threading.Lock()
+
+    def subscribe(self, handler: ChangeHandler) -> ChangeHandler:
+        self._handlers.append(handler)
+        return handler
+
+    def poll(self) -> List[SchemaChange]:
+        """Check every root once and dispatch changes to the handlers."""
+
+        with self._poll_lock:
+            changes: List[SchemaChange] = []
+            for name, directory in self.roots.items():
+                previous = self._snapshots[name]
+                current = _snapshot(directory)
+                self._snapshots[name] = current
+                if current == previous:
+                    continue
+                change = SchemaChange(
+                    root=name,
+                    directory=directory,
+                    added=tuple(sorted(set(current) - set(previous))),
+                    modified=tuple(
+                        sorted(key for key in set(current) & set(previous) if current[key] != previous[key])
+                    ),
+                    removed=tuple(sorted(set(previous) - set(current))),
+                )
+                changes.append(change)
+            if changes:
+                for handler in list(self._handlers):
+                    handler(changes)
+            return changes
+
+    def start(self) -> "SchemaWatcher":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="kernel-schema-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def __enter__(self) -> "SchemaWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as exc:  # noqa: BLE001 - keep watching after a bad edit
+                emit_event("registry.schema.watch_failed", error=str(exc), error_type=type(exc).__name__)
+
+
+class _ReloadableEvaluator(Protocol):
+    schema_root: Path
+
+    def reload_definitions(self, paths: Iterable[str | Path]) -> Tuple[str, ...]:
+        ...
+
+
+def watch_schemas(
+    *,
+    evaluators: Iterable[_ReloadableEvaluator] = (),
+    interval: float = DEFAULT_POLL_INTERVAL,
+    start: bool = True,
+) -> SchemaWatcher:
+    """Hot-reload capability, type and derived definitions as files change.
+
+    Edits under the capability and type schema roots are applied with
+    :func:`kernel.capabilities.reload_capabilities` and
+    :func:`kernel.types.base.reload_types`. Edits to derived definitions are
+    applied to each of ``evaluators``. Every applied batch publishes a
+    ``registry.schema.changed`` event. A batch that fails validation publishes
+    ``registry.schema.reload_failed`` and the previous definitions stay in use.
+    """
+
+    # Imported lazily: both packages are built on top of kernel.registry.
+    from kernel import capabilities
+    from kernel.types import base as types_base
+
+    evaluators = tuple(evaluators)
+    roots: Dict[str, Path] = {
+        "capabilities": capabilities._schema_root(),
+        "types": types_base._schema_root(),
+    }
+    for index, evaluator in enumerate(evaluators):
+        roots[f"derived.{index}" if index else "derived"] = Path(evaluator.schema_root)
+
+    def _apply(changes: Sequence[SchemaChange]) -> None:
+        started = time.perf_counter()
+        changed_roots = {change.root for change in changes}
+        applied: Dict[str, Any] = {}
+        try:
+            if "capabilities" in changed_roots:
+                applied["capabilities"] = capabilities.reload_capabilities().to_dict()
+            if changed_roots & {"capabilities", "types"}:
+                applied["types"] = types_base.reload_types().to_dict()
+            for index, evaluator in enumerate(evaluators):
+                name = f"derived.{index}" if index else "derived"
+                paths = [path for change in changes if change.root == name for path in change.paths()]
+                if paths:
+                    applied[name] = list(evaluator.reload_definitions(paths))
+        except Exception as exc:  # noqa: BLE001 - invalid edits must not stop the watcher
+            emit_event(
+                "registry.schema.reload_failed",
+                changes=[change.to_dict() for change in changes],
+                applied=applied,
+                error=str(exc),
+                error_type=type(exc).__name__,
+            )
+            return
+        emit_event(
+            "registry.schema.changed",
+            changes=[change.to_dict() for change in changes],
+            applied=applied,
+            duration_ms=round((time.perf_counter() - started) * 1000.0, 3),
+        )
+
+    watcher = SchemaWatcher(roots, interval=interval)
+    watcher.subscribe(_apply)
+    return watcher.start() if start else watcher
+
+
+def _snapshot(directory: Path) -> Dict[str, FileState]:
+    state: Dict[str, FileState] = {}
+    for current, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if Path(filename).suffix.lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            path = os.path.join(current, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state[Path(path).relative_to(directory).as_posix()] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    return state
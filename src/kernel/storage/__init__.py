@@ -0,0 +1,15 @@
+"""Persistent item storage following the capture storage blueprint."""
+from __future__ import annotations
+
+from .index import ItemIndex
+from .store import ITEM_FILENAME, MANIFEST_FILENAME, ItemManifest, ItemStore, StoreReport, encode_item
+
+__all__ = [
+    "ITEM_FILENAME",
+    "MANIFEST_FILENAME",
+    "ItemIndex",
+    "ItemManifest",
+    "ItemStore",
+    "StoreReport",
+    "encode_item",
+]
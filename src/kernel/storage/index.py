@@ -0,0 +1,535 @@
+"""SQLite secondary index over item metadata for faceted queries."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from kernel.observability import emit_event, trace_span
+
+from .store import ItemStore
+
+__all__ = [
+    "DEFAULT_INDEX_PATH",
+    "DEFAULT_METADATA_NAMESPACES",
+    "FACETS",
+    "INDEX_FORMAT",
+    "ItemIndex",
+    "default_index_path",
+    "main",
+]
+
+INDEX_FORMAT = 1
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parents[3] / "var" / "index" / "items.sqlite3"
+# ``cap.*`` keys belong to capabilities and ``tmp.*`` keys are scratch data,
+# so only system and extension metadata is indexed unless asked otherwise.
+DEFAULT_METADATA_NAMESPACES = ("sys", "ext")
+FACETS = ("item_type", "realm", "sensitivity", "owner", "tags")
+
+_COLUMNS = ("item_type", "realm", "sensitivity", "owner", "created_at", "updated_at")
+_COLUMN_FACETS = FACETS[:4]
+_ORDERS = ("item_id", "created_at", "updated_at")
+# Tag and metadata filters matching fewer rows than this drive the query;
+# broader ones are checked per candidate row instead (see ``_where``).
+_SELECTIVE_ROWS = 1000
+_BATCH = 10_000
+
+_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    item_id TEXT NOT NULL UNIQUE,
+    item_type TEXT NOT NULL,
+    realm TEXT,
+    sensitivity TEXT,
+    owner TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    item INTEGER NOT NULL,
+    PRIMARY KEY (tag, item)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    item INTEGER NOT NULL,
+    PRIMARY KEY (key, value, item)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS facet_counts (
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (facet, value)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+_INDEXES = {
+    "items_type_realm": "items (item_type, realm, sensitivity)",
+    "items_realm_type": "items (realm, item_type, sensitivity)",
+    "items_sensitivity": "items (sensitivity)",
+    "items_owner": "items (owner, updated_at)",
+    "items_created": "items (created_at)",
+    "items_updated": "items (updated_at)",
+    "tags_item": "tags (item)",
+    "metadata_item": "metadata (item)",
+}
+_DATA_TABLES = ("items", "tags", "metadata", "facet_counts")
+# ``json.dumps`` with options builds a new encoder per call; reuse one.
+_VALUE_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+Row = Tuple[str, Tuple[Any, ...], List[str], List[Tuple[str, str]]]
+
+
+def default_index_path() -> Path:
+    """Return ``KERNEL_INDEX_PATH`` or ``var/index/items.sqlite3`` in the repository.
+
+    The default is anchored to the repository rather than the working
+    directory, so the CLI finds the same index wherever it is run from.
+    """
+
+    override = os.environ.get("KERNEL_INDEX_PATH")
+    return Path(override) if override else DEFAULT_INDEX_PATH
+
+
+class ItemIndex:
+    """Secondary index of item facets, kept in one SQLite database.
+
+    Indexes ``item_type``, ``realm.id``, ``sensitivity.classification``,
+    ``owner.id``, ``created_at``/``updated_at`` (normalised to UTC),
+    ``fields.tags`` and metadata keys in ``metadata_namespaces``. Per-value
+    facet totals are maintained alongside, so unfiltered facet counts never
+    scan the items. The index is derived data: :meth:`attach` keeps it
+    current as an :class:`~kernel.storage.ItemStore` writes and deletes
+    items, and :meth:`rebuild` recreates it from scratch. A database written
+    with a different format or namespace selection is reset on open; rebuild
+    it before querying.
+
+    The database uses WAL journaling with ``synchronous=NORMAL``: each item
+    write is its own transaction, and a crash can lose the last few index
+    updates but never corrupts the index. One connection is shared by all
+    threads behind a lock.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        *,
+        metadata_namespaces: Sequence[str] = DEFAULT_METADATA_NAMESPACES,
+    ) -> None:
+        self.path = Path(path) if path is not None else default_index_path()
+        self.metadata_namespaces = tuple(sorted(set(metadata_namespaces)))
+        self._prefixes = tuple(namespace + "." for namespace in self.metadata_namespaces)
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._open()
+
+    # Maintenance ------------------------------------------------------
+    def attach(self, store: ItemStore) -> "ItemIndex":
+        """Update the index on every write and delete made through ``store``."""
+
+        store.subscribe(self._on_change)
+        return self
+
+    def update(self, item: Mapping[str, Any]) -> None:
+        """Index ``item``, replacing whatever was indexed for its id."""
+
+        row = self._row(item)
+
+        def _upsert(cursor: sqlite3.Cursor) -> None:
+            self._delete(cursor, row[0])
+            self._count(cursor, row[1], row[2], 1)
+            self._insert(cursor, [row])
+
+        with self._lock:
+            self._transaction(_upsert)
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            self._transaction(lambda cursor: self._delete(cursor, item_id))
+
+    def rebuild(self, items: Iterable[Mapping[str, Any]]) -> int:
+        """Replace the whole index with ``items`` in one transaction.
+
+        Secondary indexes are dropped during the load and recreated at the
+        end, which is several times faster than maintaining them row by row.
+        """
+
+        started = time.monotonic()
+        count = 0
+        with self._lock, trace_span("storage.index.rebuild", path=str(self.path)):
+
+            def _load(cursor: sqlite3.Cursor) -> None:
+                nonlocal count
+                for name in _INDEXES:
+                    cursor.execute(f"DROP INDEX IF EXISTS {name}")
+                for table in _DATA_TABLES:
+                    cursor.execute(f"DELETE FROM {table}")
+                batch: List[Row] = []
+                for item in items:
+                    batch.append(self._row(item))
+                    if len(batch) >= _BATCH:
+                        self._insert(cursor, batch, first_id=count + 1)
+                        count += len(batch)
+                        batch = []
+                self._insert(cursor, batch, first_id=count + 1)
+                count += len(batch)
+                for facet in _COLUMN_FACETS:
+                    cursor.execute(
+                        f"INSERT INTO facet_counts (facet, value, count) SELECT ?, {facet}, COUNT(*) "
+                        f"FROM items WHERE {facet} IS NOT NULL GROUP BY {facet}",
+                        (facet,),
+                    )
+                cursor.execute(
+                    "INSERT INTO facet_counts (facet, value, count) SELECT 'tags', tag, COUNT(*) FROM tags GROUP BY tag"
+                )
+                _create_indexes(cursor)
+
+            self._transaction(_load)
+            self._connection.execute("ANALYZE")
+        emit_event(
+            "storage.index_rebuilt",
+            path=str(self.path),
+            items=count,
+            elapsed_seconds=round(time.monotonic() - started, 3),
+        )
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.execute("PRAGMA optimize")
+            self._connection.close()
+
+    def __enter__(self) -> "ItemIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    # Queries ----------------------------------------------------------
+    def query(
+        self,
+        *,
+        order_by: str = "item_id",
+        descending: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        **filters: Any,
+    ) -> List[str]:
+        """Return ids of items matching every filter.
+
+        Filters are ``item_type``, ``realm``, ``sensitivity`` and ``owner``
+        (a value or a list of accepted values), ``tags`` (all must be
+        present), ``metadata`` (``{key: value}``, exact JSON match), and
+        ``created_after``/``created_before``/``updated_after``/
+        ``updated_before`` (ISO timestamps; after is inclusive, before is
+        exclusive).
+        """
+
+        if order_by not in _ORDERS:
+            raise ValueError(f"'order_by' must be one of {', '.join(_ORDERS)}")
+        direction = "DESC" if descending else "ASC"
+        with self._lock:
+            where, parameters = self._where(**filters)
+            sql = f"SELECT item_id FROM items{where} ORDER BY {order_by} {direction}, item_id {direction}"
+            if limit is not None:
+                sql += " LIMIT ? OFFSET ?"
+                parameters += [limit, offset]
+            return [row[0] for row in self._connection.execute(sql, parameters)]
+
+    def count(self, **filters: Any) -> int:
+        with self._lock:
+            where, parameters = self._where(**filters)
+            return self._connection.execute(f"SELECT COUNT(*) FROM items{where}", parameters).fetchone()[0]
+
+    def facets(self, facet: str, **filters: Any) -> Dict[str, int]:
+        """Count matching items per value of ``facet``, most frequent first."""
+
+        if facet not in FACETS:
+            raise ValueError(f"'facet' must be one of {', '.join(FACETS)}")
+        with self._lock:
+            where, parameters = self._where(**filters)
+            if not where:
+                sql = "SELECT value, count FROM facet_counts WHERE facet = ? AND count > 0"
+                parameters = [facet]
+            elif facet == "tags":
+                sql = f"SELECT tag, COUNT(*) FROM tags WHERE item IN (SELECT id FROM items{where}) GROUP BY tag"
+            else:
+                sql = f"SELECT {facet}, COUNT(*) FROM items{where} GROUP BY {facet}"
+            rows = self._connection.execute(f"{sql} ORDER BY 2 DESC, 1", parameters).fetchall()
+        return {value: count for value, count in rows if value is not None}
+
+    # Internals --------------------------------------------------------
+    def _open(self) -> None:
+        settings = {"format": str(INDEX_FORMAT), "metadata_namespaces": json.dumps(self.metadata_namespaces)}
+        with self._lock:
+            self._connection.executescript(_TABLES_SQL)
+            stored = dict(self._connection.execute("SELECT name, value FROM settings"))
+            if stored == settings:
+                return
+            if stored:
+                emit_event("storage.index_reset", path=str(self.path), previous=stored)
+
+            def _reset(cursor: sqlite3.Cursor) -> None:
+                for table in (*_DATA_TABLES, "settings"):
+                    cursor.execute(f"DELETE FROM {table}")
+                cursor.executemany("INSERT INTO settings (name, value) VALUES (?, ?)", sorted(settings.items()))
+                _create_indexes(cursor)
+
+            self._transaction(_reset)
+
+    def _transaction(self, body: Callable[[sqlite3.Cursor], None]) -> None:
+        cursor = self._connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            body(cursor)
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    def _on_change(self, item_id: str, item: Mapping[str, Any] | None) -> None:
+        if item is None:
+            self.remove(item_id)
+        else:
+            self.update(item)
+
+    def _row(self, item: Mapping[str, Any]) -> Row:
+        item_id = item.get("id")
+        item_type = item.get("item_type")
+        if not isinstance(item_id, str) or not isinstance(item_type, str):
+            raise ValueError("Indexed items need string 'id' and 'item_type' values")
+        # Payloads are decoded JSON, so plain ``dict`` checks suffice here and
+        # are much cheaper than ``typing.Mapping`` ones on bulk rebuilds.
+        fields = item.get("fields")
+        tags = fields.get("tags") if isinstance(fields, dict) else None
+        metadata = item.get("metadata")
+        entries = []
+        if isinstance(metadata, dict):
+            for key, value in metadata.items():
+                if self._indexed_key(key):
+                    entries.append((key, _encode_value(value)))
+        columns = (
+            item_type,
+            _nested_id(item.get("realm"), "id"),
+            _nested_id(item.get("sensitivity"), "classification"),
+            _nested_id(item.get("owner"), "id"),
+            _timestamp(item.get("created_at")),
+            _timestamp(item.get("updated_at")),
+        )
+        unique_tags = sorted({tag for tag in tags if isinstance(tag, str)}) if isinstance(tags, list) else []
+        return item_id, columns, unique_tags, entries
+
+    def _indexed_key(self, key: str) -> bool:
+        return key.startswith(self._prefixes) or key in self.metadata_namespaces
+
+    def _insert(self, cursor: sqlite3.Cursor, rows: Sequence[Row], *, first_id: int | None = None) -> None:
+        if first_id is None:
+            keys = []
+            for item_id, columns, _, _ in rows:
+                cursor.execute(
+                    f"INSERT INTO items (item_id, {', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (item_id, *columns),
+                )
+                keys.append(cursor.lastrowid)
+        else:
+            keys = list(range(first_id, first_id + len(rows)))
+            cursor.executemany(
+                f"INSERT INTO items (id, item_id, {', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(key, item_id, *columns) for key, (item_id, columns, _, _) in zip(keys, rows)],
+            )
+        cursor.executemany(
+            "INSERT INTO tags (tag, item) VALUES (?, ?)",
+            [(tag, key) for key, (_, _, tags, _) in zip(keys, rows) for tag in tags],
+        )
+        cursor.executemany(
+            "INSERT INTO metadata (key, value, item) VALUES (?, ?, ?)",
+            [(name, value, key) for key, (_, _, _, entries) in zip(keys, rows) for name, value in entries],
+        )
+
+    def _delete(self, cursor: sqlite3.Cursor, item_id: str) -> None:
+        found = cursor.execute(
+            f"SELECT id, {', '.join(_COLUMN_FACETS)} FROM items WHERE item_id = ?", (item_id,)
+        ).fetchone()
+        if found is None:
+            return
+        key = found[0]
+        tags = [row[0] for row in cursor.execute("SELECT tag FROM tags WHERE item = ?", (key,))]
+        self._count(cursor, found[1:], tags, -1)
+        cursor.execute("DELETE FROM tags WHERE item = ?", (key,))
+        cursor.execute("DELETE FROM metadata WHERE item = ?", (key,))
+        cursor.execute("DELETE FROM items WHERE id = ?", (key,))
+
+    def _count(self, cursor: sqlite3.Cursor, columns: Sequence[Any], tags: Sequence[str], delta: int) -> None:
+        values = [(facet, value) for facet, value in zip(_COLUMN_FACETS, columns) if value is not None]
+        values += [("tags", tag) for tag in tags]
+        cursor.executemany(
+            "INSERT INTO facet_counts (facet, value, count) VALUES (?, ?, ?) "
+            "ON CONFLICT (facet, value) DO UPDATE SET count = count + excluded.count",
+            [(facet, value, delta) for facet, value in values],
+        )
+
+    def _selective(self, sql: str, parameters: Sequence[Any]) -> bool:
+        probe = f"SELECT COUNT(*) FROM ({sql} LIMIT {_SELECTIVE_ROWS})"
+        return self._connection.execute(probe, parameters).fetchone()[0] < _SELECTIVE_ROWS
+
+    def _where(
+        self,
+        *,
+        item_type: str | Iterable[str] | None = None,
+        realm: str | Iterable[str] | None = None,
+        sensitivity: str | Iterable[str] | None = None,
+        owner: str | Iterable[str] | None = None,
+        tags: Iterable[str] = (),
+        metadata: Mapping[str, Any] | None = None,
+        created_after: str | datetime | None = None,
+        created_before: str | datetime | None = None,
+        updated_after: str | datetime | None = None,
+        updated_before: str | datetime | None = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        parameters: List[Any] = []
+        for column, accepted in (("item_type", item_type), ("realm", realm), ("sensitivity", sensitivity), ("owner", owner)):
+            if accepted is None:
+                continue
+            values = [accepted] if isinstance(accepted, str) else list(accepted)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            parameters += values
+        for column, operator, bound in (
+            ("created_at", ">=", created_after),
+            ("created_at", "<", created_before),
+            ("updated_at", ">=", updated_after),
+            ("updated_at", "<", updated_before),
+        ):
+            if bound is None:
+                continue
+            normalised = _timestamp(bound)
+            if normalised is None:
+                raise ValueError(f"Invalid timestamp bound {bound!r}")
+            clauses.append(f"{column} {operator} ?")
+            parameters.append(normalised)
+
+        memberships: List[Tuple[str, List[Any]]] = []
+        for tag in [tags] if isinstance(tags, str) else tags:
+            memberships.append(("SELECT item FROM tags WHERE tag = ?", [tag]))
+        for key, value in (metadata or {}).items():
+            if not self._indexed_key(key):
+                raise ValueError(f"Metadata key {key!r} is outside the indexed namespaces {list(self.metadata_namespaces)}")
+            memberships.append(("SELECT item FROM metadata WHERE key = ? AND value = ?", [key, _encode_value(value)]))
+        # SQLite's statistics average over every tag and metadata value, so a
+        # common value looks as selective as a unique one. Probe each set
+        # with a bounded count: small sets drive the query through ``IN``,
+        # large ones become per-row ``EXISTS`` checks on the remaining
+        # candidates. One set still drives when nothing else narrows it.
+        driving = not clauses
+        for sql, values in memberships:
+            if driving or self._selective(sql, values):
+                clauses.append(f"id IN ({sql})")
+                driving = False
+            else:
+                clauses.append(f"EXISTS ({sql} AND item = items.id)")
+            parameters += values
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), parameters
+
+
+def _create_indexes(cursor: sqlite3.Cursor) -> None:
+    for name, definition in _INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+
+def _encode_value(value: Any) -> str:
+    return _VALUE_ENCODER.encode(value)
+
+
+def _nested_id(value: Any, key: str) -> str | None:
+    if isinstance(value, dict) and isinstance(value.get(key), str):
+        return value[key]
+    return None
+
+
+def _timestamp(value: Any) -> str | None:
+    """Normalise to a fixed-width UTC string so text order is time order."""
+
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(tzinfo=None).isoformat(timespec="microseconds") + "Z"
+
+
+def _metadata_argument(value: str) -> Tuple[str, Any]:
+    key, separator, raw = value.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got {value!r}")
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild or query the item metadata index")
+    parser.add_argument("command", choices=("rebuild", "query"), help="Operation to run")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help="Index database path (default: $KERNEL_INDEX_PATH or var/index/items.sqlite3)",
+    )
+    parser.add_argument("--root", type=Path, default=Path("/data"), help="Item store root (rebuild)")
+    parser.add_argument("--type", dest="item_type", action="append", help="Item type (repeatable)")
+    parser.add_argument("--realm", action="append", help="Realm id (repeatable)")
+    parser.add_argument("--sensitivity", action="append", help="Sensitivity classification (repeatable)")
+    parser.add_argument("--owner", action="append", help="Owner id (repeatable)")
+    parser.add_argument("--tag", dest="tags", action="append", default=[], help="Required tag (repeatable)")
+    parser.add_argument("--meta", action="append", default=[], type=_metadata_argument, help="KEY=VALUE metadata match")
+    parser.add_argument("--facet", choices=FACETS, help="Report counts per value of this facet instead of ids")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum ids to print")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    with ItemIndex(args.db) as index:
+        started = time.monotonic()
+        if args.command == "rebuild":
+            summary: Dict[str, Any] = {"items": index.rebuild(ItemStore(args.root).iter_items())}
+        else:
+            filters = {
+                "item_type": args.item_type,
+                "realm": args.realm,
+                "sensitivity": args.sensitivity,
+                "owner": args.owner,
+                "tags": args.tags,
+                "metadata": dict(args.meta),
+            }
+            if args.facet:
+                summary = {"facets": index.facets(args.facet, **filters)}
+            else:
+                summary = {"count": index.count(**filters), "items": index.query(limit=args.limit, **filters)}
+        summary["elapsed_ms"] = round((time.monotonic() - started) * 1000, 2)
+    print(json.dumps(summary, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
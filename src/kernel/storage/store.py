@@ -0,0 +1,428 @@
+"""Item store following the ``/data/<realm>/<item_type>/<year>/<item_id>/`` layout."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Tuple
+
+from kernel.files import iter_item_files
+from kernel.observability import emit_event, trace_span
+
+__all__ = [
+    "ITEM_FILENAME",
+    "MANIFEST_FILENAME",
+    "ItemManifest",
+    "ItemStore",
+    "StoreReport",
+    "encode_item",
+    "main",
+]
+
+ITEM_FILENAME = "item.json"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_WORKERS = 8
+
+ItemListener = Callable[[str, Mapping[str, Any] | None], None]
+
+# Path components come from item payloads, so they are restricted to names
+# that cannot escape the store root or collide with dotfiles.
+_COMPONENT = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+def encode_item(item: Mapping[str, Any]) -> bytes:
+    """Serialise ``item`` exactly as the store writes it."""
+
+    return (json.dumps(item, ensure_ascii=False, indent=2, sort_keys=True) + "\n").encode("utf-8")
+
+
+@dataclass(frozen=True)
+class ItemManifest:
+    """Checksum record stored next to every item payload."""
+
+    item_id: str
+    item_type: str
+    realm: str
+    year: str
+    sha256: str
+    size: int
+    stored_at: str
+
+    @classmethod
+    def from_mapping(cls, payload: Mapping[str, object], *, source: Path) -> "ItemManifest":
+        values: Dict[str, Any] = {}
+        for key in ("item_id", "item_type", "realm", "year", "sha256", "stored_at"):
+            value = payload.get(key)
+            if not isinstance(value, str) or not value:
+                raise ValueError(f"{source}: '{key}' must be a non-empty string")
+            values[key] = value
+        size = payload.get("size")
+        if not isinstance(size, int) or size < 0:
+            raise ValueError(f"{source}: 'size' must be a non-negative integer")
+        return cls(size=size, **values)
+
+    @property
+    def relative_dir(self) -> Path:
+        return Path(self.realm, self.item_type, self.year, self.item_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "item_id": self.item_id,
+            "item_type": self.item_type,
+            "realm": self.realm,
+            "year": self.year,
+            "sha256": self.sha256,
+            "size": self.size,
+            "stored_at": self.stored_at,
+        }
+
+
+@dataclass
+class StoreReport:
+    """Throughput summary of a bulk store operation."""
+
+    items: int = 0
+    written: int = 0
+    unchanged: int = 0
+    bytes: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.items / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        megabytes = self.bytes / (1 << 20)
+        return {
+            "items": self.items,
+            "written": self.written,
+            "unchanged": self.unchanged,
+            "bytes": self.bytes,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "items_per_second": round(self.items_per_second, 1),
+            "megabytes_per_second": round(megabytes / self.elapsed_seconds, 2) if self.elapsed_seconds > 0 else 0.0,
+        }
+
+
+class ItemStore:
+    """Persist items under ``<root>/<realm>/<item_type>/<year>/<item_id>/``.
+
+    Each item directory holds ``item.json`` and a ``manifest.json`` recording
+    its SHA-256 and size. Both are written atomically: to a temporary file in
+    the same directory, flushed and ``fsync``-ed, renamed over the target, and
+    followed by an ``fsync`` of the directory. ``durable=False`` skips the
+    ``fsync`` calls for scratch stores and benchmarks.
+
+    Writes are content-addressed: an item whose encoded payload hashes to the
+    digest already in its manifest is not rewritten. The payload is written
+    before its manifest, so an interrupted write shows up as a checksum
+    mismatch in :meth:`verify` rather than as a silently stale manifest.
+    ``year`` comes from ``created_at``. When an item's realm, type or year
+    changes, its directory (including captures and attachments) moves.
+
+    Items are located by id through an in-memory index, filled from the
+    manifests on first use and kept current by this instance. Listeners
+    added with :meth:`subscribe` are called with ``(item_id, item)`` after
+    every write and ``(item_id, None)`` after every delete, while the item
+    is still locked, so secondary indexes see each item's changes in order.
+    """
+
+    def __init__(self, root: Path | str, *, durable: bool = True, workers: int = DEFAULT_WORKERS) -> None:
+        if workers < 1:
+            raise ValueError("'workers' must be at least 1")
+        self.root = Path(root)
+        self.durable = durable
+        self.workers = workers
+        self._locations: Dict[str, ItemManifest] | None = None
+        self._lock = threading.RLock()
+        self._item_locks: Dict[str, threading.Lock] = {}
+        self._listeners: List[ItemListener] = []
+
+    def subscribe(self, listener: ItemListener) -> ItemListener:
+        self._listeners.append(listener)
+        return listener
+
+    # Lookup -----------------------------------------------------------
+    def path_for(self, item: Mapping[str, Any]) -> Path:
+        """Return the directory ``item`` is stored in (whether or not it exists)."""
+
+        return self.root / _location(item)[3]
+
+    def manifest(self, item_id: str) -> ItemManifest:
+        """Return the manifest of ``item_id``; raise ``KeyError`` when absent."""
+
+        with self._lock:
+            try:
+                return self._index()[item_id]
+            except KeyError:
+                raise KeyError(f"Item '{item_id}' is not stored") from None
+
+    def __contains__(self, item_id: object) -> bool:
+        with self._lock:
+            return item_id in self._index()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index())
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return sorted(self._index())
+
+    # Single-item API --------------------------------------------------
+    def get(self, item_id: str, *, verify: bool = False) -> Dict[str, Any]:
+        """Return the stored payload of ``item_id``.
+
+        With ``verify`` set, the bytes are checked against the manifest digest
+        and a mismatch raises ``ValueError``.
+        """
+
+        manifest = self.manifest(item_id)
+        path = self.root / manifest.relative_dir / ITEM_FILENAME
+        content = path.read_bytes()
+        if verify and hashlib.sha256(content).hexdigest() != manifest.sha256:
+            raise ValueError(f"{path}: checksum does not match manifest")
+        return json.loads(content)
+
+    def put(self, item: Mapping[str, Any]) -> ItemManifest:
+        """Store ``item`` and return its manifest."""
+
+        return self._put(item)[0]
+
+    def delete(self, item_id: str) -> None:
+        """Remove ``item_id`` and everything stored in its directory."""
+
+        with self._item_lock(item_id):
+            manifest = self.manifest(item_id)
+            directory = self.root / manifest.relative_dir
+            shutil.rmtree(directory)
+            self._prune(directory.parent)
+            with self._lock:
+                self._index().pop(item_id, None)
+            for listener in list(self._listeners):
+                listener(item_id, None)
+        emit_event("storage.item_deleted", item_id=item_id)
+
+    # Bulk API ---------------------------------------------------------
+    def put_many(self, items: Iterable[Mapping[str, Any]]) -> StoreReport:
+        """Store every item, ``workers`` at a time, and report throughput."""
+
+        report = StoreReport()
+        started = time.monotonic()
+        with trace_span("storage.put_many", root=str(self.root), workers=self.workers):
+            for manifest, written in self._map(self._put, items):
+                report.items += 1
+                report.bytes += manifest.size
+                if written:
+                    report.written += 1
+                else:
+                    report.unchanged += 1
+        report.elapsed_seconds = time.monotonic() - started
+        emit_event("storage.put_many_complete", **report.to_dict())
+        return report
+
+    def get_many(self, item_ids: Iterable[str], *, verify: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Return ``{item_id: payload}`` for every stored id; unknown ids are omitted."""
+
+        wanted = [item_id for item_id in item_ids if item_id in self]
+        results: Dict[str, Dict[str, Any]] = {}
+        with trace_span("storage.get_many", root=str(self.root), count=len(wanted)):
+            for item_id, payload in zip(wanted, self._map(lambda value: self.get(value, verify=verify), wanted)):
+                results[item_id] = payload
+        return results
+
+    def iter_items(self, *, verify: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield every stored payload in id order."""
+
+        for item_id in self.ids():
+            yield self.get(item_id, verify=verify)
+
+    def verify(self) -> List[Dict[str, str]]:
+        """Re-hash every payload; return ``{"item_id", "path", "error"}`` problems."""
+
+        problems: List[Dict[str, str]] = []
+
+        def _check(item_id: str) -> Dict[str, str] | None:
+            manifest = self.manifest(item_id)
+            path = self.root / manifest.relative_dir / ITEM_FILENAME
+            try:
+                content = path.read_bytes()
+            except OSError as exc:
+                return {"item_id": item_id, "path": str(path), "error": str(exc)}
+            if len(content) != manifest.size or hashlib.sha256(content).hexdigest() != manifest.sha256:
+                return {"item_id": item_id, "path": str(path), "error": "checksum does not match manifest"}
+            return None
+
+        with trace_span("storage.verify", root=str(self.root)):
+            problems = [problem for problem in self._map(_check, self.ids()) if problem is not None]
+        emit_event("storage.verify_complete", root=str(self.root), items=len(self), problems=len(problems))
+        return problems
+
+    # Internals --------------------------------------------------------
+    def _put(self, item: Mapping[str, Any]) -> Tuple[ItemManifest, bool]:
+        item_id, item_type, realm, relative = _location(item)
+        content = encode_item(item)
+        digest = hashlib.sha256(content).hexdigest()
+        with self._item_lock(item_id):
+            with self._lock:
+                previous = self._index().get(item_id)
+            directory = self.root / relative
+            if previous is not None and previous.relative_dir == relative and previous.sha256 == digest:
+                return previous, False
+            if previous is not None and previous.relative_dir != relative:
+                self._move(self.root / previous.relative_dir, directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            manifest = ItemManifest(
+                item_id=item_id,
+                item_type=item_type,
+                realm=realm,
+                year=relative.parts[2],
+                sha256=digest,
+                size=len(content),
+                stored_at=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            )
+            self._write(directory / ITEM_FILENAME, content)
+            self._write(directory / MANIFEST_FILENAME, _encode_manifest(manifest))
+            if self.durable:
+                _fsync_directory(directory)
+            with self._lock:
+                self._index()[item_id] = manifest
+            for listener in list(self._listeners):
+                listener(item_id, item)
+        return manifest, True
+
+    def _write(self, target: Path, content: bytes) -> None:
+        temporary = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with temporary.open("wb") as handle:
+                handle.write(content)
+                if self.durable:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+            os.replace(temporary, target)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+
+    def _move(self, source: Path, target: Path) -> None:
+        if target.exists():
+            raise ValueError(f"Cannot move item directory {source} to {target}: target exists")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+        if self.durable:
+            _fsync_directory(source.parent)
+            _fsync_directory(target.parent)
+        self._prune(source.parent)
+
+    def _prune(self, directory: Path) -> None:
+        # Drop empty <year>/<item_type>/<realm> directories left behind.
+        while directory != self.root and self.root in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
+
+    def _index(self) -> MutableMapping[str, ItemManifest]:
+        if self._locations is None:
+            locations: Dict[str, ItemManifest] = {}
+            if self.root.exists():
+                for path in sorted(self.root.glob(f"*/*/*/*/{MANIFEST_FILENAME}")):
+                    with path.open("r", encoding="utf-8") as handle:
+                        manifest = ItemManifest.from_mapping(json.load(handle), source=path)
+                    locations[manifest.item_id] = manifest
+            self._locations = locations
+        return self._locations
+
+    def _item_lock(self, item_id: str) -> threading.Lock:
+        with self._lock:
+            return self._item_locks.setdefault(item_id, threading.Lock())
+
+    def _map(self, function: Callable[[Any], Any], values: Iterable[Any]) -> Iterator[Any]:
+        """Apply ``function`` on the thread pool, in input order, with bounded look-ahead."""
+
+        if self.workers == 1:
+            yield from map(function, values)
+            return
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="item-store") as executor:
+            pending: Deque[Future[Any]] = deque()
+            for value in values:
+                pending.append(executor.submit(function, value))
+                if len(pending) >= self.workers * 4:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def _location(item: Mapping[str, Any]) -> Tuple[str, str, str, Path]:
+    item_id = item.get("id")
+    item_type = item.get("item_type")
+    realm = item.get("realm")
+    realm_id = realm.get("id") if isinstance(realm, Mapping) else realm
+    created_at = item.get("created_at")
+    year = created_at[:4] if isinstance(created_at, str) and created_at[:4].isdigit() else "undated"
+    for name, value in (("id", item_id), ("item_type", item_type), ("realm.id", realm_id)):
+        if not isinstance(value, str) or not _COMPONENT.match(value):
+            raise ValueError(f"Item field '{name}' is not a valid path component: {value!r}")
+    return item_id, item_type, realm_id, Path(realm_id, item_type, year, item_id)
+
+
+def _encode_manifest(manifest: ItemManifest) -> bytes:
+    return (json.dumps(manifest.to_dict(), indent=2, sort_keys=True) + "\n").encode("utf-8")
+
+
+def _fsync_directory(directory: Path) -> None:
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _iter_payloads(source: Path, pattern: str) -> Iterator[Dict[str, Any]]:
+    for path in iter_item_files(source, pattern):
+        with path.open("r", encoding="utf-8") as handle:
+            yield json.load(handle)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Import items into, or verify, an item store")
+    parser.add_argument("command", choices=("import", "verify"), help="Operation to run")
+    parser.add_argument("--root", type=Path, default=Path("/data"), help="Store root directory")
+    parser.add_argument("--source", type=Path, default=None, help="Item file or directory to import")
+    parser.add_argument("--pattern", default="*.json", help="Filename pattern of items to import")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent file operations")
+    parser.add_argument("--no-fsync", action="store_true", help="Skip fsync calls (scratch stores only)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    store = ItemStore(args.root, durable=not args.no_fsync, workers=args.workers)
+    if args.command == "import":
+        if args.source is None:
+            parser.error("import requires --source")
+        report = store.put_many(_iter_payloads(args.source, args.pattern))
+        print(json.dumps(report.to_dict(), indent=2, sort_keys=True))
+        return 0
+    problems = store.verify()
+    print(json.dumps({"items": len(store), "problems": problems}, indent=2, sort_keys=True))
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
@@ -1,4 +1,10 @@
-"""Kernel type metadata accessors."""
+"""Kernel type metadata accessors.
+
+Importing this package does not load any schema: manifests are bootstrapped on
+first access through :func:`get_manifest` and friends, and module constants
+such as ``kernel.types.task.TYPE_KEY`` resolve lazily. Call
+:func:`bootstrap_types` to load (and validate) everything up front.
+"""
 from __future__ import annotations
 
 from .base import (
@@ -8,6 +14,7 @@ from .base import (
     get_manifest,
     iter_manifests,
     list_registered_types,
+    reload_types,
 )
 from .conversation_thread import ConversationThreadType
 from .correspondence import CorrespondenceType
@@ -25,6 +32,7 @@ __all__ = [
     "get_manifest",
     "iter_manifests",
     "list_registered_types",
+    "reload_types",
     "TypeManifest",
     "TypeDefinitionMixin",
     "DocumentType",
@@ -41,5 +49,3 @@ __all__ = [
     "WikiEntryType",
     "WikiType",
 ]
-
-bootstrap_types()
@@ -2,20 +2,25 @@
 from __future__ import annotations
 
 import os
+import sys
 import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterator, Mapping, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterator, Mapping, Sequence, Tuple
 
 from kernel.capabilities import bootstrap_capabilities, get_capability
-from kernel.registry import SchemaLoader, TypeRegistry
+from kernel.observability import emit_event
+from kernel.registry import SchemaLoader, SchemaLoadReport, TypeRegistry
+from kernel.registry.snapshot import current_snapshot
 
 __all__ = [
     "TypeManifest",
     "bootstrap_types",
     "get_manifest",
     "iter_manifests",
+    "lazy_manifest_constants",
     "list_registered_types",
+    "reload_types",
     "TypeDefinitionMixin",
 ]
 
@@ -63,8 +68,10 @@ class TypeManifest:
 
 _registry = TypeRegistry()
 _manifests_by_type: Dict[str, TypeManifest] = {}
+_type_sources: Dict[str, str] = {}
 _bootstrap_lock = threading.Lock()
 _bootstrapped = False
+_schema_loader: SchemaLoader | None = None
 
 
 def _repo_root() -> Path:
@@ -83,7 +90,11 @@ def _manifest_dir() -> Path:
 
 
 def bootstrap_types(*, force: bool = False) -> None:
-    """Load manifests from disk into memory if needed."""
+    """Load manifests from disk into memory if needed.
+
+    Unless ``force`` is set, manifests come from the registry snapshot when
+    one exists for the current schema root and still matches its sources.
+    """
 
     global _bootstrapped
     if _bootstrapped and not force:
@@ -94,27 +105,77 @@ def bootstrap_types(*, force: bool = False) -> None:
             return
 
         _manifests_by_type.clear()
+        _type_sources.clear()
         bootstrap_capabilities(force=force)
-        loader = SchemaLoader(
-            schema_root=_schema_root(),
-            registry=_registry,
-            manifest_dir=_manifest_dir(),
-            manifest_name="types.json",
-        )
-        loader.load()
+        snapshot = None if force else current_snapshot()
+        if snapshot is not None and snapshot.covers("types", _schema_root()):
+            try:
+                manifests = [TypeManifest(**fields) for fields in snapshot.types]
+            except TypeError as exc:
+                # Written with other manifest fields: rebuild from the documents.
+                emit_event("registry.snapshot.invalid", section="types", error=repr(exc))
+            else:
+                for manifest in manifests:
+                    _manifests_by_type[manifest.type_key] = manifest
+                _type_sources.update(snapshot.type_sources)
+                _bootstrapped = True
+                return
+
+        _loader().load()
 
         for source, payload in _registry:
-            if not isinstance(payload, Mapping):
-                raise ValueError(f"Manifest '{source}' must contain a mapping")
-            manifest = TypeManifest.from_mapping(payload, source=source)
+            manifest = _manifest_from_document(source, payload)
             if manifest.type_key in _manifests_by_type:
                 raise ValueError(f"Duplicate type key '{manifest.type_key}' detected")
             _validate_manifest_capabilities(manifest)
             _manifests_by_type[manifest.type_key] = manifest
+            _type_sources[source] = manifest.type_key
 
         _bootstrapped = True
 
 
+def reload_types() -> SchemaLoadReport:
+    """Apply added, changed and removed type manifests in place.
+
+    Only documents reported as loaded or removed by the
+    :class:`SchemaLoader` are rebuilt, but every manifest is re-checked
+    against the current capabilities so edits applied by
+    :func:`kernel.capabilities.reload_capabilities` are honoured. Invalid
+    change sets raise ``ValueError``, leave the previous manifests in use and
+    are reported again by the next reload.
+    """
+
+    bootstrap_types()
+    with _bootstrap_lock:
+        updated: Dict[str, TypeManifest] = {}
+        owners: Dict[str, str] = {}
+
+        def _validate(report: SchemaLoadReport) -> None:
+            for source in report.loaded:
+                updated[source] = _manifest_from_document(source, _registry.get(source))
+            changed = set(updated) | set(report.removed)
+            owners.update((key, source) for source, key in _type_sources.items() if source not in changed)
+            for source, manifest in updated.items():
+                if owners.setdefault(manifest.type_key, source) != source:
+                    raise ValueError(f"Duplicate type key '{manifest.type_key}' detected")
+            for manifest in updated.values():
+                _validate_manifest_capabilities(manifest)
+            for source, type_key in _type_sources.items():
+                if source not in changed:
+                    _validate_manifest_capabilities(_manifests_by_type[type_key])
+
+        report = _loader().load(validate=_validate)
+        changed = set(updated) | set(report.removed)
+        for source in changed:
+            type_key = _type_sources.pop(source, None)
+            if type_key is not None and type_key not in owners:
+                _manifests_by_type.pop(type_key, None)
+        for source, manifest in updated.items():
+            _manifests_by_type[manifest.type_key] = manifest
+            _type_sources[source] = manifest.type_key
+    return report
+
+
 def get_manifest(type_key: str) -> TypeManifest:
     """Return the manifest for ``type_key`` raising ``KeyError`` if missing."""
 
@@ -139,6 +200,32 @@ def list_registered_types() -> Tuple[str, ...]:
     return tuple(_manifests_by_type.keys())
 
 
+def _loader() -> SchemaLoader:
+    # Reused across reloads so changes are diffed against what this process
+    # registered rather than the manifest other processes also rewrite.
+    global _schema_loader
+    loader = _schema_loader
+    if (
+        loader is None
+        or loader.registry is not _registry
+        or loader.schema_root != _schema_root()
+        or loader.manifest_dir != _manifest_dir()
+    ):
+        loader = _schema_loader = SchemaLoader(
+            schema_root=_schema_root(),
+            registry=_registry,
+            manifest_dir=_manifest_dir(),
+            manifest_name="types.json",
+        )
+    return loader
+
+
+def _manifest_from_document(source: str, payload: object) -> TypeManifest:
+    if not isinstance(payload, Mapping):
+        raise ValueError(f"Manifest '{source}' must contain a mapping")
+    return TypeManifest.from_mapping(payload, source=source)
+
+
 def _validate_manifest_capabilities(manifest: TypeManifest) -> None:
     for capability_key in manifest.capabilities:
         try:
@@ -157,6 +244,27 @@ def _validate_manifest_capabilities(manifest: TypeManifest) -> None:
             )
 
 
+def lazy_manifest_constants(module_name: str, **constants: Tuple[type, str]) -> Callable[[str], Any]:
+    """Return a module ``__getattr__`` that resolves manifest constants lazily.
+
+    Each keyword maps a module attribute to ``(type_class, accessor)``, e.g.
+    ``TYPE_KEY=(TaskType, "type_key")``. The accessor runs, bootstrapping the
+    registries if needed, on first access and the result is stored on the
+    module so later lookups are plain attribute reads.
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            type_class, accessor = constants[name]
+        except KeyError:
+            raise AttributeError(f"module '{module_name}' has no attribute '{name}'") from None
+        value = getattr(type_class, accessor)()
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    return __getattr__
+
+
 class TypeDefinitionMixin:
     """Mixin that exposes manifest-backed metadata helpers."""
 
@@ -1,7 +1,7 @@
 """Conversation thread type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class ConversationThreadType(TypeDefinitionMixin):
@@ -10,9 +10,12 @@ class ConversationThreadType(TypeDefinitionMixin):
     TYPE_KEY = "conversation_thread"
 
 
-TYPE_KEY = ConversationThreadType.type_key()
-SCHEMA_REF = ConversationThreadType.schema_ref()
-CAPABILITIES = ConversationThreadType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(ConversationThreadType, "type_key"),
+    SCHEMA_REF=(ConversationThreadType, "schema_ref"),
+    CAPABILITIES=(ConversationThreadType, "capabilities"),
+)
 
 __all__ = ["ConversationThreadType", "TYPE_KEY", "SCHEMA_REF", "CAPABILITIES"]
 
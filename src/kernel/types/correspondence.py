@@ -1,7 +1,7 @@
 """Correspondence type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class CorrespondenceType(TypeDefinitionMixin):
@@ -10,9 +10,12 @@ class CorrespondenceType(TypeDefinitionMixin):
     TYPE_KEY = "correspondence"
 
 
-TYPE_KEY = CorrespondenceType.type_key()
-SCHEMA_REF = CorrespondenceType.schema_ref()
-CAPABILITIES = CorrespondenceType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(CorrespondenceType, "type_key"),
+    SCHEMA_REF=(CorrespondenceType, "schema_ref"),
+    CAPABILITIES=(CorrespondenceType, "capabilities"),
+)
 
 __all__ = ["CorrespondenceType", "TYPE_KEY", "SCHEMA_REF", "CAPABILITIES"]
 
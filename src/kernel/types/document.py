@@ -1,7 +1,7 @@
 """Document type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class DocumentType(TypeDefinitionMixin):
@@ -10,8 +10,11 @@ class DocumentType(TypeDefinitionMixin):
     TYPE_KEY = "document"
 
 
-TYPE_KEY = DocumentType.type_key()
-SCHEMA_REF = DocumentType.schema_ref()
-CAPABILITIES = DocumentType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(DocumentType, "type_key"),
+    SCHEMA_REF=(DocumentType, "schema_ref"),
+    CAPABILITIES=(DocumentType, "capabilities"),
+)
 
 __all__ = ["DocumentType", "TYPE_KEY", "SCHEMA_REF", "CAPABILITIES"]
@@ -1,7 +1,7 @@
 """Financial domain type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class FinancialTransactionType(TypeDefinitionMixin):
@@ -22,17 +22,18 @@ class FinancialAccountType(TypeDefinitionMixin):
     TYPE_KEY = "financial_account"
 
 
-FINANCIAL_TRANSACTION_TYPE_KEY = FinancialTransactionType.type_key()
-ACCOUNT_STATEMENT_TYPE_KEY = AccountStatementType.type_key()
-FINANCIAL_ACCOUNT_TYPE_KEY = FinancialAccountType.type_key()
-
-FINANCIAL_TRANSACTION_SCHEMA_REF = FinancialTransactionType.schema_ref()
-ACCOUNT_STATEMENT_SCHEMA_REF = AccountStatementType.schema_ref()
-FINANCIAL_ACCOUNT_SCHEMA_REF = FinancialAccountType.schema_ref()
-
-FINANCIAL_TRANSACTION_CAPABILITIES = FinancialTransactionType.capabilities()
-ACCOUNT_STATEMENT_CAPABILITIES = AccountStatementType.capabilities()
-FINANCIAL_ACCOUNT_CAPABILITIES = FinancialAccountType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    FINANCIAL_TRANSACTION_TYPE_KEY=(FinancialTransactionType, "type_key"),
+    ACCOUNT_STATEMENT_TYPE_KEY=(AccountStatementType, "type_key"),
+    FINANCIAL_ACCOUNT_TYPE_KEY=(FinancialAccountType, "type_key"),
+    FINANCIAL_TRANSACTION_SCHEMA_REF=(FinancialTransactionType, "schema_ref"),
+    ACCOUNT_STATEMENT_SCHEMA_REF=(AccountStatementType, "schema_ref"),
+    FINANCIAL_ACCOUNT_SCHEMA_REF=(FinancialAccountType, "schema_ref"),
+    FINANCIAL_TRANSACTION_CAPABILITIES=(FinancialTransactionType, "capabilities"),
+    ACCOUNT_STATEMENT_CAPABILITIES=(AccountStatementType, "capabilities"),
+    FINANCIAL_ACCOUNT_CAPABILITIES=(FinancialAccountType, "capabilities"),
+)
 
 __all__ = [
     "FinancialTransactionType",
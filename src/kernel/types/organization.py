@@ -1,7 +1,7 @@
 """Organization contact type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class OrganizationType(TypeDefinitionMixin):
@@ -10,9 +10,12 @@ class OrganizationType(TypeDefinitionMixin):
     TYPE_KEY = "organization"
 
 
-TYPE_KEY = OrganizationType.type_key()
-SCHEMA_REF = OrganizationType.schema_ref()
-CAPABILITIES = OrganizationType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(OrganizationType, "type_key"),
+    SCHEMA_REF=(OrganizationType, "schema_ref"),
+    CAPABILITIES=(OrganizationType, "capabilities"),
+)
 
 __all__ = ["OrganizationType", "TYPE_KEY", "SCHEMA_REF", "CAPABILITIES"]
 
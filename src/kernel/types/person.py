@@ -1,7 +1,7 @@
 """Person contact type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class PersonType(TypeDefinitionMixin):
@@ -10,9 +10,12 @@ class PersonType(TypeDefinitionMixin):
     TYPE_KEY = "person"
 
 
-TYPE_KEY = PersonType.type_key()
-SCHEMA_REF = PersonType.schema_ref()
-CAPABILITIES = PersonType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(PersonType, "type_key"),
+    SCHEMA_REF=(PersonType, "schema_ref"),
+    CAPABILITIES=(PersonType, "capabilities"),
+)
 
 __all__ = ["PersonType", "TYPE_KEY", "SCHEMA_REF", "CAPABILITIES"]
 
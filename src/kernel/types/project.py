@@ -1,7 +1,7 @@
 """Project type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class ProjectType(TypeDefinitionMixin):
@@ -10,9 +10,12 @@ class ProjectType(TypeDefinitionMixin):
     TYPE_KEY = "project"
 
 
-TYPE_KEY = ProjectType.type_key()
-SCHEMA_REF = ProjectType.schema_ref()
-CAPABILITIES = ProjectType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(ProjectType, "type_key"),
+    SCHEMA_REF=(ProjectType, "schema_ref"),
+    CAPABILITIES=(ProjectType, "capabilities"),
+)
 
 __all__ = ["ProjectType", "TYPE_KEY", "SCHEMA_REF", "CAPABILITIES"]
 
@@ -1,7 +1,7 @@
 """Task type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class TaskType(TypeDefinitionMixin):
@@ -10,8 +10,11 @@ class TaskType(TypeDefinitionMixin):
     TYPE_KEY = "task"
 
 
-TYPE_KEY = TaskType.type_key()
-SCHEMA_REF = TaskType.schema_ref()
-CAPABILITIES = TaskType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(TaskType, "type_key"),
+    SCHEMA_REF=(TaskType, "schema_ref"),
+    CAPABILITIES=(TaskType, "capabilities"),
+)
 
 __all__ = ["TaskType", "TYPE_KEY", "SCHEMA_REF", "CAPABILITIES"]
@@ -1,7 +1,7 @@
 """Webcomic type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class WebcomicType(TypeDefinitionMixin):
@@ -10,8 +10,11 @@ class WebcomicType(TypeDefinitionMixin):
     TYPE_KEY = "webcomic"
 
 
-TYPE_KEY = WebcomicType.type_key()
-SCHEMA_REF = WebcomicType.schema_ref()
-CAPABILITIES = WebcomicType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(WebcomicType, "type_key"),
+    SCHEMA_REF=(WebcomicType, "schema_ref"),
+    CAPABILITIES=(WebcomicType, "capabilities"),
+)
 
 __all__ = ["WebcomicType", "TYPE_KEY", "SCHEMA_REF", "CAPABILITIES"]
@@ -1,7 +1,7 @@
 """Wiki entry type metadata."""
 from __future__ import annotations
 
-from .base import TypeDefinitionMixin
+from .base import TypeDefinitionMixin, lazy_manifest_constants
 
 
 class WikiEntryType(TypeDefinitionMixin):
@@ -14,9 +14,12 @@ class WikiEntryType(TypeDefinitionMixin):
 WikiType = WikiEntryType
 
 
-TYPE_KEY = WikiEntryType.type_key()
-SCHEMA_REF = WikiEntryType.schema_ref()
-CAPABILITIES = WikiEntryType.capabilities()
+__getattr__ = lazy_manifest_constants(
+    __name__,
+    TYPE_KEY=(WikiEntryType, "type_key"),
+    SCHEMA_REF=(WikiEntryType, "schema_ref"),
+    CAPABILITIES=(WikiEntryType, "capabilities"),
+)
 
 __all__ = [
     "WikiEntryType",
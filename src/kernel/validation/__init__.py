@@ -0,0 +1,18 @@
+"""Compiled JSON Schema validation for item payloads."""
+from __future__ import annotations
+
+from .cache import ValidationCache
+from .compiler import CompiledValidator, SchemaCompiler, ValidationError, compile_validator
+from .incremental import IncrementalValidationResult, IncrementalValidator, parse_pointer, touched_pointers
+
+__all__ = [
+    "CompiledValidator",
+    "IncrementalValidationResult",
+    "IncrementalValidator",
+    "SchemaCompiler",
+    "ValidationCache",
+    "ValidationError",
+    "compile_validator",
+    "parse_pointer",
+    "touched_pointers",
+]
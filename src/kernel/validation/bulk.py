@@ -0,0 +1,349 @@
+"""Validate large item trees or JSONL streams across a process pool."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Set, TextIO, Tuple, Union
+
+from kernel.files import iter_item_files
+from kernel.observability import SpanContext, current_span, emit_event, trace_span
+
+from .cache import COMPILED_ENGINE, ValidationCache, content_digest, jsonschema_engine
+from .compiler import compile_validator
+
+__all__ = [
+    "BulkValidationReport",
+    "DEFAULT_SCHEMA_PATH",
+    "ValidationShardResult",
+    "build_validator",
+    "iter_jsonl",
+    "iter_sources",
+    "validate_bulk",
+    "validator_engine",
+]
+
+DEFAULT_SHARD_SIZE = 512
+DEFAULT_SCHEMA_PATH = Path(__file__).resolve().parents[3] / "schema" / "item_base.json"
+
+# A unit of work is either an item file path or a ``(source, json_text)`` pair
+# taken from a JSONL stream.
+WorkUnit = Union[str, Tuple[str, str]]
+
+_WORKER_VALIDATOR: Any = None
+_WORKER_SCHEMA: str | None = None
+_WORKER_KNOWN: Mapping[str, Sequence[Sequence[Any]]] | None = None
+
+
+@dataclass
+class ValidationShardResult:
+    """Outcome of validating one shard of items."""
+
+    valid: int = 0
+    invalid: int = 0
+    cached: int = 0
+    bytes_read: int = 0
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    failed: List[Dict[str, str]] = field(default_factory=list)
+    # ``(digest, [[path, message], ...])`` for items validated (not cached) here.
+    learned: List[Tuple[str, List[List[Any]]]] = field(default_factory=list)
+
+
+@dataclass
+class BulkValidationReport:
+    """Aggregated summary of a bulk validation run."""
+
+    valid: int = 0
+    invalid: int = 0
+    cached: int = 0
+    bytes_read: int = 0
+    failed: List[Dict[str, str]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.valid + self.invalid + len(self.failed)
+
+    @property
+    def items_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
+    def merge(self, shard: ValidationShardResult) -> None:
+        self.valid += shard.valid
+        self.invalid += shard.invalid
+        self.cached += shard.cached
+        self.bytes_read += shard.bytes_read
+        self.failed.extend(shard.failed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        megabytes = self.bytes_read / (1 << 20)
+        return {
+            "processed": self.processed,
+            "valid": self.valid,
+            "invalid": self.invalid,
+            "cached": self.cached,
+            "failed": len(self.failed),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "items_per_second": round(self.items_per_second, 1),
+            "megabytes_per_second": round(megabytes / self.elapsed_seconds, 2) if self.elapsed_seconds > 0 else 0.0,
+        }
+
+
+@lru_cache(maxsize=None)
+def _jsonschema() -> Any:
+    """Return :mod:`jsonschema`, imported on first use, or ``None`` when unavailable."""
+
+    try:  # Optional dependency, preferred when installed.
+        import jsonschema  # type: ignore
+        import referencing  # type: ignore  # noqa: F401 - ships with jsonschema>=4.18
+    except ModuleNotFoundError:
+        return None
+    return jsonschema
+
+
+def build_validator(schema_path: Path | str) -> Any:
+    """Return ``jsonschema``'s ``Draft7Validator`` when installed, else the compiled validator.
+
+    Both provide ``is_valid`` and ``iter_errors``, so bulk runs check exactly
+    what single-item validation checks. :func:`validator_engine` names the one
+    in use for :class:`ValidationCache`.
+
+    Every document below the schema's directory is registered under its file
+    URI and its ``$id``, so ``$ref``s resolved against an ``https://`` ``$id``
+    never reach the network.
+    """
+
+    path = Path(schema_path).resolve()
+    jsonschema = _jsonschema()
+    if jsonschema is None:
+        return compile_validator(path)
+    from referencing import Registry, Resource
+    from referencing.jsonschema import DRAFT7
+
+    resources = []
+    schema: Any = None
+    for document_path in iter_item_files(path.parent):
+        with document_path.open("r", encoding="utf-8-sig") as handle:
+            document = json.load(handle)
+        if document_path == path:
+            schema = document
+        resource = Resource.from_contents(document, default_specification=DRAFT7)
+        resources.append((document_path.as_uri(), resource))
+        if isinstance(document, dict) and isinstance(document.get("$id"), str):
+            resources.append((document["$id"], resource))
+    if isinstance(schema, dict) and "$id" not in schema:
+        # Relative references in a schema without ``$id`` resolve against its file.
+        schema = {"$id": path.as_uri(), **schema}
+    return jsonschema.Draft7Validator(schema, registry=Registry().with_resources(resources))
+
+
+def validator_engine() -> str:
+    """Engine tag for results produced by :func:`build_validator`."""
+
+    return COMPILED_ENGINE if _jsonschema() is None else jsonschema_engine()
+
+
+def iter_jsonl(stream: TextIO, name: str) -> Iterator[Tuple[str, str]]:
+    """Yield ``("<name>:<line>", text)`` for every non-blank line of ``stream``."""
+
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            yield f"{name}:{number}", line
+
+
+def iter_sources(source: Path | str, pattern: str = "*.json") -> Iterator[WorkUnit]:
+    """Yield work units for an item tree, a single file, a ``.jsonl`` file or ``-``.
+
+    ``-`` reads a JSONL stream from standard input.
+    """
+
+    if str(source) == "-":
+        yield from iter_jsonl(sys.stdin, "<stdin>")
+        return
+    path = Path(source)
+    if path.is_file() and path.suffix.lower() == ".jsonl":
+        with path.open("r", encoding="utf-8") as handle:
+            yield from iter_jsonl(handle, str(path))
+        return
+    for item_path in iter_item_files(path, pattern):
+        yield str(item_path)
+
+
+def validate_bulk(
+    units: Iterable[WorkUnit],
+    *,
+    schema_path: Path | str = DEFAULT_SCHEMA_PATH,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    errors_out: TextIO | None = None,
+    max_errors: int = 50,
+    progress: TextIO | None = None,
+    report_interval: float = 5.0,
+    cache: ValidationCache | None = None,
+) -> BulkValidationReport:
+    """Validate every unit and write one JSONL record per invalid item to ``errors_out``.
+
+    The validator comes from :func:`build_validator` and is built once in
+    the calling process. Workers forked from it share that validator, and
+    other start methods build it once per worker. With ``workers`` set to
+    ``0``, shards are validated in the calling process. At most
+    ``2 * workers`` shards are in flight, so
+    arbitrarily long streams run in bounded memory. Items that cannot be
+    read or parsed are counted as ``failed`` and also reported.
+
+    With a ``cache`` (opened with ``engine=validator_engine()`` for the same
+    schema), items whose content digest it already holds are not
+    parsed or validated; their recorded errors are reported instead. New
+    outcomes are added to the cache, which is saved at the end of the run.
+    """
+
+    if shard_size < 1:
+        raise ValueError("'shard_size' must be at least 1")
+    worker_count = (os.cpu_count() or 1) if workers is None else workers
+    schema = str(Path(schema_path).resolve())
+    report = BulkValidationReport()
+    started = time.monotonic()
+    last_report = started
+
+    def _record(shard: ValidationShardResult) -> None:
+        nonlocal last_report
+        report.merge(shard)
+        if cache is not None:
+            for digest, errors in shard.learned:
+                cache.put(digest, errors)
+        if errors_out is not None:
+            for record in shard.records:
+                errors_out.write(json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n")
+            for failure in shard.failed:
+                errors_out.write(json.dumps(failure, ensure_ascii=False, sort_keys=True) + "\n")
+        now = time.monotonic()
+        if progress is not None and now - last_report >= report_interval:
+            last_report = now
+            elapsed = now - started
+            rate = report.processed / elapsed if elapsed > 0 else 0.0
+            progress.write(
+                f"validate: {report.processed} item(s), {report.invalid} invalid, "
+                f"{len(report.failed)} failed, {rate:.1f} items/s\n"
+            )
+            progress.flush()
+
+    # Workers only read the entries known when they started; outcomes learned
+    # during the run are merged into ``cache`` by this process.
+    known = cache.results if cache is not None else None
+    with trace_span("validation.bulk", workers=worker_count, shard_size=shard_size, schema=schema):
+        _init_worker(schema, known)
+        shards = _iter_shards(units, shard_size)
+        parent = current_span()
+        if worker_count == 0:
+            for shard in shards:
+                _record(_process_shard(shard, max_errors, parent))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=worker_count,
+                initializer=_init_worker,
+                initargs=(schema, known),
+            ) as executor:
+                pending: Set[Future[ValidationShardResult]] = set()
+                for shard in shards:
+                    pending.add(executor.submit(_process_shard, shard, max_errors, parent))
+                    if len(pending) >= worker_count * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            _record(future.result())
+                for future in pending:
+                    _record(future.result())
+
+    report.elapsed_seconds = time.monotonic() - started
+    if cache is not None:
+        cache.save()
+    emit_event("validation.bulk_complete", **report.to_dict())
+    return report
+
+
+def _iter_shards(units: Iterable[WorkUnit], size: int) -> Iterator[List[WorkUnit]]:
+    shard: List[WorkUnit] = []
+    for unit in units:
+        shard.append(unit if isinstance(unit, tuple) else str(unit))
+        if len(shard) >= size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+def _init_worker(schema_path: str, known: Mapping[str, Sequence[Sequence[Any]]] | None = None) -> None:
+    global _WORKER_VALIDATOR, _WORKER_SCHEMA, _WORKER_KNOWN
+    # Forked workers inherit the validator built by the parent.
+    if _WORKER_VALIDATOR is None or _WORKER_SCHEMA != schema_path:
+        _WORKER_VALIDATOR = build_validator(schema_path)
+        _WORKER_SCHEMA = schema_path
+    _WORKER_KNOWN = known
+
+
+def _process_shard(units: Sequence[WorkUnit], max_errors: int, parent: SpanContext | None = None) -> ValidationShardResult:
+    with trace_span("validation.bulk_shard", parent_context=parent, size=len(units)):
+        return _validate_units(units, max_errors)
+
+
+def _validate_units(units: Sequence[WorkUnit], max_errors: int) -> ValidationShardResult:
+    validator = _WORKER_VALIDATOR
+    if validator is None:  # pragma: no cover - initializer always runs first
+        raise RuntimeError("Worker validator has not been initialised")
+    known = _WORKER_KNOWN
+    result = ValidationShardResult()
+    for unit in units:
+        if isinstance(unit, tuple):
+            source, text = unit
+            result.bytes_read += len(text)
+        else:
+            source = unit
+            try:
+                with open(unit, "rb") as handle:
+                    text = handle.read()
+            except OSError as exc:
+                result.failed.append({"source": source, "error": str(exc)})
+                continue
+            result.bytes_read += len(text)
+        digest = cached = None
+        if known is not None:
+            digest = content_digest(text)
+            cached = known.get(digest)
+        if cached is not None:
+            result.cached += 1
+            if not cached:
+                result.valid += 1
+                continue
+        try:
+            item = json.loads(text)
+        except ValueError as exc:
+            result.failed.append({"source": source, "error": str(exc)})
+            continue
+        if cached is not None:
+            found = [(path, message) for path, message in cached]
+        # Most items are valid: the short-circuiting check avoids building errors.
+        elif validator.is_valid(item):
+            result.valid += 1
+            if digest is not None:
+                result.learned.append((digest, []))
+            continue
+        else:
+            found = [(error.path, error.message) for error in validator.iter_errors(item)]
+            if digest is not None:
+                result.learned.append((digest, [[list(path), message] for path, message in found]))
+        result.invalid += 1
+        errors = [
+            {"path": "/".join(str(part) for part in path), "message": message} for path, message in found[:max_errors]
+        ]
+        record: Dict[str, Any] = {"source": source, "valid": False, "errors": errors}
+        if isinstance(item, dict):
+            record["item_id"] = item.get("id")
+            record["item_type"] = item.get("item_type")
+        result.records.append(record)
+    return result
@@ -0,0 +1,234 @@
+"""Persistent validation outcomes keyed by schema graph and item content."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from kernel.observability import emit_event
+from kernel.registry import SchemaLoader, TypeRegistry
+
+__all__ = [
+    "CACHE_FORMAT",
+    "COMPILED_ENGINE",
+    "DEFAULT_CACHE_DIR",
+    "ValidationCache",
+    "content_digest",
+    "default_cache_dir",
+    "item_digest",
+    "jsonschema_engine",
+    "schema_checksum",
+]
+
+CACHE_FORMAT = 1
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[3] / "var" / "validation"
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def _compiled_engine() -> str:
+    # Results produced by :mod:`kernel.validation.compiler`, tagged with a
+    # digest of its source so any change to the compiler starts a fresh cache.
+    source = Path(__file__).with_name("compiler.py").read_bytes()
+    return f"kernel.validation-{hashlib.sha256(source).hexdigest()[:12]}"
+
+
+COMPILED_ENGINE = _compiled_engine()
+
+# ``(instance path, message)`` pairs; an empty tuple records a valid item.
+CachedErrors = Tuple[Tuple[Tuple[Any, ...], str], ...]
+
+
+def default_cache_dir() -> Path:
+    """Return ``KERNEL_VALIDATION_CACHE_DIR`` or ``var/validation`` in the repository.
+
+    The default is anchored to the repository rather than the working
+    directory, so scripts run from elsewhere share one cache.
+    """
+
+    override = os.environ.get("KERNEL_VALIDATION_CACHE_DIR")
+    return Path(override) if override else DEFAULT_CACHE_DIR
+
+
+def jsonschema_engine() -> str:
+    """Engine tag for results produced by the installed ``jsonschema``.
+
+    The version is part of the tag because releases word some errors
+    differently; upgrading therefore starts a fresh cache.
+    """
+
+    try:
+        return f"jsonschema-{version('jsonschema')}"
+    except PackageNotFoundError:
+        return "jsonschema"
+
+
+def content_digest(data: bytes | str) -> str:
+    """Return the SHA-256 of an item's serialised bytes."""
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def item_digest(payload: Any) -> str:
+    """Return the SHA-256 of ``payload`` in canonical JSON form.
+
+    Used when only the parsed item is at hand; key order and whitespace do
+    not affect the digest.
+    """
+
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return content_digest(canonical)
+
+
+def schema_checksum(schema_path: Path | str, *, cache_dir: Path | str | None = None) -> str:
+    """Return the graph checksum of ``schema_path`` and everything it references.
+
+    The schema's directory is synchronised through a :class:`SchemaLoader`
+    whose manifest lives under ``cache_dir``, so unchanged schema files are
+    recognised by ``stat`` alone on later runs. ``cache_dir`` defaults to
+    :func:`default_cache_dir`.
+    """
+
+    schema_path = Path(schema_path).resolve()
+    root = schema_path.parent
+    tag = hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:12]
+    directory = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    loader = SchemaLoader(root, TypeRegistry(), directory, manifest_name=f"schemas-{tag}.json")
+    loader.load()
+    return loader.graph_checksum(schema_path.name)
+
+
+class ValidationCache:
+    """Record pass/fail (and the errors) per item digest for one schema graph.
+
+    ``fingerprint`` identifies the validator: the schema graph checksum plus
+    the engine that produced the errors. Results recorded under a different
+    fingerprint are discarded on open, so a schema edit anywhere in the
+    ``$ref`` graph invalidates everything at once. Entries are kept in
+    insertion order and the oldest are dropped beyond ``max_entries``.
+    :meth:`save` writes atomically, and the file can be deleted at any time.
+    """
+
+    def __init__(self, path: Path | str, fingerprint: str, *, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError("'max_entries' must be at least 1")
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._results: Dict[str, List[List[Any]]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._read()
+
+    @classmethod
+    def for_schema(
+        cls,
+        schema_path: Path | str,
+        *,
+        engine: str,
+        cache_dir: Path | str | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> "ValidationCache":
+        """Open the cache for ``schema_path`` validated by ``engine``.
+
+        ``cache_dir`` defaults to :func:`default_cache_dir`.
+        """
+
+        schema_path = Path(schema_path).resolve()
+        directory = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        checksum = schema_checksum(schema_path, cache_dir=directory)
+        name = hashlib.sha256(f"{engine}\0{schema_path}".encode("utf-8")).hexdigest()[:16]
+        return cls(
+            directory / f"results-{name}.json",
+            f"{engine}:{checksum}",
+            max_entries=max_entries,
+        )
+
+    @property
+    def results(self) -> Mapping[str, List[List[Any]]]:
+        """Raw ``digest -> [[path, message], ...]`` entries, e.g. for worker processes."""
+
+        return self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self._results
+
+    def get(self, digest: str) -> CachedErrors | None:
+        """Return the recorded errors (empty when valid), or ``None`` on a miss."""
+
+        entry = self._results.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _errors(entry)
+
+    def put(self, digest: str, errors: Iterable[Tuple[Sequence[Any], str]]) -> None:
+        """Record the outcome for ``digest``; pass no errors for a valid item."""
+
+        entry = [[list(path), message] for path, message in errors]
+        with self._lock:
+            if self._results.get(digest) != entry:
+                self._results[digest] = entry
+                self._dirty = True
+
+    def save(self) -> bool:
+        """Persist pending changes; return ``False`` when nothing was written."""
+
+        with self._lock:
+            if not self._dirty:
+                return False
+            overflow = len(self._results) - self.max_entries
+            if overflow > 0:
+                for digest in list(self._results)[:overflow]:
+                    del self._results[digest]
+            payload = {"version": CACHE_FORMAT, "fingerprint": self.fingerprint, "results": self._results}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with temporary.open("w", encoding="utf-8") as handle:
+                    json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+                os.replace(temporary, self.path)
+            except BaseException:
+                temporary.unlink(missing_ok=True)
+                raise
+            self._dirty = False
+        emit_event(
+            "validation.cache_saved",
+            path=str(self.path),
+            entries=len(self._results),
+            hits=self.hits,
+            misses=self.misses,
+        )
+        return True
+
+    def _read(self) -> None:
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != CACHE_FORMAT
+            or payload.get("fingerprint") != self.fingerprint
+            or not isinstance(payload.get("results"), dict)
+        ):
+            # Stale schema graph or engine: start over and replace the file on save.
+            self._dirty = True
+            return
+        self._results = payload["results"]
+
+
+def _errors(entry: Sequence[Sequence[Any]]) -> CachedErrors:
+    return tuple((tuple(path), message) for path, message in entry)
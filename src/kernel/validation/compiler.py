@@ -0,0 +1,717 @@
+"""Compile JSON Schema documents into closure trees with pre-resolved ``$ref``s."""
+from __future__ import annotations
+
+import json
+import posixpath
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from kernel.registry import SchemaDependencyGraph, TypeRegistry
+
+__all__ = ["CompiledValidator", "SchemaCompiler", "ValidationError", "compile_validator"]
+
+# ``(parent, segment)`` linked list; built per step and turned into a list only
+# when an error is reported.
+InstancePath = Optional[Tuple[Any, Any]]
+# A compiled check returns ``True`` when the instance is valid. With ``out``
+# set it appends every error; with ``out=None`` it stops at the first one.
+Check = Callable[[Any, InstancePath, Optional[List["ValidationError"]]], bool]
+
+
+@dataclass
+class ValidationError(Exception):
+    """Validation failure carrying a message and the instance path."""
+
+    message: str
+    path: List[Any]
+
+    def __str__(self) -> str:  # pragma: no cover - debug helper
+        return self.message
+
+
+def _path_list(path: InstancePath) -> List[Any]:
+    segments: List[Any] = []
+    while path is not None:
+        path, segment = path
+        segments.append(segment)
+    segments.reverse()
+    return segments
+
+
+def _fail(out: Optional[List[ValidationError]], message: str, path: InstancePath) -> bool:
+    if out is not None:
+        out.append(ValidationError(message, _path_list(path)))
+    return False
+
+
+def _accept(instance: Any, path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+    return True
+
+
+class _Cell:
+    """Indirection for one ``$ref`` target so cycles and recompiles stay cheap."""
+
+    __slots__ = ("check", "compiled", "key", "pointer")
+
+    def __init__(self, key: str, pointer: str) -> None:
+        self.key = key
+        self.pointer = pointer
+        self.compiled = False
+        self.check: Check = _accept
+
+
+class CompiledValidator:
+    """Validator for one schema document, with the interface of ``Draft7Validator``."""
+
+    def __init__(self, compiler: "SchemaCompiler", key: str, cell: _Cell) -> None:
+        self.compiler = compiler
+        self.key = key
+        self._cell = cell
+
+    @property
+    def schema(self) -> Mapping[str, Any]:
+        return self.compiler.document(self.key)
+
+    def iter_errors(self, instance: Any) -> Iterator[ValidationError]:
+        errors: List[ValidationError] = []
+        self._cell.check(instance, None, errors)
+        return iter(errors)
+
+    def is_valid(self, instance: Any) -> bool:
+        return self._cell.check(instance, None, None)
+
+    def validate(self, instance: Any) -> None:
+        """Raise the first :class:`ValidationError` found in ``instance``."""
+
+        for error in self.iter_errors(instance):
+            raise error
+
+
+class SchemaCompiler:
+    """Compile schema documents once and hand out fast validators.
+
+    Documents are addressed by their path relative to ``schema_root`` (the
+    :class:`~kernel.registry.SchemaLoader` key). They come from ``registry``
+    when it holds the key and are otherwise read from disk once. Every
+    ``$ref`` is resolved at compile time, each ``pattern`` is compiled once
+    and each schema node becomes a closure, so validating an instance touches
+    no files and does no dictionary lookups on the schema itself.
+
+    Keywords and error messages follow ``scripts/jsonschema_stub.py``, the
+    fallback validator used when :mod:`jsonschema` is not installed, so the
+    two report identical errors. A keyword that is neither implemented nor a
+    pure annotation raises ``ValueError`` at compile time instead of being
+    ignored.
+
+    :meth:`invalidate` recompiles edited documents and their dependents in
+    place on next use, so validators already handed out stay current.
+    :meth:`from_loader` wires this to
+    :meth:`SchemaLoader.subscribe_invalidations`.
+    """
+
+    def __init__(self, schema_root: Path | str, *, registry: TypeRegistry | None = None) -> None:
+        self.schema_root = Path(schema_root)
+        self.registry = registry
+        self.graph = SchemaDependencyGraph()
+        self._documents: Dict[str, Mapping[str, Any]] = {}
+        self._cells: Dict[Tuple[str, str], _Cell] = {}
+        self._lock = threading.RLock()
+        # Bumped on every invalidation so derived structures can tell they are stale.
+        self.generation = 0
+
+    @classmethod
+    def from_loader(cls, loader: Any) -> "SchemaCompiler":
+        """Compile from ``loader``'s registry and follow its invalidations."""
+
+        compiler = cls(loader.schema_root, registry=loader.registry)
+        loader.subscribe_invalidations(compiler.invalidate)
+        return compiler
+
+    def validator_for(self, key: str) -> CompiledValidator:
+        """Return a validator for the document at ``key``, compiling it if needed."""
+
+        key = posixpath.normpath(key)
+        with self._lock:
+            return CompiledValidator(self, key, self._cell_for(key, ""))
+
+    def document(self, key: str) -> Mapping[str, Any]:
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                if self.registry is not None and key in self.registry:
+                    document = self.registry.get(key)
+                else:
+                    with (self.schema_root / key).open("r", encoding="utf-8-sig") as handle:
+                        document = json.load(handle)
+                self._documents[key] = document
+            return document
+
+    def invalidate(self, keys: Iterable[str]) -> Tuple[str, ...]:
+        """Forget the given documents and recompile them on next use.
+
+        Returns the keys whose validation behaviour may have changed: the
+        given keys and everything that references them.
+        """
+
+        keys = frozenset(keys)
+        with self._lock:
+            affected = self.graph.affected_by(keys)
+            for key in keys:
+                self._documents.pop(key, None)
+            # Dependents are recompiled too: ``oneOf`` dispatch tables are built
+            # from the documents their branches reference. Graph edges are kept
+            # until each cell is recompiled.
+            stale = frozenset(affected)
+            for cell in self._cells.values():
+                if cell.key in stale and cell.compiled:
+                    cell.compiled = False
+                    cell.check = self._pending(cell)
+            self.generation += 1
+            return affected
+
+    # Compilation ------------------------------------------------------
+    def _pending(self, cell: _Cell) -> Check:
+        def check(instance: Any, path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+            with self._lock:
+                self._compile_cell(cell)
+            return cell.check(instance, path, out)
+
+        return check
+
+    def _cell_for(self, key: str, pointer: str) -> _Cell:
+        cell = self._cells.get((key, pointer))
+        if cell is None:
+            cell = self._cells[(key, pointer)] = _Cell(key, pointer)
+            cell.check = self._pending(cell)
+        self._compile_cell(cell)
+        return cell
+
+    def _compile_cell(self, cell: _Cell) -> None:
+        if cell.compiled:
+            return
+        # Marked before compiling so recursive references resolve to this cell.
+        cell.compiled = True
+        try:
+            if not cell.pointer:
+                self.graph.update(cell.key, ())
+            cell.check = self._compile(_resolve_pointer(self.document(cell.key), cell.pointer), cell.key)
+        except BaseException:
+            cell.compiled = False
+            cell.check = self._pending(cell)
+            raise
+
+    def _reference(self, ref: str, base: str) -> _Cell:
+        if ref.startswith(("http://", "https://")):
+            raise ValueError(f"Network references are not supported: {ref}")
+        target, _, pointer = ref.partition("#")
+        key = posixpath.normpath(posixpath.join(posixpath.dirname(base), target)) if target else base
+        if key != base:
+            references = set(self.graph.references(base))
+            references.add(key)
+            self.graph.update(base, references)
+        return self._cell_for(key, pointer)
+
+    def _compile(self, schema: Any, key: str, *, descend: bool = True) -> Check:
+        """Compile one schema node.
+
+        With ``descend=False`` the check covers only the node itself: items,
+        declared properties and schema-valued ``additionalProperties`` are
+        left to the caller, as incremental validation does.
+        """
+
+        if schema is False:
+            return lambda instance, path, out: _fail(out, f"False schema does not allow {instance!r}", path)
+        if not isinstance(schema, Mapping):
+            return _accept
+        if "$ref" in schema:
+            cell = self._reference(schema["$ref"], key)
+
+            def check_ref(instance: Any, path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                return cell.check(instance, path, out)
+
+            return check_ref
+
+        _check_keywords(schema, key)
+        schema_type = schema.get("type")
+        type_check = _type_check(schema_type) if schema_type is not None else None
+        enum = schema.get("enum")
+        enum_check = _membership(enum) if enum is not None else None
+        const = schema.get("const")
+        number_checks = self._number_checks(schema)
+        string_checks = self._string_checks(schema)
+        array_checks = self._array_checks(schema, key, descend=descend)
+        object_checks = self._object_checks(schema, key, descend=descend)
+        one_of = schema.get("oneOf")
+        one_of_candidates = self._dispatch(one_of, key) if one_of is not None else None
+
+        def check(instance: Any, path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+            if type_check is not None and not type_check(instance):
+                return _fail(out, _type_message(instance, schema_type), path)
+            if enum_check is not None and not enum_check(instance):
+                return _fail(out, f"{instance!r} is not one of {enum}", path)
+            if const is not None and instance != const:
+                return _fail(out, f"{instance!r} was expected to be {const!r}", path)
+            valid = True
+            if isinstance(instance, str):
+                checks = string_checks
+            elif isinstance(instance, list):
+                checks = array_checks
+            elif isinstance(instance, dict):
+                checks = object_checks
+            elif isinstance(instance, (int, float)) and not isinstance(instance, bool):
+                checks = number_checks
+            else:
+                checks = ()
+            for sub_check in checks:
+                if not sub_check(instance, path, out):
+                    if out is None:
+                        return False
+                    valid = False
+            if one_of_candidates is not None:
+                matches = 0
+                for option in one_of_candidates(instance):
+                    if option(instance, path, None):
+                        matches += 1
+                        if matches == 2:
+                            break
+                if matches != 1:
+                    return _fail(out, "oneOf constraints not satisfied", path)
+            return valid
+
+        return check
+
+    def _number_checks(self, schema: Mapping[str, Any]) -> Tuple[Check, ...]:
+        checks: List[Check] = []
+        minimum = schema.get("minimum")
+        if minimum is not None:
+            checks.append(
+                lambda instance, path, out: instance >= minimum
+                or _fail(out, f"{instance!r} is less than the minimum of {minimum!r}", path)
+            )
+        maximum = schema.get("maximum")
+        if maximum is not None:
+            checks.append(
+                lambda instance, path, out: instance <= maximum
+                or _fail(out, f"{instance!r} is greater than the maximum of {maximum!r}", path)
+            )
+        exclusive_minimum = schema.get("exclusiveMinimum")
+        if exclusive_minimum is not None:
+            checks.append(
+                lambda instance, path, out: instance > exclusive_minimum
+                or _fail(out, f"{instance!r} is less than or equal to the minimum of {exclusive_minimum!r}", path)
+            )
+        exclusive_maximum = schema.get("exclusiveMaximum")
+        if exclusive_maximum is not None:
+            checks.append(
+                lambda instance, path, out: instance < exclusive_maximum
+                or _fail(out, f"{instance!r} is greater than or equal to the maximum of {exclusive_maximum!r}", path)
+            )
+        return tuple(checks)
+
+    def _string_checks(self, schema: Mapping[str, Any]) -> Tuple[Check, ...]:
+        checks: List[Check] = []
+        min_length = schema.get("minLength")
+        if min_length is not None:
+            checks.append(
+                lambda instance, path, out: len(instance) >= min_length
+                or _fail(out, f"String is shorter than minimum length {min_length}", path)
+            )
+        max_length = schema.get("maxLength")
+        if max_length is not None:
+            checks.append(
+                lambda instance, path, out: len(instance) <= max_length
+                or _fail(out, f"String is longer than maximum length {max_length}", path)
+            )
+        pattern = schema.get("pattern")
+        if pattern is not None:
+            matcher = re.compile(pattern).fullmatch
+            checks.append(
+                lambda instance, path, out: matcher(instance) is not None
+                or _fail(out, f"String does not match pattern {pattern}", path)
+            )
+        return tuple(checks)
+
+    def _array_checks(self, schema: Mapping[str, Any], key: str, *, descend: bool = True) -> Tuple[Check, ...]:
+        checks: List[Check] = []
+        min_items = schema.get("minItems")
+        if min_items is not None:
+            checks.append(
+                lambda instance, path, out: len(instance) >= min_items
+                or _fail(out, f"Array has fewer than {min_items} items", path)
+            )
+        max_items = schema.get("maxItems")
+        if max_items is not None:
+            checks.append(
+                lambda instance, path, out: len(instance) <= max_items
+                or _fail(out, f"Array has more than {max_items} items", path)
+            )
+        if schema.get("uniqueItems"):
+
+            def check_unique(instance: List[Any], path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                markers = set()
+                for index, item in enumerate(instance):
+                    marker = json.dumps(item, sort_keys=True)
+                    if marker in markers:
+                        return _fail(out, "Array items are not unique", (path, index))
+                    markers.add(marker)
+                return True
+
+            checks.append(check_unique)
+        items = schema.get("items")
+        if descend and isinstance(items, Mapping):
+            item_check = self._compile(items, key)
+
+            def check_items(instance: List[Any], path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                valid = True
+                for index, item in enumerate(instance):
+                    if not item_check(item, (path, index), out):
+                        if out is None:
+                            return False
+                        valid = False
+                return valid
+
+            checks.append(check_items)
+        return tuple(checks)
+
+    def _object_checks(self, schema: Mapping[str, Any], key: str, *, descend: bool = True) -> Tuple[Check, ...]:
+        checks: List[Check] = []
+        required = tuple(schema.get("required", ()))
+        if required:
+
+            def check_required(instance: Dict[str, Any], path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                valid = True
+                for name in required:
+                    if name not in instance:
+                        if out is None:
+                            return False
+                        valid = _fail(out, f"'{name}' is a required property", path)
+                return valid
+
+            checks.append(check_required)
+        properties = schema.get("properties", {})
+        compiled_properties = (
+            tuple((name, self._compile(subschema, key)) for name, subschema in properties.items()) if descend else ()
+        )
+        if compiled_properties:
+
+            def check_properties(instance: Dict[str, Any], path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                valid = True
+                for name, property_check in compiled_properties:
+                    if name in instance and not property_check(instance[name], (path, name), out):
+                        if out is None:
+                            return False
+                        valid = False
+                return valid
+
+            checks.append(check_properties)
+        property_names = schema.get("propertyNames")
+        name_pattern = property_names.get("pattern") if property_names else None
+        if name_pattern:
+            name_matcher = re.compile(name_pattern).fullmatch
+
+            def check_names(instance: Dict[str, Any], path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                valid = True
+                for name in instance:
+                    if name_matcher(name) is None:
+                        if out is None:
+                            return False
+                        valid = _fail(
+                            out, f"Property name '{name}' does not match pattern {name_pattern}", (path, name)
+                        )
+                return valid
+
+            checks.append(check_names)
+        additional = schema.get("additionalProperties", True)
+        additional_check = self._additional_check(additional, key) if descend or additional is False else None
+        if additional_check is not None:
+            allowed = frozenset(properties)
+
+            def check_additional(instance: Dict[str, Any], path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                valid = True
+                for name, value in instance.items():
+                    if name not in allowed and not additional_check(name, value, path, out):
+                        if out is None:
+                            return False
+                        valid = False
+                return valid
+
+            checks.append(check_additional)
+        return tuple(checks)
+
+    def _dispatch(self, options: Sequence[Any], key: str) -> Callable[[Any], Tuple[Check, ...]]:
+        """Compile ``oneOf`` branches behind a discriminator lookup.
+
+        Each branch (after following ``$ref``s) contributes the JSON types it
+        accepts, its ``const``/``enum`` values, its ``required`` keys and the
+        ``const``/``enum`` values of its properties. A value is only checked
+        against branches none of those rule out; the JSON type lookup is a
+        single dictionary access.
+        """
+
+        branches = tuple(
+            (self._compile(option, key), self._discriminator(option, key)) for option in options
+        )
+        by_kind: Dict[str, Tuple[Tuple[Check, _Discriminator], ...]] = {
+            kind: tuple(branch for branch in branches if branch[1].kinds is None or kind in branch[1].kinds)
+            for kind in _KINDS
+        }
+        everything = tuple(check for check, _ in branches)
+
+        def candidates(instance: Any) -> Tuple[Check, ...]:
+            kind = _kind(instance)
+            if kind is None:
+                return everything
+            selected = []
+            for check, discriminator in by_kind[kind]:
+                if discriminator.admits(instance, kind):
+                    selected.append(check)
+            return tuple(selected)
+
+        return candidates
+
+    def _discriminator(self, schema: Any, key: str, depth: int = 0) -> "_Discriminator":
+        resolved = self._effective(schema, key)
+        if resolved is None:
+            return _OPEN
+        schema, key = resolved
+        schema_type = schema.get("type")
+        kinds = _kinds_for(schema_type) if schema_type is not None else None
+        values = _tag_values(schema)
+        required = schema.get("required", ())
+        property_tags = []
+        properties = schema.get("properties", {})
+        if isinstance(properties, Mapping):
+            for name, subschema in properties.items():
+                resolved_property = self._effective(subschema, key)
+                tags = _tag_values(resolved_property[0]) if resolved_property is not None else None
+                if tags is not None:
+                    property_tags.append((name, tags))
+        items = schema.get("items")
+        return _Discriminator(
+            kinds,
+            values,
+            frozenset(required) if isinstance(required, list) else frozenset(),
+            tuple(property_tags),
+            self._discriminator(items, key, depth + 1) if isinstance(items, Mapping) and depth < _MAX_REF_HOPS else None,
+        )
+
+    def _effective(self, schema: Any, key: str) -> Tuple[Mapping[str, Any], str] | None:
+        """Follow ``$ref`` chains to the schema that actually applies."""
+
+        for _ in range(_MAX_REF_HOPS):
+            if not isinstance(schema, Mapping):
+                return None
+            ref = schema.get("$ref")
+            if not isinstance(ref, str):
+                return schema, key
+            target, _, pointer = ref.partition("#")
+            if target:
+                key = posixpath.normpath(posixpath.join(posixpath.dirname(key), target))
+            schema = _resolve_pointer(self.document(key), pointer)
+        return None
+
+    def _additional_check(
+        self, additional: Any, key: str
+    ) -> Callable[[str, Any, InstancePath, Optional[List[ValidationError]]], bool] | None:
+        if additional is False:
+            return lambda name, value, path, out: _fail(
+                out, f"Additional properties are not allowed ('{name}')", (path, name)
+            )
+        if not isinstance(additional, Mapping):
+            return None
+        if "oneOf" in additional:
+            # Mirrors the fallback validator: any matching branch is accepted.
+            candidates = self._dispatch(additional["oneOf"], key)
+
+            def check_any(name: str, value: Any, path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                for option in candidates(value):
+                    if option(value, (path, name), None):
+                        return True
+                return _fail(out, "Value does not match any allowed schema", (path, name))
+
+            return check_any
+        value_check = self._compile(additional, key)
+        return lambda name, value, path, out: value_check(value, (path, name), out)
+
+
+def compile_validator(schema_path: Path | str, *, registry: TypeRegistry | None = None) -> CompiledValidator:
+    """Compile the schema at ``schema_path``, resolving ``$ref``s relative to its directory."""
+
+    path = Path(schema_path)
+    return SchemaCompiler(path.parent, registry=registry).validator_for(path.name)
+
+
+_MAX_REF_HOPS = 16
+# Keywords the compiled checks enforce, and the annotations Draft7Validator
+# also ignores (``format`` is only asserted with a format checker).
+# ``metadata`` is the repository's own field catalogue block.
+_KEYWORDS = frozenset(
+    {
+        "type", "enum", "const", "oneOf",
+        "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+        "minLength", "maxLength", "pattern",
+        "items", "minItems", "maxItems", "uniqueItems",
+        "properties", "required", "additionalProperties", "propertyNames",
+    }
+)
+_ANNOTATIONS = frozenset(
+    {
+        "$schema", "$id", "$comment", "title", "description", "default", "examples",
+        "readOnly", "writeOnly", "definitions", "format", "contentMediaType",
+        "contentEncoding", "metadata",
+    }
+)
+_KINDS = ("string", "integer", "number", "boolean", "object", "array", "null")
+_TYPE_KINDS = {
+    "string": frozenset({"string"}),
+    "number": frozenset({"integer", "number"}),
+    "integer": frozenset({"integer"}),
+    "boolean": frozenset({"boolean"}),
+    "object": frozenset({"object"}),
+    "array": frozenset({"array"}),
+    "null": frozenset({"null"}),
+}
+
+
+class _Discriminator(NamedTuple):
+    """What a ``oneOf`` branch can possibly accept; ``None`` means anything."""
+
+    kinds: frozenset | None
+    values: frozenset | None
+    required: frozenset
+    property_tags: Tuple[Tuple[str, frozenset], ...]
+    items: "_Discriminator | None" = None
+
+    def admits(self, instance: Any, kind: str) -> bool:
+        if self.values is not None and kind not in ("object", "array") and instance not in self.values:
+            return False
+        if kind == "object":
+            if self.required and not self.required.issubset(instance.keys()):
+                return False
+            for name, tags in self.property_tags:
+                if name in instance:
+                    value = instance[name]
+                    if not isinstance(value, (dict, list)) and value not in tags:
+                        return False
+        elif kind == "array" and self.items is not None and instance:
+            # Every item must match ``items``, so the first one is a fair probe.
+            first = instance[0]
+            first_kind = _kind(first)
+            if first_kind is not None and not (
+                (self.items.kinds is None or first_kind in self.items.kinds) and self.items.admits(first, first_kind)
+            ):
+                return False
+        return True
+
+
+_OPEN = _Discriminator(None, None, frozenset(), ())
+
+
+def _check_keywords(schema: Mapping[str, Any], key: str) -> None:
+    unsupported = sorted(name for name in schema if name not in _KEYWORDS and name not in _ANNOTATIONS)
+    if isinstance(schema.get("items"), list):
+        unsupported.append("items (array form)")
+    property_names = schema.get("propertyNames")
+    # Object keys are always strings, so ``type: string`` holds trivially.
+    if isinstance(property_names, Mapping) and (
+        set(property_names) - {"pattern", "type"} or property_names.get("type", "string") != "string"
+    ):
+        unsupported.append("propertyNames (other than pattern)")
+    if unsupported:
+        raise ValueError(f"Unsupported schema keywords in {key}: {', '.join(unsupported)}")
+
+
+def _kind(instance: Any) -> str | None:
+    if isinstance(instance, str):
+        return "string"
+    if isinstance(instance, bool):
+        return "boolean"
+    if isinstance(instance, int):
+        return "integer"
+    if isinstance(instance, float):
+        return "number"
+    if isinstance(instance, dict):
+        return "object"
+    if isinstance(instance, list):
+        return "array"
+    if instance is None:
+        return "null"
+    return None
+
+
+def _kinds_for(schema_type: Any) -> frozenset | None:
+    names = schema_type if isinstance(schema_type, list) else [schema_type]
+    kinds: set = set()
+    for name in names:
+        if name not in _TYPE_KINDS:
+            return None
+        kinds |= _TYPE_KINDS[name]
+    return frozenset(kinds)
+
+
+def _tag_values(schema: Any) -> frozenset | None:
+    """Return the hashable ``const``/``enum`` values a schema restricts to."""
+
+    if not isinstance(schema, Mapping) or "$ref" in schema:
+        return None
+    values: Any = None
+    if schema.get("enum") is not None:
+        values = schema["enum"]
+    elif schema.get("const") is not None:
+        values = [schema["const"]]
+    if values is None:
+        return None
+    try:
+        return frozenset(values)
+    except TypeError:
+        return None
+
+
+_JSON_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda instance: isinstance(instance, str),
+    "number": lambda instance: isinstance(instance, (int, float)) and not isinstance(instance, bool),
+    "integer": lambda instance: isinstance(instance, int) and not isinstance(instance, bool),
+    "boolean": lambda instance: isinstance(instance, bool),
+    "object": lambda instance: isinstance(instance, dict),
+    "array": lambda instance: isinstance(instance, list),
+    "null": lambda instance: instance is None,
+}
+
+
+def _type_check(schema_type: Any) -> Callable[[Any], bool]:
+    if isinstance(schema_type, list):
+        options = tuple(_type_check(option) for option in schema_type)
+        return lambda instance: any(option(instance) for option in options)
+    return _JSON_TYPES.get(schema_type, lambda instance: True)
+
+
+def _type_message(instance: Any, schema_type: Any) -> str:
+    if isinstance(schema_type, list):
+        return f"Expected instance to be one of {schema_type}, got {type(instance).__name__}"
+    return f"Expected type {schema_type}, got {type(instance).__name__}"
+
+
+def _membership(values: List[Any]) -> Callable[[Any], bool]:
+    try:
+        members = frozenset(values)
+    except TypeError:
+        return lambda instance: instance in values
+
+    def contains(instance: Any) -> bool:
+        try:
+            return instance in members
+        except TypeError:
+            return instance in values
+
+    return contains
+
+
+def _resolve_pointer(document: Any, pointer: str) -> Any:
+    node = document
+    for token in pointer.lstrip("/").split("/") if pointer.strip("/") else ():
+        token = token.replace("~1", "/").replace("~0", "~")
+        node = node[int(token)] if isinstance(node, list) else node[token]
+    return node
@@ -0,0 +1,404 @@
+"""Revalidate only the parts of an item touched by a JSON-Pointer patch."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .compiler import (
+    Check,
+    CompiledValidator,
+    InstancePath,
+    ValidationError,
+    _membership,
+    _type_check,
+)
+
+__all__ = ["IncrementalValidationResult", "IncrementalValidator", "parse_pointer", "touched_pointers"]
+
+Pointer = Tuple[str, ...]
+
+
+def parse_pointer(pointer: str) -> Pointer:
+    """Split an RFC 6901 JSON Pointer into unescaped reference tokens."""
+
+    if pointer == "":
+        return ()
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON Pointer {pointer!r}: must be empty or start with '/'")
+    if "~" not in pointer:
+        return tuple(pointer[1:].split("/"))
+    return tuple(token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/"))
+
+
+def touched_pointers(patch: Iterable[Mapping[str, Any]]) -> Tuple[Pointer, ...]:
+    """Return the minimal set of pointers a JSON Patch writes to.
+
+    ``add``, ``replace`` and ``remove`` write ``path``; ``move`` also writes
+    ``from`` and ``copy`` only reads it; ``test`` writes nothing. Pointers
+    below another touched pointer are dropped.
+    """
+
+    return tuple(_touched(patch))
+
+
+def _touched(patch: Iterable[Mapping[str, Any]]) -> Dict[Pointer, bool]:
+    """Map each minimal touched pointer to whether its parent gained or lost a key."""
+
+    touched: Dict[Pointer, bool] = {}
+    for operation in patch:
+        op = operation.get("op")
+        if op == "test":
+            continue
+        if op not in {"add", "replace", "remove", "move", "copy"}:
+            raise ValueError(f"Unsupported patch operation: {op!r}")
+        writes = [operation["path"], operation["from"]] if op == "move" else [operation["path"]]
+        for pointer in map(parse_pointer, writes):
+            touched[pointer] = touched.get(pointer, False) or op != "replace"
+    minimal: Dict[Pointer, bool] = {}
+    for pointer in sorted(touched, key=lambda value: (len(value), value)):
+        if not any(pointer[:length] in minimal for length in range(len(pointer))):
+            minimal[pointer] = touched[pointer]
+    return minimal
+
+
+@dataclass(frozen=True)
+class IncrementalValidationResult:
+    """Errors for the whole item, plus how much of it was actually revalidated.
+
+    ``errors`` covers the entire item and is ordered by instance path.
+    ``revalidated`` counts the validation units that ran; ``reused`` counts
+    those carried over from the previous result.
+    """
+
+    item_id: Any
+    errors: Tuple[ValidationError, ...]
+    revalidated: int
+    reused: int
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+class _Plan:
+    """How one schema node splits into a local check and per-child plans.
+
+    A node is *decomposable* when it has per-child keywords and no ``oneOf``.
+    It then validates as its local ``shallow`` check plus independent checks
+    of each child. Any other node, and every array, is validated as one
+    atomic unit with ``check``. A decomposable node is ``keyed`` when its
+    local check depends only on the object's keys (no ``enum``/``const``),
+    so it can be skipped when a patch rewrites a value in place.
+    """
+
+    __slots__ = (
+        "_children",
+        "_factory",
+        "additional",
+        "check",
+        "decomposable",
+        "gate",
+        "keyed",
+        "properties",
+        "shallow",
+    )
+
+    def __init__(
+        self,
+        factory: "_PlanFactory",
+        schema: Any,
+        key: str,
+        *,
+        check: Check | None = None,
+        atomic: bool = False,
+    ) -> None:
+        compiler = factory.compiler
+        self._factory = factory
+        self._children: Dict[str, _Plan | None] = {}
+        self.check = check if check is not None else compiler._compile(schema, key)
+        self.properties: Mapping[str, Any] = {}
+        self.additional: Any = None
+        self.decomposable = False
+        self.keyed = False
+        self.shallow: Check | None = None
+        self.gate: Callable[[Any], bool] = lambda instance: True
+        resolved = None if atomic else compiler._effective(schema, key)
+        if resolved is None:
+            return
+        schema, key = resolved
+        properties = schema.get("properties", {})
+        additional = schema.get("additionalProperties", True)
+        if "oneOf" in schema or not (properties or isinstance(additional, Mapping)):
+            return
+        self.decomposable = True
+        self.keyed = schema.get("enum") is None and schema.get("const") is None
+        self.shallow = compiler._compile(schema, key, descend=False)
+        self.gate = _gate(schema)
+        self.properties = {name: (subschema, key) for name, subschema in properties.items()}
+        if isinstance(additional, Mapping):
+            self.additional = (additional, key)
+
+    def child(self, name: str) -> "_Plan | None":
+        """Return the plan for the value stored under ``name``, if any applies."""
+
+        if name in self._children:
+            return self._children[name]
+        plan: _Plan | None = None
+        if name in self.properties:
+            plan = self._factory.plan(*self.properties[name])
+        elif self.additional is not None:
+            plan = self._factory.additional(*self.additional)
+        self._children[name] = plan
+        return plan
+
+
+class _PlanFactory:
+    def __init__(self, validator: CompiledValidator) -> None:
+        self.compiler = validator.compiler
+        self.generation = self.compiler.generation
+        self._plans: Dict[Tuple[int, str, bool], _Plan] = {}
+        self.root = _Plan(self, self.compiler.document(validator.key), validator.key, check=validator._cell.check)
+
+    def plan(self, schema: Any, key: str) -> _Plan:
+        cache_key = (id(schema), key, False)
+        plan = self._plans.get(cache_key)
+        if plan is None:
+            plan = self._plans[cache_key] = _Plan(self, schema, key)
+        return plan
+
+    def additional(self, schema: Mapping[str, Any], key: str) -> _Plan:
+        if "oneOf" not in schema:
+            return self.plan(schema, key)
+        cache_key = (id(schema), key, True)
+        plan = self._plans.get(cache_key)
+        if plan is None:
+            # ``additionalProperties.oneOf`` accepts any matching branch; the
+            # compiled check reports against the child path it receives.
+            any_check = self.compiler._additional_check(schema, key)
+
+            def check(instance: Any, path: InstancePath, out: Optional[List[ValidationError]]) -> bool:
+                parent, name = path
+                return any_check(name, instance, parent, out)
+
+            plan = self._plans[cache_key] = _Plan(self, schema, key, check=check, atomic=True)
+        return plan
+
+
+class _Unit:
+    """Cached errors of one validation unit and of the units below it.
+
+    ``size`` (units in the subtree) and ``failures`` (errors in the subtree)
+    are maintained incrementally, so a result for an unchanged or valid
+    subtree is produced without visiting it.
+    """
+
+    __slots__ = ("_flat", "children", "descended", "errors", "failures", "size")
+
+    def __init__(self) -> None:
+        self.errors: List[ValidationError] = []
+        self.children: Dict[str, _Unit] = {}
+        self.descended = False
+        self.size = 0
+        self.failures = 0
+        self._flat: List[ValidationError] | None = None
+
+    def flat(self) -> List[ValidationError]:
+        if not self.failures:
+            return []
+        if self._flat is None:
+            flat = list(self.errors)
+            for child in self.children.values():
+                if child.failures:
+                    flat.extend(child.flat())
+            self._flat = flat
+        return self._flat
+
+
+class IncrementalValidator:
+    """Validate items once, then revalidate only what each patch touched.
+
+    Results are split into units: every object validated by a decomposable
+    schema node contributes its local checks (type, ``required``,
+    ``propertyNames``, disallowed additional properties) as one unit and each
+    child value as further units. ``oneOf`` nodes, arrays and scalars are
+    atomic units. :meth:`validate_patch` fully revalidates the subtree below
+    the first atomic unit on the path to a touched pointer (or the touched
+    value itself). Local checks of the objects along the path are rerun only
+    when the patch added or removed one of their keys, or when they depend on
+    more than the keys (``enum``/``const``). Every other unit is reused from
+    the previous result for that item.
+
+    Up to ``max_items`` item states are kept, keyed by ``id``, in LRU order.
+    They are dropped whenever the underlying :class:`SchemaCompiler` is
+    invalidated.
+    """
+
+    def __init__(self, validator: CompiledValidator, *, max_items: int = 1024) -> None:
+        if max_items < 1:
+            raise ValueError("'max_items' must be at least 1")
+        self.validator = validator
+        self.max_items = max_items
+        self._factory: _PlanFactory | None = None
+        self._states: "OrderedDict[Any, _Unit]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def validate(self, item: Mapping[str, Any]) -> IncrementalValidationResult:
+        """Fully validate ``item`` and remember the result for later patches."""
+
+        with self._lock:
+            factory = self._plans()
+            state = _Unit()
+            _walk(factory.root, item, None, state)
+            item_id = _item_id(item)
+            self._remember(item_id, state)
+            return _result(item_id, state, state.size, 0)
+
+    def validate_patch(
+        self, item: Mapping[str, Any], patch: Sequence[Mapping[str, Any]]
+    ) -> IncrementalValidationResult:
+        """Revalidate ``item`` (already patched) after ``patch`` was applied to it.
+
+        ``patch`` is the JSON Patch operation list stored in a journal entry.
+        Without a remembered state for the item's ``id`` this falls back to
+        :meth:`validate`.
+        """
+
+        pointers = _touched(patch)
+        with self._lock:
+            factory = self._plans()
+            item_id = _item_id(item)
+            state = self._states.get(item_id) if item_id is not None else None
+            if state is None:
+                return self.validate(item)
+            self._states.move_to_end(item_id)
+            revalidated = 0
+            for pointer, reshaped in pointers.items():
+                revalidated += _revalidate(factory.root, item, state, pointer, reshaped)
+            return _result(item_id, state, revalidated, max(0, state.size - revalidated))
+
+    def forget(self, item_id: Any) -> None:
+        with self._lock:
+            self._states.pop(item_id, None)
+
+    def _plans(self) -> _PlanFactory:
+        compiler = self.validator.compiler
+        with compiler._lock:
+            if self._factory is None or self._factory.generation != compiler.generation:
+                self._states.clear()
+                self._factory = _PlanFactory(self.validator)
+            return self._factory
+
+    def _remember(self, item_id: Any, state: _Unit) -> None:
+        if item_id is None:
+            return
+        self._states[item_id] = state
+        self._states.move_to_end(item_id)
+        while len(self._states) > self.max_items:
+            self._states.popitem(last=False)
+
+
+def _item_id(item: Any) -> Any:
+    item_id = item.get("id") if isinstance(item, Mapping) else None
+    return item_id if isinstance(item_id, (str, int)) else None
+
+
+def _walk(plan: _Plan, instance: Any, path: InstancePath, unit: _Unit) -> None:
+    unit.errors = []
+    unit.children = {}
+    unit.descended = False
+    unit._flat = None
+    if not plan.decomposable or not isinstance(instance, dict):
+        plan.check(instance, path, unit.errors)
+    else:
+        plan.shallow(instance, path, unit.errors)
+        if plan.gate(instance):
+            unit.descended = True
+            for name, value in instance.items():
+                child = plan.child(name)
+                if child is not None:
+                    _walk(child, value, (path, name), unit.children.setdefault(name, _Unit()))
+    unit.size = 1 + sum(child.size for child in unit.children.values())
+    unit.failures = len(unit.errors) + sum(child.failures for child in unit.children.values())
+
+
+def _revalidate(plan: _Plan, instance: Any, unit: _Unit, pointer: Pointer, reshaped: bool) -> int:
+    """Bring ``unit`` up to date after a write at ``pointer``; return units run.
+
+    Ancestors of the written value are rechecked only when their local check
+    could have changed: when they are not ``keyed``, or when the write added
+    or removed one of their keys (``reshaped``, for the direct parent).
+    """
+
+    path: InstancePath = None
+    trail: List[Tuple[_Unit, int, int]] = []
+    ran = 0
+    walk = True
+    for depth, token in enumerate(pointer):
+        if not plan.decomposable or not isinstance(instance, dict) or not unit.descended:
+            break
+        trail.append((unit, unit.size, unit.failures))
+        if not plan.keyed or (reshaped and depth == len(pointer) - 1):
+            unit.failures -= len(unit.errors)
+            unit.errors = []
+            plan.shallow(instance, path, unit.errors)
+            unit.failures += len(unit.errors)
+            ran += 1
+            if not plan.gate(instance):
+                unit.children = {}
+                unit.descended = False
+                unit.size, unit.failures = 1, len(unit.errors)
+                walk = False
+                break
+        child = plan.child(token)
+        if child is None or token not in instance:
+            dropped = unit.children.pop(token, None)
+            if dropped is not None:
+                unit.size -= dropped.size
+                unit.failures -= dropped.failures
+            walk = False
+            break
+        plan, instance, path = child, instance[token], (path, token)
+        unit = unit.children.setdefault(token, _Unit())
+    size_delta = failure_delta = 0
+    if walk:
+        size, failures = unit.size, unit.failures
+        _walk(plan, instance, path, unit)
+        ran += unit.size
+        size_delta, failure_delta = unit.size - size, unit.failures - failures
+    for ancestor, size, failures in reversed(trail):
+        ancestor.size += size_delta
+        ancestor.failures += failure_delta
+        ancestor._flat = None
+        size_delta, failure_delta = ancestor.size - size, ancestor.failures - failures
+    return ran
+
+
+def _result(item_id: Any, state: _Unit, revalidated: int, reused: int) -> IncrementalValidationResult:
+    errors = sorted(state.flat(), key=lambda error: [str(part) for part in error.path])
+    return IncrementalValidationResult(
+        item_id=item_id,
+        errors=tuple(errors),
+        revalidated=revalidated,
+        reused=reused,
+    )
+
+
+def _gate(schema: Mapping[str, Any]) -> Callable[[Any], bool]:
+    """Return the checks that stop validation of a node before its children."""
+
+    schema_type = schema.get("type")
+    type_check = _type_check(schema_type) if schema_type is not None else None
+    enum = schema.get("enum")
+    enum_check = _membership(enum) if enum is not None else None
+    const = schema.get("const")
+
+    def gate(instance: Any) -> bool:
+        if type_check is not None and not type_check(instance):
+            return False
+        if enum_check is not None and not enum_check(instance):
+            return False
+        return const is None or instance == const
+
+    return gate
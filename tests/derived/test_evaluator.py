@@ -150,3 +150,236 @@ def test_organization_metrics():
 
     assert result.provenance["site_count"] == ("path:fields.profile.sites",)
     assert result.provenance["linked_item_count"] == ("path:fields.related_items",)
+
+
+def _write_definition(root: Path, payload: dict) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / f"{payload['type']}.yaml").write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_plans_are_compiled_at_load():
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    plan = evaluator.plan_for("task")
+
+    assert [step.key for step in plan.metrics] == [
+        "checklist_total",
+        "checklist_completed",
+        "completion_ratio",
+    ]
+    assert plan.metrics[0].path == ("fields", "checklist")
+    assert plan.metrics[2].path == ()
+    assert plan.metrics[2].depends_on == ("checklist_total", "checklist_completed")
+
+
+def test_plan_orders_dependencies_before_dependents(tmp_path: Path):
+    root = tmp_path / "derived"
+    _write_definition(
+        root,
+        {
+            "type": "task",
+            "metrics": [
+                {
+                    "key": "completion_ratio",
+                    "description": "Ratio declared before its inputs.",
+                    "operation": "ratio",
+                    "depends_on": ["checklist_total", "checklist_completed"],
+                    "config": {"numerator": "checklist_completed", "denominator": "checklist_total"},
+                },
+                {
+                    "key": "checklist_total",
+                    "description": "Total entries.",
+                    "operation": "length",
+                    "config": {"path": "fields.checklist"},
+                },
+                {
+                    "key": "checklist_completed",
+                    "description": "Completed entries.",
+                    "operation": "count_where",
+                    "config": {"path": "fields.checklist", "field": "checked"},
+                },
+            ],
+        },
+    )
+    evaluator = DerivedEvaluator(schema_root=root)
+    assert [step.key for step in evaluator.plan_for("task").metrics] == [
+        "checklist_total",
+        "checklist_completed",
+        "completion_ratio",
+    ]
+    result = evaluator.evaluate_item(load_item("task"))
+    assert result.values["completion_ratio"] == 0.5
+
+
+@pytest.mark.parametrize(
+    "metric",
+    [
+        {"key": "bad", "description": "Unknown op.", "operation": "median", "config": {"path": "fields.a"}},
+        {"key": "bad", "description": "Missing path.", "operation": "length", "config": {}},
+        {"key": "bad", "description": "Zero rate.", "operation": "rate", "config": {"metric": "x", "per": 0}},
+        {
+            "key": "bad",
+            "description": "Unknown dependency.",
+            "operation": "exists",
+            "depends_on": ["missing"],
+            "config": {"path": "fields.a"},
+        },
+    ],
+)
+def test_invalid_metrics_are_rejected_at_load(tmp_path: Path, metric: dict):
+    root = tmp_path / "derived"
+    _write_definition(root, {"type": "task", "metrics": [metric]})
+    with pytest.raises(ValueError):
+        DerivedEvaluator(schema_root=root)
+
+
+def test_circular_dependencies_are_rejected(tmp_path: Path):
+    root = tmp_path / "derived"
+    _write_definition(
+        root,
+        {
+            "type": "task",
+            "metrics": [
+                {
+                    "key": "a",
+                    "description": "A.",
+                    "operation": "rate",
+                    "depends_on": ["b"],
+                    "config": {"metric": "b"},
+                },
+                {
+                    "key": "b",
+                    "description": "B.",
+                    "operation": "rate",
+                    "depends_on": ["a"],
+                    "config": {"metric": "a"},
+                },
+            ],
+        },
+    )
+    with pytest.raises(ValueError, match="Circular"):
+        DerivedEvaluator(schema_root=root)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_evaluate_batch_matches_item_results(monkeypatch, use_numpy: bool):
+    from kernel.derived import evaluator as evaluator_module
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(evaluator_module, "np", None)
+
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    task = load_item("task")
+    empty = dict(task, id="task_empty", fields=dict(task["fields"], checklist=[]))
+    items = [task, load_item("task_insurance_followup"), empty]
+
+    batch = evaluator.evaluate_batch(items)
+
+    assert len(batch) == 3
+    assert batch.item_ids == (task["id"], items[1]["id"], "task_empty")
+    assert batch.provenance["completion_ratio"] == (
+        "metric:checklist_completed",
+        "metric:checklist_total",
+    )
+    for item, row in zip(items, batch.rows()):
+        assert row.values == evaluator.evaluate_item(item).values
+    assert batch.column("completion_ratio")[2] == 0.0
+    assert batch.to_dict()["columns"]["checklist_total"] == batch.column("checklist_total")
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_evaluate_batch_rounds_like_item_results(monkeypatch, use_numpy: bool):
+    from kernel.derived import evaluator as evaluator_module
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(evaluator_module, "np", None)
+
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    document = load_item("document")
+    # 1/200 = 0.005 and 1465/200 = 7.325 sit on a rounding tie for precision 2.
+    items = [
+        dict(document, id=f"doc_{words}", fields=dict(document["fields"], body=" ".join(["word"] * words)))
+        for words in (*range(60), 1465)
+    ]
+
+    batch = evaluator.evaluate_batch(items)
+
+    for item, row in zip(items, batch.rows()):
+        assert row.values == evaluator.evaluate_item(item).values
+    assert batch.column("reading_time_minutes")[1] == round(1 / 200, 2)
+
+
+def test_evaluate_batch_rejects_mixed_types():
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    with pytest.raises(ValueError):
+        evaluator.evaluate_batch([load_item("task"), load_item("document")])
+
+
+def test_evaluate_batch_accepts_empty_batch_with_type():
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    batch = evaluator.evaluate_batch([], item_type="document")
+    assert len(batch) == 0
+    assert batch.column("reading_time_minutes") == []
+    with pytest.raises(ValueError):
+        evaluator.evaluate_batch([])
+
+
+def test_incremental_evaluation_reuses_unchanged_metrics():
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    item = load_item("task")
+
+    first = evaluator.evaluate_incremental(item)
+    assert first.recomputed == ("checklist_total", "checklist_completed", "completion_ratio")
+    assert first.values == evaluator.evaluate_item(item).values
+    first.apply(item)
+    assert item["derived"]["completion_ratio"] == 0.5
+    assert item["derived"]["is_overdue"] is False
+    assert set(item["metadata"]["sys.derived.fingerprints"]) == set(first.values)
+
+    unchanged = evaluator.evaluate_incremental(item)
+    assert unchanged.recomputed == ()
+    assert unchanged.values == first.values
+
+    item["fields"]["checklist"][1]["checked"] = True
+    changed = evaluator.evaluate_incremental(item)
+    # Both counts read the checklist, so they are recomputed (the total with an
+    # unchanged value), and the ratio built on the completed count follows.
+    assert changed.recomputed == ("checklist_total", "checklist_completed", "completion_ratio")
+    assert changed.values["completion_ratio"] == 1.0
+    changed.apply(item)
+
+    item["fields"]["status"] = "done"
+    assert evaluator.evaluate_incremental(item).recomputed == ()
+
+
+def test_incremental_evaluation_propagates_through_dependencies():
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    item = load_item("document")
+    evaluator.evaluate_incremental(item).apply(item)
+
+    item["fields"]["summary"] = "Now summarised"
+    summary = evaluator.evaluate_incremental(item)
+    assert summary.recomputed == ("has_summary",)
+    summary.apply(item)
+
+    item["fields"]["body"] = "one two three"
+    result = evaluator.evaluate_incremental(item)
+    assert result.recomputed == ("word_count", "reading_time_minutes")
+    assert result.values["word_count"] == 3
+
+
+def test_incremental_evaluation_detects_definition_changes(tmp_path: Path):
+    item = load_item("document")
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    evaluator.evaluate_incremental(item).apply(item)
+
+    root = tmp_path / "derived"
+    definition = json.loads((SCHEMA_ROOT / "document.yaml").read_text(encoding="utf-8"))
+    definition["metrics"][1]["config"]["per"] = 100
+    _write_definition(root, definition)
+    result = DerivedEvaluator(schema_root=root).evaluate_incremental(item)
+    assert result.recomputed == ("reading_time_minutes",)
+    assert result.values["reading_time_minutes"] == 0.06
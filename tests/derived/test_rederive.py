@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from kernel.derived import DerivedEvaluator
+from kernel.derived.rederive import main, rederive
+from kernel.files import iter_item_files
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "items"
+SCHEMA_ROOT = Path(__file__).resolve().parents[2] / "schema" / "derived"
+
+
+@pytest.fixture()
+def corpus(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    for index, name in enumerate(["task", "document", "wiki_entry"]):
+        target = root / "personal" / name / "2024" / f"item_{index}"
+        target.mkdir(parents=True)
+        shutil.copy(FIXTURES / f"{name}.json", target / "item.json")
+    manifest = root / "personal" / "document" / "2024" / "item_1" / "captures" / "c1"
+    manifest.mkdir(parents=True)
+    (manifest / "manifest.json").write_text(json.dumps({"capture_id": "c1"}), encoding="utf-8")
+    return root
+
+
+def test_iter_item_files_is_sorted_and_filtered(corpus: Path) -> None:
+    paths = [path.relative_to(corpus).as_posix() for path in iter_item_files(corpus, "item.json")]
+    assert paths == [
+        "personal/document/2024/item_1/item.json",
+        "personal/task/2024/item_0/item.json",
+        "personal/wiki_entry/2024/item_2/item.json",
+    ]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_rederive_writes_derived_values(corpus: Path, workers: int) -> None:
+    report = rederive(iter_item_files(corpus), derived_root=SCHEMA_ROOT, workers=workers, shard_size=1)
+
+    assert report.updated == 3
+    assert report.skipped == 1
+    assert report.failed == []
+    task = json.loads((corpus / "personal" / "task" / "2024" / "item_0" / "item.json").read_text("utf-8"))
+    assert task["derived"]["completion_ratio"] == 0.5
+    # Pre-existing derived values that are not metrics are preserved.
+    assert task["derived"]["is_overdue"] is False
+
+    second = rederive(iter_item_files(corpus), derived_root=SCHEMA_ROOT, workers=workers)
+    assert second.updated == 0
+    assert second.unchanged == 3
+
+
+def test_rederive_dry_run_and_failures(corpus: Path) -> None:
+    broken = corpus / "personal" / "task" / "2024" / "item_9"
+    broken.mkdir(parents=True)
+    (broken / "item.json").write_text("{not json", encoding="utf-8")
+    task_path = corpus / "personal" / "task" / "2024" / "item_0" / "item.json"
+    original = task_path.read_text("utf-8")
+
+    report = rederive(iter_item_files(corpus), derived_root=SCHEMA_ROOT, workers=0, dry_run=True)
+
+    assert report.updated == 3
+    assert [entry["path"] for entry in report.failed] == [str(broken / "item.json")]
+    assert task_path.read_text("utf-8") == original
+
+
+def test_rederive_skips_items_with_unhashable_type(corpus: Path) -> None:
+    for index, item_type in enumerate((["task"], {"name": "task"})):
+        odd = corpus / "personal" / "task" / "2024" / f"odd_{index}"
+        odd.mkdir(parents=True)
+        (odd / "item.json").write_text(json.dumps({"id": f"odd_{index}", "item_type": item_type}), encoding="utf-8")
+
+    report = rederive(iter_item_files(corpus), derived_root=SCHEMA_ROOT, workers=0, dry_run=True)
+
+    assert (report.updated, report.skipped, report.failed) == (3, 3, [])
+
+
+def test_main_prints_summary(corpus: Path, capsys) -> None:
+    exit_code = main([str(corpus), "--derived-root", str(SCHEMA_ROOT), "--workers", "0", "--pattern", "item.json"])
+    assert exit_code == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["processed"] == 3
+    assert summary["updated"] == 3
+
+
+def test_rederived_documents_match_item_evaluation(tmp_path: Path) -> None:
+    document = json.loads((FIXTURES / "document.json").read_text("utf-8"))
+    root = tmp_path / "data"
+    # Word counts of 1 and 1465 give reading times on a rounding tie (0.005, 7.325).
+    for words in (1, 3, 1465):
+        target = root / "personal" / "document" / "2024" / f"doc_{words}"
+        target.mkdir(parents=True)
+        item = dict(document, id=f"doc_{words}", fields=dict(document["fields"], body=" ".join(["word"] * words)))
+        (target / "item.json").write_text(json.dumps(item), encoding="utf-8")
+
+    report = rederive(iter_item_files(root), derived_root=SCHEMA_ROOT, workers=0)
+
+    assert report.updated == 3
+    evaluator = DerivedEvaluator(schema_root=SCHEMA_ROOT)
+    for path in iter_item_files(root):
+        item = json.loads(path.read_text("utf-8"))
+        for key, value in evaluator.evaluate_item(item).values.items():
+            assert item["derived"][key] == value
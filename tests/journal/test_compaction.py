@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from kernel.journal import Compactor, JournalEntry, JournalReader, JournalWriter, restore, write_snapshot
+import kernel.journal.snapshot as snapshot_module
+from kernel.journal.snapshot import list_snapshots, main, read_snapshot
+
+
+def _append(directory: Path, start: int, count: int, **options: object) -> None:
+    with JournalWriter(directory, durable=False, **options) as writer:
+        for value in range(start, start + count):
+            item_id = f"task_{value % 3}"
+            patch = [{"op": "add", "path": "", "value": {"id": item_id, "n": value}}]
+            writer.append(JournalEntry.create(item_id, patch, author="user_1", persona="owner"))
+
+
+def _expected(total: int) -> dict:
+    return {f"task_{value % 3}": {"id": f"task_{value % 3}", "n": value} for value in range(total)}
+
+
+def test_snapshot_round_trip_and_checksum(tmp_path: Path) -> None:
+    path = write_snapshot(tmp_path, {"task_1": {"id": "task_1"}}, 41, durable=False)
+    assert path.name == "00000000000000000041.snapshot"
+    snapshot = read_snapshot(path)
+    assert (snapshot.watermark, dict(snapshot.items)) == (41, {"task_1": {"id": "task_1"}})
+
+    content = bytearray(path.read_bytes())
+    content[-3] ^= 0xFF
+    path.write_bytes(bytes(content))
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+    with pytest.raises(ValueError):
+        write_snapshot(tmp_path, {}, -1)
+
+
+def test_restore_replays_only_the_tail_after_the_snapshot(tmp_path: Path) -> None:
+    journal, snapshots = tmp_path / "journal", tmp_path / "snapshots"
+    _append(journal, 0, 10)
+    assert restore(journal, snapshots)[0] == _expected(10)
+
+    write_snapshot(snapshots, _expected(6), 5, durable=False)
+    items, report = restore(journal, snapshots)
+    assert items == _expected(10)
+    assert (report.watermark, report.snapshot_items, report.replay.applied) == (5, 3, 4)
+
+    # A damaged newest snapshot falls back to the previous one.
+    newest = write_snapshot(snapshots, _expected(9), 8, durable=False)
+    newest.write_bytes(b"garbage")
+    items, report = restore(journal, snapshots)
+    assert items == _expected(10) and report.watermark == 5
+
+
+def test_compactor_snapshots_retires_segments_and_catches_up(tmp_path: Path) -> None:
+    journal, snapshots = tmp_path / "journal", tmp_path / "snapshots"
+    _append(journal, 0, 30, segment_bytes=300)
+    segments = len(JournalReader(journal).segments())
+    compactor = Compactor(journal, snapshots, min_entries=20, durable=False)
+    with pytest.raises(ValueError):
+        Compactor(journal, snapshots, keep=1)
+
+    # The first snapshot is the only copy of the history, so nothing is retired yet.
+    first = compactor.run_once()
+    assert (first.watermark, first.replayed, first.items) == (29, 30, 3)
+    assert first.snapshot is not None and first.retired_segments == []
+
+    _append(journal, 30, 5)
+    second = compactor.run_once()
+    assert (second.replayed, second.snapshot, second.watermark) == (5, None, 34)
+    forced = compactor.run_once(force=True)
+    assert forced.replayed == 0 and forced.pruned_snapshots == []
+    assert len(forced.retired_segments) == segments - 1
+    assert [watermark for watermark, _ in list_snapshots(snapshots)] == [29, 34]
+
+    # A damaged newest snapshot falls back to the older one, which covers the retired segments.
+    Path(forced.snapshot).write_bytes(b"garbage")
+    items, report = restore(journal, snapshots)
+    assert items == _expected(35) and report.watermark == 29
+
+    # Damaged snapshots are discarded and do not count towards ``keep``.
+    _append(journal, 35, 40, segment_bytes=300)
+    third = compactor.run_once()
+    assert third.snapshot is not None and third.pruned_snapshots == [forced.snapshot]
+    assert third.retired_segments == []
+    assert [watermark for watermark, _ in list_snapshots(snapshots)] == [29, 74]
+    fourth = compactor.run_once(force=True)
+    assert fourth.snapshot is None
+    _append(journal, 75, 20, segment_bytes=300)
+    fifth = compactor.run_once()
+    assert fifth.pruned_snapshots == [first.snapshot] and fifth.retired_segments
+    assert restore(journal, snapshots)[0] == _expected(95)
+
+    # Without any snapshot the retired history cannot be rebuilt.
+    for _, path in list_snapshots(snapshots):
+        path.unlink()
+    with pytest.raises(ValueError):
+        restore(journal, snapshots)
+
+
+def test_compactor_syncs_segments_before_snapshotting_them(tmp_path: Path, monkeypatch) -> None:
+    journal, snapshots = tmp_path / "journal", tmp_path / "snapshots"
+    _append(journal, 0, 30, segment_bytes=300)
+    events: list = []
+    monkeypatch.setattr(snapshot_module.os, "fsync", lambda descriptor: events.append(os.fstat(descriptor).st_ino))
+    write = snapshot_module.write_snapshot
+
+    def _write_snapshot(directory, items, watermark, **options):
+        events.append(("snapshot", watermark))
+        return write(directory, items, watermark, **options)
+
+    monkeypatch.setattr(snapshot_module, "write_snapshot", _write_snapshot)
+    compactor = Compactor(journal, snapshots, min_entries=1)
+
+    def _synced_before_snapshot() -> set:
+        marker = next(index for index, event in enumerate(events) if isinstance(event, tuple))
+        inodes = {path.stat().st_ino: path.name for path in JournalReader(journal).segments()}
+        synced = {inodes[event] for event in events[:marker] if event in inodes}
+        del events[: marker + 1]
+        return synced
+
+    compactor.run_once()
+    assert _synced_before_snapshot() == {path.name for path in JournalReader(journal).segments()}
+
+    # Only the segments holding entries after the previous snapshot are synced again.
+    _append(journal, 30, 1, segment_bytes=300)
+    compactor.run_once()
+    assert _synced_before_snapshot() == {JournalReader(journal).segments()[-1].name}
+
+
+def test_background_compactor_and_cli(tmp_path: Path, capsys) -> None:
+    journal = tmp_path / "journal"
+    _append(journal, 0, 4)
+    with Compactor(journal, journal / "snapshots", interval=0.01, min_entries=1, durable=False):
+        deadline = time.monotonic() + 5
+        while not list_snapshots(journal / "snapshots") and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert [watermark for watermark, _ in list_snapshots(journal / "snapshots")] == [3]
+
+    _append(journal, 4, 2)
+    assert main(["restore", str(journal)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary["watermark"], summary["items"], summary["replay"]["applied"]) == (3, 3, 2)
+
+    assert main(["compact", str(journal), "--no-fsync"]) == 0
+    assert json.loads(capsys.readouterr().out)["watermark"] == 5
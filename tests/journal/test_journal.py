@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from kernel.journal import JournalEntry, JournalReader, JournalWriter, apply_patch, replay
+from kernel.journal.log import main
+
+
+def _entry(item_id: str, patch: list, *, timestamp: str = "2024-05-01T12:00:00Z") -> JournalEntry:
+    return JournalEntry.create(item_id, patch, author="user_1", persona="owner", timestamp=timestamp)
+
+
+def test_apply_patch_supports_rfc6902_operations() -> None:
+    document = {"title": "Draft", "tags": ["a", "b"], "fields": {"a~b": 1, "c/d": 2}}
+    patched = apply_patch(
+        document,
+        [
+            {"op": "test", "path": "/title", "value": "Draft"},
+            {"op": "replace", "path": "/title", "value": "Final"},
+            {"op": "add", "path": "/tags/-", "value": "c"},
+            {"op": "add", "path": "/tags/0", "value": "z"},
+            {"op": "remove", "path": "/fields/a~0b"},
+            {"op": "move", "from": "/fields/c~1d", "path": "/moved"},
+            {"op": "copy", "from": "/tags", "path": "/fields/tags"},
+        ],
+    )
+
+    assert patched == {
+        "title": "Final",
+        "tags": ["z", "a", "b", "c"],
+        "fields": {"tags": ["z", "a", "b", "c"]},
+        "moved": 2,
+    }
+    assert document["title"] == "Draft"
+    assert apply_patch({}, [{"op": "add", "path": "", "value": {"id": "x"}}]) == {"id": "x"}
+    for operation in (
+        {"op": "test", "path": "/title", "value": "Other"},
+        {"op": "remove", "path": "/missing"},
+        {"op": "replace", "path": "/tags/9", "value": 1},
+        {"op": "add", "path": "/tags/01", "value": 1},
+        {"op": "move", "from": "/fields", "path": "/fields/inner"},
+        {"op": "merge", "path": "/title"},
+    ):
+        with pytest.raises(ValueError):
+            apply_patch(document, [operation])
+
+
+def test_writer_assigns_sequences_rotates_and_reads_back(tmp_path: Path) -> None:
+    with JournalWriter(tmp_path, segment_bytes=200, durable=False) as writer:
+        sequences = [writer.append(_entry(f"item_{index}", [{"op": "add", "path": "/n", "value": index}])) for index in range(5)]
+        assert writer.append_many([_entry("item_x", []), _entry("item_y", [])]) == [5, 6]
+
+    assert sequences == [0, 1, 2, 3, 4]
+    reader = JournalReader(tmp_path)
+    assert len(reader.segments()) > 1
+    assert [entry.sequence for entry in reader] == list(range(7))
+    assert [entry.item_id for entry in reader.iter_entries(start=5)] == ["item_x", "item_y"]
+    assert reader.segments()[0].name == "00000000000000000000.journal"
+
+    # Reopening continues the sequence in the last segment.
+    with JournalWriter(tmp_path, segment_bytes=1 << 20, durable=False) as writer:
+        assert writer.append(_entry("item_z", [])) == 7
+
+
+def test_group_commit_batches_concurrent_appends(tmp_path: Path) -> None:
+    writer = JournalWriter(tmp_path, commit_delay=0.002)
+    threads = [
+        threading.Thread(target=lambda: [writer.append(_entry("item_1", [])) for _ in range(25)]) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    sequences = [entry.sequence for entry in JournalReader(tmp_path)]
+    assert sequences == list(range(200))
+    assert writer.commits < 200
+    with pytest.raises(RuntimeError):
+        writer.append(_entry("item_1", []))
+
+
+def test_torn_tail_is_truncated_and_corruption_elsewhere_raises(tmp_path: Path) -> None:
+    with JournalWriter(tmp_path, segment_bytes=150, durable=False) as writer:
+        for index in range(4):
+            writer.append(_entry("item_1", [{"op": "add", "path": "/n", "value": index}]))
+    segments = JournalReader(tmp_path).segments()
+    last = segments[-1]
+    intact = last.stat().st_size
+    with last.open("ab") as handle:
+        handle.write(b"\x40\x00\x00\x00partial")
+
+    assert [entry.sequence for entry in JournalReader(tmp_path)] == [0, 1, 2, 3]
+    with JournalWriter(tmp_path, durable=False) as writer:
+        assert last.stat().st_size == intact
+        assert writer.append(_entry("item_1", [])) == 4
+
+    first = segments[0]
+    content = bytearray(first.read_bytes())
+    content[-2] ^= 0xFF
+    first.write_bytes(bytes(content))
+    with pytest.raises(ValueError):
+        list(JournalReader(tmp_path))
+
+
+def test_replay_rebuilds_items_and_reports_failures(tmp_path: Path, capsys) -> None:
+    with JournalWriter(tmp_path, durable=False) as writer:
+        writer.append(_entry("task_1", [{"op": "add", "path": "", "value": {"id": "task_1", "tags": []}}]))
+        writer.append(_entry("task_1", [{"op": "add", "path": "/tags/-", "value": "urgent"}]))
+        writer.append(_entry("task_1", [{"op": "remove", "path": "/missing"}]))
+        writer.append(
+            _entry(
+                "task_1",
+                [{"op": "replace", "path": "/id", "value": "changed"}, {"op": "remove", "path": "/missing"}],
+            )
+        )
+        writer.append(_entry("task_2", [{"op": "add", "path": "/title", "value": "New"}]))
+
+    items, report = replay(JournalReader(tmp_path))
+    assert items == {"task_1": {"id": "task_1", "tags": ["urgent"]}, "task_2": {"title": "New"}}
+    assert (report.applied, report.items, report.last_sequence) == (3, 2, 4)
+    assert [failure["sequence"] for failure in report.failed] == [2, 3]
+
+    assert main([str(tmp_path)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary["entries"], summary["last_sequence"], summary["segments"]) == (5, 4, 1)
+    assert main([str(tmp_path), "--replay"]) == 1
+
+
+def test_replay_rejects_replace_without_value_before_mutating(tmp_path: Path) -> None:
+    with JournalWriter(tmp_path, durable=False) as writer:
+        writer.append(_entry("item_1", [{"op": "replace", "path": "/a"}]))
+        writer.append(_entry("item_1", [{"op": "add", "path": "/b"}]))
+
+    items, report = replay(JournalReader(tmp_path), {"item_1": {"a": 1}})
+
+    assert items == {"item_1": {"a": 1}}
+    assert [failure["sequence"] for failure in report.failed] == [0, 1]
+    assert "needs a 'value'" in report.failed[0]["error"]
+    with pytest.raises(ValueError):
+        apply_patch({"a": 1}, [{"op": "replace", "path": "/a"}])
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from kernel.journal import JournalEntry, JournalWriter, OverlapIndex, plan_sync
+from kernel.journal.sync import main
+
+
+def _entry(item_id: str, path: str, value: object, timestamp: str, *, author: str = "user_1") -> JournalEntry:
+    patch = [{"op": "replace", "path": path, "value": value}]
+    return JournalEntry.create(item_id, patch, author=author, persona="owner", timestamp=timestamp)
+
+
+def test_overlap_index_detects_same_ancestor_and_descendant_writes() -> None:
+    laptop, desktop, both = frozenset({"laptop"}), frozenset({"desktop"}), frozenset({"laptop", "desktop"})
+    index = OverlapIndex()
+    assert index.add(("fields", "title"), laptop, 0) is None
+    assert index.add(("fields", "title"), laptop, 1) is None
+    assert index.add(("fields", "notes"), desktop, 2) is None
+    assert index.add(("fields", "title", "0"), desktop, 3) == 1
+    assert index.add(("fields",), both, 4) is None
+    assert index.add((), desktop, 5) == 1
+
+    fresh = OverlapIndex()
+    assert fresh.add(("tags", "0"), laptop, 0) is None
+    assert fresh.add(("tags",), desktop, 1) == 0
+
+
+def test_plan_sync_merges_by_timestamp_and_queues_conflicts() -> None:
+    shared = _entry("task_1", "/title", "Base", "2024-05-01T08:00:00Z")
+    laptop = [
+        shared,
+        _entry("task_1", "/title", "Laptop title", "2024-05-03T09:00:00Z"),
+        _entry("task_2", "/status", "done", "2024-05-02T10:00:00+00:00"),
+    ]
+    desktop = [
+        shared,
+        _entry("task_1", "/title", "Desktop title", "2024-05-04T09:00:00Z", author="user_2"),
+        _entry("task_2", "/priority", "high", "2024-05-02T09:00:00Z", author="user_2"),
+    ]
+
+    plan = plan_sync({"laptop": laptop, "desktop": desktop})
+    assert plan.duplicates == 1
+    assert [merged.entry.timestamp for merged in plan.entries] == sorted(
+        ["2024-05-01T08:00:00Z", "2024-05-02T09:00:00Z", "2024-05-02T10:00:00+00:00", "2024-05-03T09:00:00Z", "2024-05-04T09:00:00Z"]
+    )
+    assert plan.entries[0].nodes == ("desktop", "laptop")
+    assert plan.conflicted_items == ("task_1",)
+    (conflict,) = plan.conflicts
+    assert conflict.pointer == "/title"
+    assert (conflict.entry.nodes, conflict.other.nodes) == (("desktop",), ("laptop",))
+
+    base = {"task_1": {"title": "Old"}, "task_2": {"status": "open", "priority": "low"}}
+    items, report = plan.apply(base)
+    assert items["task_1"] == {"title": "Old"}
+    assert items["task_2"] == {"status": "done", "priority": "high"}
+    assert report.applied == 2
+
+    summary = plan.to_dict()
+    assert (summary["merged_items"], summary["conflicted_items"]) == (["task_2"], ["task_1"])
+
+
+def test_entries_seen_by_one_node_before_its_edit_do_not_conflict() -> None:
+    pulled = _entry("task_1", "/title", "From laptop", "2024-05-01T08:00:00Z")
+    plan = plan_sync(
+        {
+            "laptop": [pulled],
+            "desktop": [pulled, _entry("task_1", "/title", "Edited after pull", "2024-05-01T09:00:00Z")],
+        }
+    )
+    assert plan.conflicts == ()
+    items, _ = plan.apply({"task_1": {"title": "Old"}})
+    assert items["task_1"]["title"] == "Edited after pull"
+
+
+def test_positional_array_edits_overlap_the_whole_array() -> None:
+    def _patch(op: str, path: str, value: object, timestamp: str) -> JournalEntry:
+        patch = [{"op": op, "path": path, "value": value}]
+        return JournalEntry.create("task_1", patch, author="user_1", persona="owner", timestamp=timestamp)
+
+    # Inserting at index 0 shifts "b" to index 1, so the replace would hit "a".
+    laptop = [_patch("add", "/fields/tags/0", "new", "2024-05-01T09:00:00Z")]
+    desktop = [_patch("replace", "/fields/tags/1", "B!", "2024-05-01T10:00:00Z")]
+    plan = plan_sync({"laptop": laptop, "desktop": desktop})
+    assert plan.conflicted_items == ("task_1",)
+    assert plan.conflicts[0].pointer == "/fields/tags/1"
+    base = {"task_1": {"fields": {"tags": ["a", "b"]}}}
+    assert plan.apply(base)[0]["task_1"]["fields"]["tags"] == ["a", "b"]
+
+    appended = [_patch("add", "/fields/tags/-", "c", "2024-05-01T11:00:00Z")]
+    assert plan_sync({"laptop": appended, "desktop": desktop}).conflicted_items == ("task_1",)
+
+    # Replacing different elements in place does not move anything.
+    in_place = [_patch("replace", "/fields/tags/0", "A!", "2024-05-01T09:00:00Z")]
+    assert plan_sync({"laptop": in_place, "desktop": desktop}).conflicts == ()
+
+
+def test_cli_reports_dry_run(tmp_path: Path, capsys) -> None:
+    for node, value in (("laptop", "A"), ("desktop", "B")):
+        with JournalWriter(tmp_path / node, durable=False) as writer:
+            writer.append(_entry("task_9", "/note", "ignored", "2024-04-01T00:00:00Z", author=node))
+            writer.append(_entry("task_1", "/title", value, "2024-05-01T00:00:00Z", author=node))
+
+    arguments = [f"laptop={tmp_path / 'laptop'}", f"desktop={tmp_path / 'desktop'}"]
+    assert main(arguments + ["--start", "laptop=1", "--start", "desktop=1"]) == 1
+    summary = json.loads(capsys.readouterr().out)
+    assert (summary["entries"], summary["conflicted_items"]) == (2, ["task_1"])
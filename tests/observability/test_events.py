@@ -0,0 +1,96 @@
+import json
+import logging
+
+import pytest
+
+from kernel import observability
+from kernel.observability import configure_events, emit_event, event_enabled, trace_span
+
+
+def test_emit_event_records_json(caplog):
+    caplog.set_level(logging.INFO, logger="kernel")
+    record = emit_event("test.event", foo="bar", answer=42)
+    assert record["event"] == "test.event"
+    assert record["foo"] == "bar"
+    assert record["answer"] == 42
+    logged = "\n".join(message for _, _, message in caplog.record_tuples if "test.event" in message)
+    assert '"foo": "bar"' in logged
+
+
+def test_trace_span_emits_start_and_end(caplog):
+    caplog.set_level(logging.INFO, logger="kernel")
+    with trace_span("unit-test", label="demo") as span_id:
+        assert span_id
+    messages = [message for _, _, message in caplog.record_tuples]
+    assert any('"event": "trace.start"' in message for message in messages)
+    assert any('"event": "trace.end"' in message for message in messages)
+
+
+@pytest.fixture(autouse=True)
+def _reset_event_configuration():
+    yield
+    configure_events(reset=True)
+
+
+def _kernel_events(caplog) -> list[dict]:
+    return [json.loads(record.message) for record in caplog.records if record.name == "kernel"]
+
+
+def test_event_enabled_follows_logger_level(caplog):
+    caplog.set_level(logging.WARNING, logger="kernel")
+    assert not event_enabled("test.event")
+    emit_event("test.event", foo="bar")
+    assert _kernel_events(caplog) == []
+
+    caplog.set_level(logging.INFO, logger="kernel")
+    assert event_enabled("test.event")
+
+
+def test_event_levels_match_dotted_prefixes(caplog):
+    caplog.set_level(logging.INFO, logger="kernel")
+    configure_events(levels={"derived": "DEBUG", "derived.evaluation_complete": logging.INFO})
+
+    assert not event_enabled("derived.metric")
+    assert event_enabled("derived.evaluation_complete")
+    assert event_enabled("registry.schema.loaded")
+
+    emit_event("derived.metric", metric="word_count")
+    emit_event("derived.evaluation_complete", metrics=[])
+    assert [event["event"] for event in _kernel_events(caplog)] == ["derived.evaluation_complete"]
+
+
+def test_event_sampling(caplog, monkeypatch):
+    caplog.set_level(logging.INFO, logger="kernel")
+    configure_events(sample_rates={"noisy": 0.0, "sampled": 0.5})
+    assert not event_enabled("noisy.event")
+
+    draws = iter([0.2, 0.7])
+    monkeypatch.setattr(observability._random, "random", lambda: next(draws))
+    emit_event("noisy.event")
+    emit_event("sampled.event", n=1)
+    emit_event("sampled.event", n=2)
+
+    events = _kernel_events(caplog)
+    assert [(event["event"], event["n"]) for event in events] == [("sampled.event", 1)]
+    assert events[0]["sample_rate"] == 0.5
+
+
+def test_invalid_event_configuration():
+    with pytest.raises(ValueError):
+        configure_events(sample_rates={"derived": 2})
+    with pytest.raises(ValueError):
+        configure_events(levels={"derived": "LOUD"})
+
+
+def test_filtered_metric_events_skip_serialisation(caplog, monkeypatch):
+    from kernel.derived import DerivedEvaluator
+
+    caplog.set_level(logging.INFO, logger="kernel")
+    configure_events(levels={"derived.metric": "DEBUG"})
+    emitted = []
+    monkeypatch.setattr(
+        "kernel.derived.evaluator.emit_event", lambda event, **payload: emitted.append(event)
+    )
+    evaluator = DerivedEvaluator()
+    evaluator.evaluate_item({"item_type": "task", "fields": {"checklist": []}})
+    assert emitted == ["derived.evaluation_complete"]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kernel.observability import MetricsRegistry, get_metrics, trace_span
+
+
+def test_counters_and_gauges():
+    registry = MetricsRegistry()
+    registry.counter("items_total", "Items processed.", realm="home").inc()
+    registry.counter("items_total", realm="home").inc(2)
+    registry.counter("items_total", realm="work").inc()
+    gauge = registry.gauge("queue_depth")
+    gauge.set(5)
+    gauge.dec()
+
+    assert registry.counter("items_total", realm="home").value == 3
+    assert registry.gauge("queue_depth").value == 4
+    with pytest.raises(ValueError):
+        registry.counter("items_total").inc(-1)
+    with pytest.raises(ValueError):
+        registry.gauge("items_total")
+    with pytest.raises(ValueError):
+        registry.counter("not a name")
+
+
+def test_histogram_quantiles():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_ms", buckets=(1, 2, 5, 10))
+    assert histogram.quantile(0.5) is None
+    for value in [0.5] * 50 + [4.0] * 49 + [20.0]:
+        histogram.observe(value)
+
+    assert histogram.count == 100
+    assert histogram.sum == pytest.approx(25 + 196 + 20)
+    assert histogram.quantile(0.5) <= 1.0
+    assert 2.0 < histogram.quantile(0.9) <= 5.0
+    assert histogram.quantile(1.0) == 20.0
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"1.0": 50, "2.0": 50, "5.0": 99, "10.0": 99, "+Inf": 100}
+
+
+def test_prometheus_and_json_export(tmp_path: Path):
+    registry = MetricsRegistry()
+    registry.counter("items_total", "Items processed.", realm='a"b').inc()
+    registry.histogram("latency_ms", buckets=(1, 10), span="derived.evaluate_item").observe(3)
+
+    text = registry.to_prometheus()
+    assert "# HELP items_total Items processed." in text
+    assert "# TYPE items_total counter" in text
+    assert 'items_total{realm="a\\"b"} 1' in text
+    assert 'latency_ms_bucket{span="derived.evaluate_item",le="10.0"} 1' in text
+    assert 'latency_ms_bucket{span="derived.evaluate_item",le="+Inf"} 1' in text
+    assert 'latency_ms_count{span="derived.evaluate_item"} 1' in text
+
+    prom_path = registry.write(tmp_path / "metrics.prom")
+    assert prom_path.read_text(encoding="utf-8") == text
+    json_path = registry.write(tmp_path / "metrics-{pid}.json")
+    assert "{pid}" not in json_path.name
+    payload = json.loads(json_path.read_text(encoding="utf-8"))
+    assert payload["latency_ms"]["type"] == "histogram"
+    assert payload["latency_ms"]["series"][0]["labels"] == {"span": "derived.evaluate_item"}
+
+
+def test_trace_span_feeds_duration_histogram():
+    histogram = get_metrics().histogram("span_duration_ms", span="unit-test.metrics")
+    errors = get_metrics().counter("span_errors_total", span="unit-test.metrics")
+    before = histogram.count
+
+    with trace_span("unit-test.metrics"):
+        pass
+    with pytest.raises(RuntimeError):
+        with trace_span("unit-test.metrics"):
+            raise RuntimeError("boom")
+
+    assert histogram.count == before + 2
+    assert errors.value >= 1
+    assert histogram.quantile(0.99) is not None
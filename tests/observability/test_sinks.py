@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+import pytest
+
+from kernel.observability import (
+    AsyncJsonlSink,
+    add_event_sink,
+    emit_event,
+    event_enabled,
+    remove_event_sink,
+)
+
+
+def _read_lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_sink_receives_events_instead_of_logger(tmp_path: Path, caplog):
+    caplog.set_level(logging.INFO, logger="kernel")
+    path = tmp_path / "events.jsonl"
+    sink = add_event_sink(AsyncJsonlSink(path, flush_interval=0.01).start())
+    try:
+        for index in range(10):
+            emit_event("sink.test", index=index, payload={"nested": True})
+        emit_event("sink.test.debug_only", value=object())
+        assert sink.flush(timeout=5)
+    finally:
+        remove_event_sink(sink)
+
+    records = _read_lines(path)
+    assert [record["index"] for record in records[:10]] == list(range(10))
+    assert all(record["level"] == "INFO" and "ts" in record for record in records)
+    assert records[10]["event"] == "sink.test.debug_only"
+    assert not [record for record in caplog.records if "sink.test" in record.getMessage()]
+
+
+def test_sink_level_filters_events(tmp_path: Path):
+    sink = add_event_sink(AsyncJsonlSink(tmp_path / "events.jsonl", level=logging.WARNING).start())
+    try:
+        assert not event_enabled("sink.test")
+    finally:
+        remove_event_sink(sink)
+
+
+def test_drop_policy_counts_overflow(tmp_path: Path):
+    sink = AsyncJsonlSink(tmp_path / "events.jsonl", capacity=2)
+    assert sink.submit({"event": "a"})
+    assert sink.submit({"event": "b"})
+    assert not sink.submit({"event": "c"})
+    assert sink.dropped == 1
+
+    sink.start()
+    sink.close()
+    assert [record["event"] for record in _read_lines(tmp_path / "events.jsonl")] == ["a", "b"]
+    assert not sink.submit({"event": "late"})
+
+
+def test_block_policy_waits_for_writer(tmp_path: Path):
+    sink = AsyncJsonlSink(tmp_path / "events.jsonl", capacity=1, batch_size=1, overflow="block")
+    sink.submit({"event": "first"})
+    finished = threading.Event()
+
+    def _producer() -> None:
+        sink.submit({"event": "second"})
+        finished.set()
+
+    thread = threading.Thread(target=_producer)
+    thread.start()
+    assert not finished.wait(0.1)
+    sink.start()
+    assert finished.wait(5)
+    thread.join()
+    sink.close()
+    assert sink.dropped == 0
+    assert [record["event"] for record in _read_lines(tmp_path / "events.jsonl")] == ["first", "second"]
+
+
+def test_invalid_sink_configuration(tmp_path: Path):
+    with pytest.raises(ValueError):
+        AsyncJsonlSink(tmp_path / "events.jsonl", overflow="spill")
+    with pytest.raises(ValueError):
+        AsyncJsonlSink(tmp_path / "events.jsonl", capacity=0)
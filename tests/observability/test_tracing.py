@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+from kernel.observability import (
+    ChromeTraceRecorder,
+    add_span_recorder,
+    current_span,
+    new_span_id,
+    remove_span_recorder,
+    trace_span,
+)
+from kernel.observability.tracing import iter_span_records, main
+
+
+def test_span_ids_are_unique_and_cheap():
+    ids = {new_span_id() for _ in range(1000)}
+    assert len(ids) == 1000
+
+
+def test_nested_spans_share_trace_and_link_parents():
+    assert current_span() is None
+    with trace_span("outer") as outer_id:
+        outer = current_span()
+        assert outer.span_id == outer_id
+        assert outer.trace_id == outer_id
+        assert outer.parent_id is None
+        with trace_span("inner") as inner_id:
+            inner = current_span()
+            assert inner.trace_id == outer_id
+            assert inner.parent_id == outer_id
+            assert inner_id != outer_id
+        assert current_span() == outer
+    assert current_span() is None
+
+
+def test_parent_context_crosses_threads():
+    seen = {}
+    with trace_span("outer"):
+        parent = current_span()
+
+        def _worker() -> None:
+            assert current_span() is None
+            with trace_span("threaded", parent_context=parent):
+                seen["span"] = current_span()
+
+        thread = threading.Thread(target=_worker)
+        thread.start()
+        thread.join()
+    assert seen["span"].trace_id == parent.trace_id
+    assert seen["span"].parent_id == parent.span_id
+
+
+def test_recorder_writes_chrome_trace(tmp_path: Path):
+    recorder = add_span_recorder(ChromeTraceRecorder())
+    try:
+        with trace_span("derived.rederive", workers=2):
+            with trace_span("derived.evaluate_item", item_id="task_1"):
+                pass
+    finally:
+        remove_span_recorder(recorder)
+
+    output = recorder.write(tmp_path / "trace.json")
+    events = json.loads(output.read_text(encoding="utf-8"))["traceEvents"]
+    assert [event["name"] for event in events] == ["derived.rederive", "derived.evaluate_item"]
+    outer, inner = events
+    assert outer["ph"] == "X" and outer["cat"] == "derived"
+    assert inner["args"]["parent_id"] == outer["args"]["span_id"]
+    assert inner["args"]["item_id"] == "task_1"
+    assert outer["ts"] <= inner["ts"]
+    assert inner["dur"] <= outer["dur"]
+
+
+def test_chrome_trace_from_event_log(tmp_path: Path, caplog, capsys):
+    caplog.set_level(logging.INFO, logger="kernel")
+    with trace_span("outer"):
+        with trace_span("inner"):
+            pass
+    log = tmp_path / "events.jsonl"
+    log.write_text(
+        "\n".join(record.message for record in caplog.records if record.name == "kernel") + "\n",
+        encoding="utf-8",
+    )
+    records = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    spans = list(iter_span_records(records))
+    assert [span.name for span in spans] == ["inner", "outer"]
+    assert spans[0].parent_id == spans[1].span_id
+
+    assert main([str(log), "--output", str(tmp_path / "trace.json")]) == 0
+    assert json.loads(capsys.readouterr().out)["spans"] == 2
+    assert len(json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]) == 2
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kernel.registry import SchemaDependencyGraph, SchemaLoader, TypeRegistry, extract_refs
+
+SCHEMA_ROOT = Path(__file__).resolve().parents[2] / "schema"
+
+
+def _write(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+@pytest.fixture()
+def schema_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "schema"
+    _write(directory / "fields" / "timestamp.json", {"type": "string", "format": "date-time"})
+    _write(
+        directory / "fields" / "audit.json",
+        {"type": "object", "properties": {"at": {"$ref": "./timestamp.json"}}},
+    )
+    _write(directory / "fields" / "tag.json", {"type": "string"})
+    _write(
+        directory / "item_base.json",
+        {
+            "type": "object",
+            "properties": {
+                "audit": {"$ref": "./fields/audit.json"},
+                "tags": {"type": "array", "items": {"$ref": "./fields/tag.json#/"}},
+                "self": {"$ref": "#/properties/audit"},
+            },
+        },
+    )
+    _write(
+        directory / "relations" / "link.json",
+        {"allOf": [{"$ref": "../fields/tag.json"}, {"$ref": "https://example.com/remote.json"}]},
+    )
+    return directory
+
+
+def test_extract_refs_resolves_relative_to_document() -> None:
+    document = {
+        "properties": {
+            "a": {"$ref": "./timestamp.json"},
+            "b": {"anyOf": [{"$ref": "../relations/link.json#/definitions/x"}]},
+            "c": {"$ref": "#/definitions/local"},
+            "d": {"$ref": "https://example.com/schema.json"},
+        }
+    }
+
+    assert extract_refs(document, "fields/task.json") == {"fields/timestamp.json", "relations/link.json"}
+
+
+def test_graph_tracks_transitive_dependents_in_rebuild_order() -> None:
+    graph = SchemaDependencyGraph()
+    graph.update("base.json", ["audit.json", "tag.json"])
+    graph.update("audit.json", ["timestamp.json"])
+    graph.update("timestamp.json", [])
+    graph.update("tag.json", [])
+
+    assert graph.dependents("timestamp.json") == ("audit.json", "base.json")
+    assert graph.dependents("timestamp.json", transitive=False) == ("audit.json",)
+    assert graph.references("base.json", transitive=True) == ("audit.json", "tag.json", "timestamp.json")
+    assert graph.affected_by(["timestamp.json"]) == ("timestamp.json", "audit.json", "base.json")
+    assert graph.affected_by(["tag.json"]) == ("tag.json", "base.json")
+
+    graph.update("base.json", ["tag.json"])
+    assert graph.dependents("timestamp.json") == ("audit.json",)
+
+
+def test_graph_tolerates_cycles_and_reports_unresolved() -> None:
+    graph = SchemaDependencyGraph()
+    graph.update("a.json", ["b.json"])
+    graph.update("b.json", ["a.json", "missing.json"])
+
+    assert set(graph.affected_by(["a.json"])) == {"a.json", "b.json"}
+    assert graph.unresolved() == {"b.json": ("missing.json",)}
+
+
+def test_loader_invalidates_exact_dependents(schema_dir: Path, tmp_path: Path, caplog) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), tmp_path / "manifest")
+    received: list = []
+    loader.subscribe_invalidations(received.append)
+
+    first = loader.load()
+    assert sorted(first.invalidated) == sorted(first.loaded)
+    assert loader.graph.references("relations/link.json") == ("fields/tag.json",)
+    assert loader.graph.unresolved() == {}
+
+    _write(schema_dir / "fields" / "timestamp.json", {"type": "string"})
+    second = loader.load(verify=True)
+
+    assert second.loaded == ["fields/timestamp.json"]
+    assert second.invalidated == ["fields/timestamp.json", "fields/audit.json", "item_base.json"]
+    assert received[-1] == tuple(second.invalidated)
+
+    assert loader.load(verify=True).invalidated == []
+    assert len(received) == 2
+
+
+def test_loader_invalidates_dependents_of_removed_and_added_files(schema_dir: Path, tmp_path: Path) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), tmp_path / "manifest")
+    loader.load()
+
+    (schema_dir / "fields" / "tag.json").unlink()
+    removed = loader.load()
+    assert removed.removed == ["fields/tag.json"]
+    assert sorted(removed.invalidated) == ["fields/tag.json", "item_base.json", "relations/link.json"]
+    assert loader.graph.unresolved() == {
+        "item_base.json": ("fields/tag.json",),
+        "relations/link.json": ("fields/tag.json",),
+    }
+
+    _write(schema_dir / "fields" / "tag.json", {"type": "string"})
+    added = loader.load()
+    assert sorted(added.invalidated) == ["fields/tag.json", "item_base.json", "relations/link.json"]
+    assert loader.graph.unresolved() == {}
+
+
+def test_fresh_loader_rebuilds_graph_from_registry(schema_dir: Path, tmp_path: Path) -> None:
+    registry = TypeRegistry()
+    SchemaLoader(schema_dir, registry, tmp_path / "manifest").load()
+
+    loader = SchemaLoader(schema_dir, registry, tmp_path / "manifest")
+    report = loader.load()
+
+    assert report.loaded == [] and report.invalidated == []
+    assert loader.graph.dependents("fields/timestamp.json") == ("fields/audit.json", "item_base.json")
+
+
+def test_repository_schema_refs_all_resolve(tmp_path: Path) -> None:
+    loader = SchemaLoader(SCHEMA_ROOT, TypeRegistry(), tmp_path / "manifest", parsed_cache=False)
+    loader.load()
+
+    assert loader.graph.unresolved() == {}
+    assert "item_base.json" in loader.graph.dependents("fields/timestamp.json")
+
+
+def test_graph_checksum_follows_transitive_references(schema_dir: Path, tmp_path: Path) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), tmp_path / "manifest")
+    loader.load()
+    base = loader.graph_checksum("item_base.json")
+    link = loader.graph_checksum("relations/link.json")
+
+    _write(schema_dir / "fields" / "timestamp.json", {"type": "integer"})
+    loader.load(verify=True)
+    assert loader.graph_checksum("item_base.json") != base
+    assert loader.graph_checksum("relations/link.json") == link
+
+    with pytest.raises(KeyError):
+        loader.graph_checksum("missing.json")
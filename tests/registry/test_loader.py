@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -98,3 +99,208 @@ def test_loader_tracks_changes(schema_dir: Path, manifest_dir: Path, caplog) ->
         "type": "object",
         "additionalProperties": False,
     }
+
+
+def test_failed_validation_rolls_back_registry_and_manifest(schema_dir: Path, manifest_dir: Path) -> None:
+    registry = TypeRegistry()
+    loader = SchemaLoader(schema_dir, registry, manifest_dir)
+    loader.load()
+    manifest = loader.manifest_path.read_bytes()
+
+    (schema_dir / "example.json").write_text(json.dumps({"title": "Broken"}), encoding="utf-8")
+    (schema_dir / "nested" / "other.json").unlink()
+    (schema_dir / "added.json").write_text(json.dumps({"title": "Added"}), encoding="utf-8")
+
+    def _reject(report) -> None:
+        raise ValueError("rejected")
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="rejected"):
+            loader.load(validate=_reject)
+        assert registry.get("example.json") == {"title": "Example", "type": "object"}
+        assert registry.get("nested/other.json") == {"title": "Nested", "type": "object"}
+        assert "added.json" not in registry
+        assert loader.manifest_path.read_bytes() == manifest
+
+    report = loader.load()
+    assert report.loaded == ["added.json", "example.json"]
+    assert report.removed == ["nested/other.json"]
+
+
+def test_reload_ignores_manifest_rewritten_by_another_loader(schema_dir: Path, manifest_dir: Path) -> None:
+    registry = TypeRegistry()
+    loader = SchemaLoader(schema_dir, registry, manifest_dir)
+    loader.load()
+
+    (schema_dir / "example.json").write_text(json.dumps({"title": "Edited"}), encoding="utf-8")
+    (schema_dir / "nested" / "other.json").unlink()
+    # Another process sharing the manifest directory records the edit first.
+    SchemaLoader(schema_dir, TypeRegistry(), manifest_dir).load()
+
+    report = loader.load()
+
+    assert report.loaded == ["example.json"]
+    assert report.removed == ["nested/other.json"]
+    assert registry.get("example.json") == {"title": "Edited"}
+    assert "nested/other.json" not in registry
+
+
+def test_parallel_load_matches_serial_order(tmp_path: Path) -> None:
+    schema_root = tmp_path / "many"
+    for index in range(40):
+        directory = schema_root / f"group{index % 4}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"schema{index:02d}.json").write_text(
+            json.dumps({"title": f"Schema {index}", "type": "object"}),
+            encoding="utf-8",
+        )
+
+    serial = SchemaLoader(schema_root, TypeRegistry(), tmp_path / "serial", max_workers=1).load()
+    parallel_registry = TypeRegistry()
+    parallel_loader = SchemaLoader(schema_root, parallel_registry, tmp_path / "parallel", max_workers=8)
+    parallel = parallel_loader.load()
+
+    assert parallel.loaded == serial.loaded
+    assert parallel.loaded == sorted(parallel.loaded)
+    assert parallel_registry.get("group1/schema05.json") == {"title": "Schema 5", "type": "object"}
+
+    (schema_root / "group2" / "schema06.json").write_text(json.dumps({"title": "Changed"}), encoding="utf-8")
+    report = parallel_loader.load()
+    assert report.loaded == ["group2/schema06.json"]
+    assert len(report.unchanged) == 39
+
+
+def test_parallel_load_raises_first_invalid_file(tmp_path: Path) -> None:
+    schema_root = tmp_path / "broken"
+    schema_root.mkdir()
+    for name in ("a.json", "c.json"):
+        (schema_root / name).write_text("{}", encoding="utf-8")
+    (schema_root / "b.json").write_text("{not json", encoding="utf-8")
+
+    loader = SchemaLoader(schema_root, TypeRegistry(), tmp_path / "var", max_workers=4)
+    with pytest.raises(ValueError):
+        loader.load()
+    assert not loader.manifest_path.exists()
+
+
+def test_loader_rejects_invalid_worker_count(schema_dir: Path, manifest_dir: Path) -> None:
+    with pytest.raises(ValueError):
+        SchemaLoader(schema_dir, TypeRegistry(), manifest_dir, max_workers=0)
+
+
+def _count_reads(monkeypatch) -> list:
+    reads: list = []
+    original = SchemaLoader._read_bytes
+
+    def _recording(path: Path) -> bytes:
+        reads.append(Path(path).name)
+        return original(path)
+
+    monkeypatch.setattr(SchemaLoader, "_read_bytes", staticmethod(_recording))
+    return reads
+
+
+def _age_manifest(loader: SchemaLoader) -> None:
+    # Push the manifest's mtime past the schema files so their stat is trusted.
+    stat = loader.manifest_path.stat()
+    os.utime(loader.manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+def test_warm_load_skips_hashing_when_stat_matches(schema_dir: Path, manifest_dir: Path, monkeypatch) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), manifest_dir)
+    loader.load()
+    manifest = json.loads(loader.manifest_path.read_text(encoding="utf-8"))
+    entry = manifest["schemas"]["example.json"]
+    assert {"checksum", "size", "mtime_ns", "inode"} <= set(entry)
+    _age_manifest(loader)
+
+    reads = _count_reads(monkeypatch)
+    report = loader.load()
+    assert sorted(report.unchanged) == ["example.json", "nested/other.json"]
+    assert reads == []
+
+    report = loader.load(verify=True)
+    assert sorted(reads) == ["example.json", "other.json"]
+    assert report.loaded == []
+
+
+def test_stat_mismatch_falls_back_to_hash(schema_dir: Path, manifest_dir: Path, monkeypatch) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), manifest_dir)
+    loader.load()
+    _age_manifest(loader)
+
+    target = schema_dir / "example.json"
+    stat = target.stat()
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1_000_000_000))
+    reads = _count_reads(monkeypatch)
+    report = loader.load()
+    assert reads == ["example.json"]
+    assert sorted(report.unchanged) == ["example.json", "nested/other.json"]
+
+
+def test_racily_clean_files_are_hashed(schema_dir: Path, manifest_dir: Path, monkeypatch) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), manifest_dir)
+    loader.load()
+    stat = loader.manifest_path.stat()
+    target = schema_dir / "example.json"
+    # Same size and a timestamp equal to the manifest's: stat cannot prove it is unchanged.
+    target.write_text(json.dumps({"title": "Exampl3", "type": "object"}), encoding="utf-8")
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    manifest = json.loads(loader.manifest_path.read_text(encoding="utf-8"))
+    manifest["schemas"]["example.json"]["mtime_ns"] = stat.st_mtime_ns
+    manifest["schemas"]["example.json"]["inode"] = target.stat().st_ino
+    loader.manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    os.utime(loader.manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    report = loader.load()
+    assert report.loaded == ["example.json"]
+
+
+def test_cold_loader_populates_registry_from_parsed_cache(
+    schema_dir: Path, manifest_dir: Path, monkeypatch, caplog
+) -> None:
+    SchemaLoader(schema_dir, TypeRegistry(), manifest_dir).load()
+    assert list((manifest_dir / "parsed").rglob("*.json.marshal"))
+    _age_manifest(SchemaLoader(schema_dir, TypeRegistry(), manifest_dir))
+
+    reads = _count_reads(monkeypatch)
+    monkeypatch.setattr(SchemaLoader, "_parse_schema", lambda self, path, content: pytest.fail("parsed"))
+    registry = TypeRegistry()
+    caplog.set_level(logging.INFO, logger="kernel")
+    report = SchemaLoader(schema_dir, registry, manifest_dir).load()
+
+    assert reads == []
+    assert sorted(report.loaded) == ["example.json", "nested/other.json"]
+    assert registry.get("nested/other.json") == {"title": "Nested", "type": "object"}
+    complete = [
+        json.loads(record.message)
+        for record in caplog.records
+        if record.name == "kernel" and "registry.schema.load_complete" in record.message
+    ]
+    assert complete[-1]["cache_hits"] == 2
+
+
+def test_parsed_cache_ignores_corrupt_entries(schema_dir: Path, manifest_dir: Path) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), manifest_dir)
+    loader.load()
+    for entry in (manifest_dir / "parsed").rglob("*.marshal"):
+        entry.write_bytes(b"not marshal")
+
+    registry = TypeRegistry()
+    SchemaLoader(schema_dir, registry, manifest_dir).load()
+    assert registry.get("example.json") == {"title": "Example", "type": "object"}
+
+
+def test_parsed_cache_can_be_disabled(schema_dir: Path, manifest_dir: Path) -> None:
+    SchemaLoader(schema_dir, TypeRegistry(), manifest_dir, parsed_cache=False).load()
+    assert not (manifest_dir / "parsed").exists()
+
+
+def test_parsed_cache_skips_unmarshallable_payloads(tmp_path: Path) -> None:
+    from kernel.registry import ParsedSchemaCache
+
+    cache = ParsedSchemaCache(tmp_path / "parsed")
+    assert cache.put("ab" * 32, "yaml", {"created": object()}) is False
+    assert cache.get("ab" * 32, "yaml") is None
+    assert cache.put("cd" * 32, "yaml", {"required": ["id"]}) is True
+    assert cache.get("cd" * 32, "yaml") == {"required": ["id"]}
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import shutil
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+import kernel.capabilities as capabilities
+import kernel.derived.evaluator as evaluator_module
+import kernel.registry.snapshot as snapshot_module
+import kernel.types.base as types_base
+from kernel.derived import DerivedEvaluator
+from kernel.registry import SchemaLoader, TypeRegistry, build_snapshot, current_snapshot, read_snapshot
+
+SCHEMA_ROOT = Path(__file__).resolve().parents[2] / "schema"
+
+
+@pytest.fixture()
+def schema_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    for name in ("capabilities", "types", "derived"):
+        shutil.copytree(SCHEMA_ROOT / name, tmp_path / name)
+    monkeypatch.setenv("KERNEL_CAPABILITY_SCHEMA_DIR", str(tmp_path / "capabilities"))
+    monkeypatch.setenv("KERNEL_REGISTRY_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("KERNEL_REGISTRY_SNAPSHOT", raising=False)
+    monkeypatch.setattr(types_base, "_schema_root", lambda: tmp_path / "types")
+    monkeypatch.setattr(evaluator_module, "_default_schema_root", lambda: tmp_path / "derived")
+    monkeypatch.setattr(snapshot_module, "_current", {})
+    _reset_registries(monkeypatch)
+    return tmp_path
+
+
+def _reset_registries(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Isolate the process-wide registries; monkeypatch restores the originals.
+    for module, names in (
+        (capabilities, ("_capabilities_by_key", "_capability_sources")),
+        (types_base, ("_manifests_by_type", "_type_sources")),
+    ):
+        monkeypatch.setattr(module, "_registry", TypeRegistry())
+        monkeypatch.setattr(module, "_bootstrapped", False)
+        for name in names:
+            monkeypatch.setattr(module, name, {})
+
+
+def test_build_and_read_snapshot(schema_copy: Path) -> None:
+    built = build_snapshot()
+    snapshot = read_snapshot()
+
+    assert snapshot is not None
+    assert snapshot.to_summary() == built.to_summary()
+    assert {entry["type_key"] for entry in snapshot.types} >= {"task", "wiki_entry"}
+    assert snapshot.derived_sources["task.yaml"] == "task"
+    assert snapshot.is_current()
+
+
+def test_bootstrap_uses_current_snapshot(schema_copy: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    build_snapshot()
+    expected_task = types_base.get_manifest("task")
+    expected_capability = capabilities.get_capability("webcomic.library")
+    expected_plan = DerivedEvaluator(use_snapshot=False).definition_for("task")
+
+    _reset_registries(monkeypatch)
+    monkeypatch.setattr(SchemaLoader, "load", lambda self, **kwargs: pytest.fail("loader used"))
+    monkeypatch.setattr(evaluator_module, "_load_yaml", lambda path: pytest.fail("definition parsed"))
+
+    assert types_base.get_manifest("task") == expected_task
+    assert capabilities.get_capability("webcomic.library") == expected_capability
+    evaluator = DerivedEvaluator()
+    assert evaluator.definition_for("task") == expected_plan
+    result = evaluator.evaluate_item({"item_type": "task", "fields": {"checklist": [{"checked": True}]}})
+    assert result.values["completion_ratio"] == 1.0
+
+
+def test_stale_snapshot_is_ignored(schema_copy: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    build_snapshot()
+    task = schema_copy / "types" / "task.yaml"
+    task.write_text(task.read_text(encoding="utf-8").replace("  - manage\n", ""), encoding="utf-8")
+
+    monkeypatch.setattr(snapshot_module, "_current", {})
+    _reset_registries(monkeypatch)
+    assert current_snapshot() is None
+    assert "manage" not in types_base.get_manifest("task").capabilities
+
+
+def test_snapshot_from_other_field_layout_is_rebuilt(schema_copy: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    built = build_snapshot()
+    expected_task = types_base.get_manifest("task")
+    expected_plan = DerivedEvaluator(use_snapshot=False).definition_for("task")
+    # Simulate a snapshot written by a version with an extra definition field.
+    snapshot_module._write(
+        snapshot_module.default_snapshot_path(),
+        replace(
+            built,
+            capabilities=tuple({**fields, "retired": False} for fields in built.capabilities),
+            types=tuple({**fields, "retired": False} for fields in built.types),
+            derived=tuple(
+                {**fields, "metrics": [{**metric, "unit": None} for metric in fields["metrics"]]}
+                for fields in built.derived
+            ),
+        ),
+    )
+
+    monkeypatch.setattr(snapshot_module, "_current", {})
+    _reset_registries(monkeypatch)
+    assert current_snapshot() is not None
+    assert types_base.get_manifest("task") == expected_task
+    assert DerivedEvaluator().definition_for("task") == expected_plan
+
+
+def test_corrupt_snapshot_is_rejected(schema_copy: Path) -> None:
+    build_snapshot()
+    path = snapshot_module.default_snapshot_path()
+    content = bytearray(path.read_bytes())
+    content[-1] ^= 0xFF
+    path.write_bytes(bytes(content))
+
+    assert read_snapshot() is None
+    assert snapshot_module.main(["verify"]) == 1
+
+
+def test_snapshot_cli_build_and_verify(schema_copy: Path, capsys) -> None:
+    output = schema_copy / "out" / "kernel.snapshot"
+    assert snapshot_module.main(["build", "--output", str(output)]) == 0
+    assert output.exists()
+    assert snapshot_module.main(["verify", "--path", str(output)]) == 0
+    assert '"current": true' in capsys.readouterr().out
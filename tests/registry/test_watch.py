@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+import kernel.capabilities as capabilities
+import kernel.types.base as types_base
+from kernel.derived import DerivedEvaluator
+from kernel.registry import SchemaLoader, SchemaWatcher, TypeRegistry, watch_schemas
+
+CAPABILITY = (
+    "key: example.timeline\n"
+    "version: {version}\n"
+    "summary: Example timeline capability\n"
+    "dependencies:\n"
+    "  - read\n"
+)
+
+
+@pytest.fixture()
+def schema_tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    for name in ("capabilities", "types", "derived"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "capabilities" / "example.timeline.yaml").write_text(
+        CAPABILITY.format(version="1.0.0"), encoding="utf-8"
+    )
+    (tmp_path / "types" / "example.yaml").write_text(
+        "type: example\nschema: item_base.json\ncapabilities:\n  - read\n", encoding="utf-8"
+    )
+
+    monkeypatch.setenv("KERNEL_CAPABILITY_SCHEMA_DIR", str(tmp_path / "capabilities"))
+    monkeypatch.setenv("KERNEL_REGISTRY_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(types_base, "_schema_root", lambda: tmp_path / "types")
+    # Isolate the process-wide registries; monkeypatch restores the originals.
+    for module, names in (
+        (capabilities, ("_capabilities_by_key", "_capability_sources")),
+        (types_base, ("_manifests_by_type", "_type_sources")),
+    ):
+        monkeypatch.setattr(module, "_registry", TypeRegistry())
+        monkeypatch.setattr(module, "_bootstrapped", False)
+        for name in names:
+            monkeypatch.setattr(module, name, {})
+    types_base.bootstrap_types()
+    return tmp_path
+
+
+def _events(caplog, name: str) -> list:
+    return [
+        payload
+        for payload in (json.loads(record.message) for record in caplog.records if record.name == "kernel")
+        if payload.get("event") == name
+    ]
+
+
+def _derived_definition(metric_key: str) -> str:
+    metric = {
+        "key": metric_key,
+        "description": "Number of tags on the item.",
+        "operation": "length",
+        "config": {"path": "fields.tags"},
+    }
+    return json.dumps({"type": "example", "metrics": [metric]})
+
+
+def test_watcher_reports_added_modified_and_removed_files(tmp_path: Path) -> None:
+    (tmp_path / "a.yaml").write_text("a: 1\n", encoding="utf-8")
+    (tmp_path / "b.yaml").write_text("b: 1\n", encoding="utf-8")
+    watcher = SchemaWatcher({"root": tmp_path})
+    seen = []
+    watcher.subscribe(seen.append)
+
+    assert watcher.poll() == []
+    (tmp_path / "a.yaml").write_text("a: 22\n", encoding="utf-8")
+    (tmp_path / "b.yaml").unlink()
+    (tmp_path / "c.yaml").write_text("c: 1\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    (change,) = watcher.poll()
+    assert (change.added, change.modified, change.removed) == (("c.yaml",), ("a.yaml",), ("b.yaml",))
+    assert seen == [[change]]
+    assert watcher.poll() == []
+
+
+def test_capability_and_type_edits_apply_in_place(schema_tree: Path, caplog) -> None:
+    watcher = watch_schemas(start=False)
+    untouched = types_base.get_manifest("example")
+    caplog.set_level(logging.INFO, logger="kernel")
+
+    (schema_tree / "capabilities" / "example.timeline.yaml").write_text(
+        CAPABILITY.format(version="1.1.0"), encoding="utf-8"
+    )
+    (schema_tree / "types" / "other.yaml").write_text(
+        "type: other\nschema: item_base.json\ncapabilities:\n  - read\n  - example.timeline\n",
+        encoding="utf-8",
+    )
+    watcher.poll()
+
+    assert capabilities.get_capability("example.timeline").version == "1.1.0"
+    assert types_base.get_manifest("other").capabilities == ("read", "example.timeline")
+    assert types_base.get_manifest("example") is untouched
+    (event,) = _events(caplog, "registry.schema.changed")
+    assert event["applied"]["types"]["loaded"] == ["other.yaml"]
+    assert event["applied"]["types"]["unchanged"] == ["example.yaml"]
+
+    (schema_tree / "types" / "other.yaml").unlink()
+    watcher.poll()
+    assert "other" not in types_base.list_registered_types()
+
+
+def test_invalid_edit_keeps_previous_definitions(schema_tree: Path, caplog) -> None:
+    watcher = watch_schemas(start=False)
+    caplog.set_level(logging.INFO, logger="kernel")
+
+    (schema_tree / "types" / "example.yaml").write_text(
+        "type: example\nschema: item_base.json\ncapabilities:\n  - missing.capability\n", encoding="utf-8"
+    )
+    watcher.poll()
+
+    assert types_base.get_manifest("example").capabilities == ("read",)
+    (failure,) = _events(caplog, "registry.schema.reload_failed")
+    assert "unknown capability" in failure["error"]
+    assert _events(caplog, "registry.schema.changed") == []
+
+
+def test_rejected_reload_is_reported_again(schema_tree: Path) -> None:
+    capability = schema_tree / "capabilities" / "example.timeline.yaml"
+    capability.write_text(CAPABILITY.format(version="not-semver"), encoding="utf-8")
+    manifest = schema_tree / "types" / "example.yaml"
+    manifest.write_text("type: example\nschema: item_base.json\ncapabilities:\n  - missing.capability\n")
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="semantic version"):
+            capabilities.reload_capabilities()
+        with pytest.raises(ValueError, match="unknown capability"):
+            types_base.reload_types()
+    assert capabilities.get_capability("example.timeline").version == "1.0.0"
+    assert types_base.get_manifest("example").capabilities == ("read",)
+
+    capability.write_text(CAPABILITY.format(version="1.2.0"), encoding="utf-8")
+    assert capabilities.reload_capabilities().loaded == ["example.timeline.yaml"]
+    with pytest.raises(ValueError, match="unknown capability"):
+        types_base.reload_types()
+
+
+def test_reload_applies_edits_another_process_recorded_first(schema_tree: Path) -> None:
+    manifest = schema_tree / "types" / "example.yaml"
+    manifest.write_text("type: example\nschema: item_other.json\ncapabilities:\n  - read\n")
+    # A process that boots after the edit rewrites the shared manifest.
+    SchemaLoader(schema_tree / "types", TypeRegistry(), schema_tree / "cache", manifest_name="types.json").load()
+
+    assert types_base.reload_types().loaded == ["example.yaml"]
+    assert types_base.get_manifest("example").schema_ref == "item_other.json"
+
+
+def test_derived_definitions_reload_for_watched_evaluators(schema_tree: Path) -> None:
+    derived_root = schema_tree / "derived"
+    definition = derived_root / "example.yaml"
+    definition.write_text(_derived_definition("tags"), encoding="utf-8")
+    evaluator = DerivedEvaluator(schema_root=derived_root)
+    watcher = watch_schemas(evaluators=[evaluator], start=False)
+    plan = evaluator.plan_for("example")
+
+    definition.write_text(_derived_definition("tag_count"), encoding="utf-8")
+    watcher.poll()
+    assert [metric.key for metric in evaluator.plan_for("example").metrics] == ["tag_count"]
+    assert evaluator.plan_for("example") is not plan
+
+    definition.unlink()
+    watcher.poll()
+    assert evaluator.list_types() == ()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kernel.storage import ItemIndex, ItemStore
+from kernel.storage.index import default_index_path, main
+
+FIXTURE_DIR = Path(__file__).resolve().parents[1] / "fixtures" / "items"
+
+
+def _item(
+    item_id: str,
+    *,
+    item_type: str = "task",
+    realm: str = "personal",
+    sensitivity: str = "personal",
+    owner: str = "user_1",
+    tags: list | None = None,
+    metadata: dict | None = None,
+    updated_at: str = "2025-01-01T00:00:00Z",
+) -> dict:
+    return {
+        "id": item_id,
+        "item_type": item_type,
+        "realm": {"id": realm},
+        "sensitivity": {"classification": sensitivity},
+        "owner": {"id": owner, "display_name": owner},
+        "created_at": "2024-06-01T00:00:00Z",
+        "updated_at": updated_at,
+        "fields": {"tags": tags or []},
+        "metadata": metadata or {},
+    }
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> ItemIndex:
+    with ItemIndex(tmp_path / "items.sqlite3") as opened:
+        opened.rebuild(
+            [
+                _item("task_1", tags=["finance", "urgent"], metadata={"sys.priority": "p1", "cap.x.y": 1}),
+                _item("task_2", realm="family", tags=["finance"], updated_at="2025-03-01T12:00:00+02:00"),
+                _item("doc_1", item_type="document", sensitivity="private", owner="user_2", tags=["urgent"]),
+                _item("doc_2", item_type="document", realm="family", metadata={"ext.jira.key": "DATA-42"}),
+            ]
+        )
+        yield opened
+
+
+@pytest.mark.parametrize("selective_rows", [1, 1000])
+def test_query_filters_combine(index: ItemIndex, monkeypatch, selective_rows: int) -> None:
+    # A threshold of 1 turns every tag and metadata set into a per-row check.
+    monkeypatch.setattr("kernel.storage.index._SELECTIVE_ROWS", selective_rows)
+    assert index.query(item_type="task") == ["task_1", "task_2"]
+    assert index.query(realm=["family", "work"]) == ["doc_2", "task_2"]
+    assert index.query(tags=["finance", "urgent"]) == ["task_1"]
+    assert index.query(item_type="document", tags=["urgent"], owner="user_2") == ["doc_1"]
+    assert index.query(metadata={"sys.priority": "p1"}) == ["task_1"]
+    assert index.query(metadata={"ext.jira.key": "DATA-42"}, sensitivity="personal") == ["doc_2"]
+    assert index.query(updated_after="2025-03-01T10:00:00Z") == ["task_2"]
+    assert index.query(updated_before="2025-03-01T10:00:00Z", limit=2) == ["doc_1", "doc_2"]
+    assert index.query(order_by="updated_at", descending=True, limit=1) == ["task_2"]
+    assert index.count(item_type="document", realm="family") == 1
+    with pytest.raises(ValueError):
+        index.query(metadata={"cap.x.y": 1})
+    with pytest.raises(ValueError):
+        index.query(order_by="title")
+
+
+def test_facets_use_totals_or_filters(index: ItemIndex) -> None:
+    assert index.facets("item_type") == {"document": 2, "task": 2}
+    assert index.facets("tags") == {"finance": 2, "urgent": 2}
+    assert index.facets("realm", item_type="task") == {"family": 1, "personal": 1}
+    assert index.facets("tags", realm="personal") == {"urgent": 2, "finance": 1}
+
+    index.update(_item("task_1", realm="family", tags=["home"]))
+    index.remove("doc_1")
+    assert index.facets("tags") == {"finance": 1, "home": 1}
+    assert index.facets("realm") == {"family": 3}
+    assert len(index) == 3
+
+
+def test_attached_index_follows_store_writes(tmp_path: Path) -> None:
+    store = ItemStore(tmp_path / "data", durable=False)
+    index = ItemIndex(tmp_path / "items.sqlite3").attach(store)
+    store.put_many([_item(f"task_{number}", tags=["bulk"]) for number in range(10)])
+    store.put(_item("task_3", realm="family", tags=["moved"]))
+    store.delete("task_4")
+
+    assert index.count(tags=["bulk"]) == 8
+    assert index.query(realm="family") == ["task_3"]
+    assert "task_4" not in index.query()
+    index.close()
+
+    # Reopening keeps the data; changing the indexed namespaces resets it.
+    with ItemIndex(tmp_path / "items.sqlite3") as reopened:
+        assert len(reopened) == 9
+    with ItemIndex(tmp_path / "items.sqlite3", metadata_namespaces=["sys"]) as reset:
+        assert len(reset) == 0
+
+
+def test_cli_rebuilds_from_store_and_queries(tmp_path: Path, capsys) -> None:
+    root = tmp_path / "data"
+    items = [json.loads(path.read_text(encoding="utf-8")) for path in FIXTURE_DIR.glob("*.json")]
+    ItemStore(root, durable=False).put_many(items)
+    database = str(tmp_path / "items.sqlite3")
+
+    assert main(["rebuild", "--root", str(root), "--db", database]) == 0
+    assert json.loads(capsys.readouterr().out)["items"] == len(items)
+
+    assert main(["query", "--db", database, "--type", "task", "--meta", "ext.jira.key=DATA-42"]) == 0
+    assert json.loads(capsys.readouterr().out)["items"] == ["task_456789"]
+    assert main(["query", "--db", database, "--facet", "realm"]) == 0
+    assert json.loads(capsys.readouterr().out)["facets"]
+
+
+def test_default_index_path_ignores_working_directory(tmp_path: Path, monkeypatch, capsys) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("KERNEL_INDEX_PATH", raising=False)
+    assert default_index_path() == Path(__file__).resolve().parents[2] / "var" / "index" / "items.sqlite3"
+
+    monkeypatch.setenv("KERNEL_INDEX_PATH", str(tmp_path / "shared" / "items.sqlite3"))
+    ItemStore(tmp_path / "data", durable=False).put(_item("task_1"))
+    assert main(["rebuild", "--root", str(tmp_path / "data")]) == 0
+    assert json.loads(capsys.readouterr().out)["items"] == 1
+    with ItemIndex() as opened:
+        assert opened.path == tmp_path / "shared" / "items.sqlite3" and len(opened) == 1
+    assert not (tmp_path / "var").exists()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from kernel.storage import ItemStore, encode_item
+from kernel.storage.store import main
+
+FIXTURE_DIR = Path(__file__).resolve().parents[1] / "fixtures" / "items"
+
+
+def _item(item_id: str, *, realm: str = "personal", created_at: str = "2024-03-01T00:00:00Z", **extra: object) -> dict:
+    return {"id": item_id, "item_type": "task", "realm": {"id": realm}, "created_at": created_at, **extra}
+
+
+def test_put_writes_blueprint_layout_and_manifest(tmp_path: Path) -> None:
+    store = ItemStore(tmp_path / "data")
+    manifest = store.put(_item("task_1", title="Write tests"))
+
+    directory = tmp_path / "data" / "personal" / "task" / "2024" / "task_1"
+    assert store.path_for(_item("task_1")) == directory
+    assert sorted(path.name for path in directory.iterdir()) == ["item.json", "manifest.json"]
+    recorded = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    assert recorded["sha256"] == manifest.sha256
+    assert recorded["size"] == len(encode_item(_item("task_1", title="Write tests")))
+    assert store.get("task_1", verify=True)["title"] == "Write tests"
+
+    # A fresh instance finds the item through its manifest.
+    reopened = ItemStore(tmp_path / "data")
+    assert "task_1" in reopened and len(reopened) == 1
+    assert reopened.manifest("task_1") == manifest
+
+
+def test_unchanged_items_are_not_rewritten_and_moves_keep_attachments(tmp_path: Path) -> None:
+    store = ItemStore(tmp_path / "data", durable=False)
+    first = store.put(_item("task_1"))
+    assert store.put(_item("task_1")) is first
+
+    old_dir = store.path_for(_item("task_1"))
+    (old_dir / "attachments" / "a1").mkdir(parents=True)
+    (old_dir / "attachments" / "a1" / "payload.txt").write_text("hello", encoding="utf-8")
+
+    moved = store.put(_item("task_1", realm="family", created_at="2023-12-31T23:00:00Z"))
+    new_dir = tmp_path / "data" / "family" / "task" / "2023" / "task_1"
+    assert moved.relative_dir == Path("family", "task", "2023", "task_1")
+    assert (new_dir / "attachments" / "a1" / "payload.txt").read_text(encoding="utf-8") == "hello"
+    assert not (tmp_path / "data" / "personal").exists()
+
+    store.delete("task_1")
+    assert "task_1" not in store
+    assert list((tmp_path / "data").iterdir()) == []
+    with pytest.raises(KeyError):
+        store.get("task_1")
+
+
+def test_rejects_unsafe_path_components(tmp_path: Path) -> None:
+    store = ItemStore(tmp_path / "data")
+    with pytest.raises(ValueError):
+        store.put(_item("../escape"))
+    with pytest.raises(ValueError):
+        store.put({"id": "x", "item_type": "task"})
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_bulk_put_get_and_verify(tmp_path: Path, workers: int) -> None:
+    store = ItemStore(tmp_path / "data", durable=False, workers=workers)
+    items = [_item(f"task_{index}", created_at=f"20{10 + index % 5}-01-01") for index in range(20)]
+
+    report = store.put_many(items)
+    assert (report.items, report.written, report.unchanged) == (20, 20, 0)
+    assert report.bytes > 0
+    assert store.put_many(items[:5]).unchanged == 5
+
+    fetched = store.get_many(["task_3", "missing", "task_0"])
+    assert list(fetched) == ["task_3", "task_0"]
+    assert fetched["task_3"] == items[3]
+    assert [item["id"] for item in store.iter_items()] == sorted(item["id"] for item in items)
+
+    assert store.verify() == []
+    path = store.path_for(items[7]) / "item.json"
+    path.write_text(path.read_text(encoding="utf-8").replace("task", "tusk"), encoding="utf-8")
+    assert [problem["item_id"] for problem in store.verify()] == ["task_7"]
+    with pytest.raises(ValueError):
+        store.get("task_7", verify=True)
+
+
+def test_cli_imports_fixtures_and_verifies(tmp_path: Path, capsys) -> None:
+    root = tmp_path / "data"
+    assert main(["import", "--root", str(root), "--source", str(FIXTURE_DIR), "--no-fsync"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["items"] == summary["written"] == len(list(FIXTURE_DIR.glob("*.json")))
+
+    assert main(["verify", "--root", str(root)]) == 0
+    assert json.loads(capsys.readouterr().out)["problems"] == []
+    assert (root / "eng-data" / "task" / "2024" / "task_456789" / "item.json").exists()
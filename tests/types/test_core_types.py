@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
@@ -210,3 +213,30 @@ def test_bootstrap_rejects_missing_capability_dependencies(
 
     with pytest.raises(ValueError, match="missing capability dependencies"):
         bootstrap_types(force=True)
+
+
+def test_import_does_not_bootstrap_registries(tmp_path: Path) -> None:
+    probe = (
+        "import sys\n"
+        f"sys.path.insert(0, {str(Path(__file__).resolve().parents[2] / 'src')!r})\n"
+        "import kernel.types\n"
+        "import kernel.types.base as base\n"
+        "import kernel.capabilities as capabilities\n"
+        "assert not base._bootstrapped and not capabilities._bootstrapped\n"
+        "assert 'yaml' not in sys.modules\n"
+        "from kernel.types.task import TYPE_KEY\n"
+        "assert TYPE_KEY == 'task' and base._bootstrapped\n"
+        "assert 'TYPE_KEY' in vars(sys.modules['kernel.types.task'])\n"
+    )
+    env = {**os.environ, "KERNEL_REGISTRY_CACHE_DIR": str(tmp_path / "cache")}
+    subprocess.run([sys.executable, "-c", probe], check=True, env=env)
+
+
+def test_lazy_module_constants_resolve_from_manifests() -> None:
+    from kernel.types import finance, wiki_entry
+
+    assert wiki_entry.TYPE_KEY == "wiki_entry"
+    assert finance.ACCOUNT_STATEMENT_SCHEMA_REF == AccountStatementType.schema_ref()
+    assert finance.FINANCIAL_ACCOUNT_CAPABILITIES == FinancialAccountType.capabilities()
+    with pytest.raises(AttributeError):
+        finance.NOT_A_CONSTANT
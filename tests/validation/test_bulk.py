@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import kernel.validation.bulk as bulk_module
+from kernel.validation.bulk import DEFAULT_SCHEMA_PATH, iter_jsonl, iter_sources, validate_bulk, validator_engine
+from kernel.validation.cache import COMPILED_ENGINE, jsonschema_engine
+from scripts.validate_schema import main
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _write(path: Path, payload: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+@pytest.fixture()
+def schema_path(tmp_path: Path) -> Path:
+    root = tmp_path / "schema"
+    _write(root / "fields" / "identifier.json", {"type": "string", "pattern": "^[a-z0-9_]+$"})
+    _write(
+        root / "item_base.json",
+        {
+            "type": "object",
+            "required": ["id", "item_type"],
+            "properties": {"id": {"$ref": "./fields/identifier.json"}, "item_type": {"type": "string"}},
+        },
+    )
+    return root / "item_base.json"
+
+
+@pytest.fixture()
+def corpus(tmp_path: Path) -> Path:
+    root = tmp_path / "data"
+    for index in range(5):
+        _write(root / "personal" / "task" / "2024" / f"item_{index}" / "item.json", {"id": f"t{index}", "item_type": "task"})
+    _write(root / "family" / "note" / "2024" / "bad" / "item.json", {"id": "Bad Id", "item_type": "note"})
+    broken = root / "family" / "note" / "2024" / "broken" / "item.json"
+    broken.parent.mkdir(parents=True)
+    broken.write_text("{not json", encoding="utf-8")
+    return root
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_validate_bulk_reports_invalid_and_failed_items(corpus: Path, schema_path: Path, workers: int) -> None:
+    errors = io.StringIO()
+    report = validate_bulk(
+        iter_sources(corpus, "item.json"),
+        schema_path=schema_path,
+        workers=workers,
+        shard_size=2,
+        errors_out=errors,
+    )
+
+    assert (report.valid, report.invalid, len(report.failed)) == (5, 1, 1)
+    assert report.processed == 7
+    assert report.bytes_read > 0
+    records = [json.loads(line) for line in errors.getvalue().splitlines()]
+    invalid = [record for record in records if "errors" in record]
+    assert [{key: value for key, value in record.items() if key != "errors"} for record in invalid] == [
+        {
+            "source": str(corpus / "family" / "note" / "2024" / "bad" / "item.json"),
+            "valid": False,
+            "item_id": "Bad Id",
+            "item_type": "note",
+        }
+    ]
+    # jsonschema and the compiled validator word pattern errors differently.
+    [error] = invalid[0]["errors"]
+    assert error["path"] == "id" and "^[a-z0-9_]+$" in error["message"]
+    assert [record["source"].endswith("broken/item.json") for record in records if "error" in record] == [True]
+
+
+def test_jsonl_stream_sources(schema_path: Path, tmp_path: Path) -> None:
+    stream = io.StringIO('{"id": "a", "item_type": "task"}\n\n{"id": "a"}\n')
+    units = list(iter_jsonl(stream, "items.jsonl"))
+    assert [source for source, _ in units] == ["items.jsonl:1", "items.jsonl:3"]
+
+    errors = io.StringIO()
+    report = validate_bulk(units, schema_path=schema_path, workers=0, errors_out=errors)
+    assert (report.valid, report.invalid) == (1, 1)
+    assert json.loads(errors.getvalue())["errors"] == [{"path": "", "message": "'item_type' is a required property"}]
+
+    jsonl = tmp_path / "items.jsonl"
+    jsonl.write_text(stream.getvalue(), encoding="utf-8")
+    assert [source for source, _ in iter_sources(jsonl)] == [f"{jsonl}:1", f"{jsonl}:3"]
+
+
+def test_script_bulk_writes_report_and_summary(corpus: Path, schema_path: Path, tmp_path: Path, capsys) -> None:
+    report_path = tmp_path / "out" / "errors.jsonl"
+    code = main(
+        [
+            "--bulk",
+            str(corpus),
+            "--schema",
+            str(schema_path),
+            "--pattern",
+            "item.json",
+            "--workers",
+            "0",
+            "--report",
+            str(report_path),
+            "--no-cache",
+        ]
+    )
+
+    assert code == 1
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["processed"] == 7
+    assert summary["invalid"] == 1 and summary["failed"] == 1
+    assert summary["items_per_second"] > 0
+    assert len(report_path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_bulk_rejects_values_below_schema_minimum(tmp_path: Path) -> None:
+    item = json.loads((REPO_ROOT / "tests" / "fixtures" / "items" / "task.json").read_text(encoding="utf-8"))
+    item["derived"]["progress_summary"].update(total=-5, completed=-9)
+    _write(tmp_path / "item.json", item)
+
+    report = validate_bulk(iter_sources(tmp_path), schema_path=DEFAULT_SCHEMA_PATH, workers=0)
+
+    assert (report.valid, report.invalid) == (0, 1)
+
+
+def test_bulk_workers_use_the_shared_validator_factory(schema_path: Path, monkeypatch) -> None:
+    built = []
+    build_validator = bulk_module.build_validator
+
+    def _build(path):
+        built.append(path)
+        return build_validator(path)
+
+    monkeypatch.setattr(bulk_module, "build_validator", _build)
+    monkeypatch.setattr(bulk_module, "_WORKER_VALIDATOR", None)
+    stream = io.StringIO('{"id": "a", "item_type": "task"}\n')
+
+    assert validate_bulk(iter_jsonl(stream, "items.jsonl"), schema_path=schema_path, workers=0).valid == 1
+    assert built == [str(schema_path.resolve())]
+
+    monkeypatch.setattr(bulk_module, "_jsonschema", lambda: SimpleNamespace())
+    assert validator_engine() == jsonschema_engine()
+    monkeypatch.setattr(bulk_module, "_jsonschema", lambda: None)
+    assert validator_engine() == COMPILED_ENGINE
+
+
+def test_jsonschema_validator_resolves_refs_without_network(tmp_path: Path) -> None:
+    jsonschema = pytest.importorskip("jsonschema")
+    base = "https://schemas.example.invalid/schema"
+    _write(tmp_path / "fields" / "count.json", {"$id": f"{base}/fields/count.json", "type": "integer", "minimum": 0})
+    _write(
+        tmp_path / "item.json",
+        {"$id": f"{base}/item.json", "type": "object", "properties": {"total": {"$ref": "./fields/count.json"}}},
+    )
+
+    validator = bulk_module.build_validator(tmp_path / "item.json")
+
+    assert isinstance(validator, jsonschema.Draft7Validator)
+    assert validator.is_valid({"total": 3})
+    assert [list(error.path) for error in validator.iter_errors({"total": -5})] == [["total"]]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import kernel.validation.cache as cache_module
+from kernel.validation import ValidationCache
+from kernel.validation.bulk import iter_sources, validate_bulk, validator_engine
+from kernel.validation.cache import COMPILED_ENGINE, content_digest, item_digest
+
+
+def _write(path: Path, payload: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+@pytest.fixture()
+def schema_path(tmp_path: Path) -> Path:
+    root = tmp_path / "schema"
+    _write(root / "fields" / "identifier.json", {"type": "string", "pattern": "^[a-z0-9_]+$"})
+    _write(
+        root / "item_base.json",
+        {
+            "type": "object",
+            "required": ["id", "item_type"],
+            "properties": {"id": {"$ref": "./fields/identifier.json"}, "item_type": {"type": "string"}},
+        },
+    )
+    return root / "item_base.json"
+
+
+def test_cache_round_trip_and_schema_invalidation(schema_path: Path, tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    cache = ValidationCache.for_schema(schema_path, engine="test", cache_dir=cache_dir)
+    assert cache.get("a") is None
+    cache.put("a", [])
+    cache.put("b", [(["id"], "bad id")])
+    assert cache.save()
+    assert not cache.save()
+
+    reopened = ValidationCache.for_schema(schema_path, engine="test", cache_dir=cache_dir)
+    assert reopened.get("a") == ()
+    assert reopened.get("b") == ((("id",), "bad id"),)
+    assert (reopened.hits, reopened.misses) == (2, 0)
+    assert len(ValidationCache.for_schema(schema_path, engine="other", cache_dir=cache_dir)) == 0
+
+    # Editing a referenced document changes the graph checksum.
+    _write(schema_path.parent / "fields" / "identifier.json", {"type": "string"})
+    assert len(ValidationCache.for_schema(schema_path, engine="test", cache_dir=cache_dir)) == 0
+
+
+def test_default_cache_dir_ignores_working_directory(schema_path: Path, tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("KERNEL_VALIDATION_CACHE_DIR", raising=False)
+    assert cache_module.default_cache_dir() == Path(__file__).resolve().parents[2] / "var" / "validation"
+
+    monkeypatch.setenv("KERNEL_VALIDATION_CACHE_DIR", str(tmp_path / "shared"))
+    cache = ValidationCache.for_schema(schema_path, engine="test")
+    assert cache.path.parent == tmp_path / "shared"
+    assert not (tmp_path / "var").exists()
+
+
+def test_jsonschema_engine_tag_carries_the_version(monkeypatch) -> None:
+    monkeypatch.setattr(cache_module, "version", lambda name: "4.23.0")
+    assert cache_module.jsonschema_engine() == "jsonschema-4.23.0"
+
+    def _missing(name: str) -> str:
+        raise cache_module.PackageNotFoundError(name)
+
+    monkeypatch.setattr(cache_module, "version", _missing)
+    assert cache_module.jsonschema_engine() == "jsonschema"
+
+
+def test_compiled_engine_tag_tracks_the_compiler_source() -> None:
+    source = (Path(cache_module.__file__).parent / "compiler.py").read_bytes()
+    assert COMPILED_ENGINE == f"kernel.validation-{hashlib.sha256(source).hexdigest()[:12]}"
+
+
+def test_cache_bounds_entries(tmp_path: Path) -> None:
+    cache = ValidationCache(tmp_path / "results.json", "fp", max_entries=2)
+    for digest in ("a", "b", "c"):
+        cache.put(digest, [])
+    cache.save()
+
+    assert sorted(ValidationCache(tmp_path / "results.json", "fp").results) == ["b", "c"]
+    assert item_digest({"b": 1, "a": [2]}) == item_digest({"a": [2], "b": 1})
+    assert content_digest("x") == content_digest(b"x")
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_bulk_validation_reuses_cached_results(schema_path: Path, tmp_path: Path, workers: int) -> None:
+    corpus = tmp_path / "data"
+    for index in range(3):
+        _write(corpus / f"item_{index}" / "item.json", {"id": f"t{index}", "item_type": "task"})
+    _write(corpus / "bad" / "item.json", {"id": "Bad Id", "item_type": "note"})
+    cache_dir = tmp_path / "cache"
+
+    def _run() -> tuple:
+        cache = ValidationCache.for_schema(schema_path, engine=validator_engine(), cache_dir=cache_dir)
+        errors = io.StringIO()
+        report = validate_bulk(
+            iter_sources(corpus, "item.json"), schema_path=schema_path, workers=workers, errors_out=errors, cache=cache
+        )
+        return report, errors.getvalue()
+
+    first, first_errors = _run()
+    assert (first.valid, first.invalid, first.cached) == (3, 1, 0)
+
+    _write(corpus / "item_0" / "item.json", {"id": "Changed", "item_type": "task"})
+    second, second_errors = _run()
+    assert (second.valid, second.invalid, second.cached) == (2, 2, 3)
+    records = sorted(json.loads(line)["source"] for line in second_errors.splitlines())
+    assert [Path(source).parent.name for source in records] == ["bad", "item_0"]
+    [first_error] = json.loads(first_errors)["errors"]
+    [cached_error] = json.loads(next(line for line in second_errors.splitlines() if "bad" in line))["errors"]
+    assert first_error["path"] == "id" and "^[a-z0-9_]+$" in first_error["message"]
+    assert cached_error == first_error
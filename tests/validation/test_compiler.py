@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Mapping
+
+import pytest
+
+from kernel.registry import SchemaLoader, TypeRegistry
+from kernel.validation import SchemaCompiler, ValidationError, compile_validator
+from scripts.jsonschema_stub import Draft7Validator, RefResolver
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCHEMA_PATH = REPO_ROOT / "schema" / "item_base.json"
+FIXTURE_DIRS = (REPO_ROOT / "tests" / "fixtures" / "items", REPO_ROOT / "tests" / "fixtures" / "items_invalid")
+
+
+def _write(path: Path, payload: Mapping[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _stub_validator() -> Draft7Validator:
+    schema = json.loads(SCHEMA_PATH.read_text(encoding="utf-8"))
+    schema["__base_path__"] = SCHEMA_PATH.parent
+    resolver = RefResolver(base_uri=SCHEMA_PATH.parent.as_uri() + "/", referrer=schema)
+    return Draft7Validator(schema, resolver=resolver)
+
+
+def _errors(validator: Any, instance: Any) -> list:
+    return [(error.message, error.path) for error in validator.iter_errors(instance)]
+
+
+@pytest.fixture()
+def schema_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "schema"
+    _write(directory / "fields" / "timestamp.json", {"type": "string", "pattern": "^\\d{4}-\\d{2}-\\d{2}$"})
+    _write(
+        directory / "fields" / "node.json",
+        {
+            "type": "object",
+            "required": ["at"],
+            "properties": {
+                "at": {"$ref": "./timestamp.json"},
+                "children": {"type": "array", "items": {"$ref": "./node.json"}},
+            },
+            "additionalProperties": False,
+        },
+    )
+    _write(
+        directory / "item.json",
+        {
+            "type": "object",
+            "properties": {
+                "root": {"$ref": "./fields/node.json"},
+                "stamp": {"$ref": "./fields/node.json#/properties/at"},
+            },
+        },
+    )
+    return directory
+
+
+def test_compiled_validator_matches_fallback_on_fixtures() -> None:
+    stub = _stub_validator()
+    compiled = compile_validator(SCHEMA_PATH)
+
+    fixtures = [path for directory in FIXTURE_DIRS for path in sorted(directory.glob("*.json"))]
+    assert fixtures
+    for path in fixtures:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        expected = _errors(stub, payload)
+        assert _errors(compiled, payload) == expected, path.name
+        assert compiled.is_valid(payload) is (not expected)
+
+
+def test_recursive_and_fragment_refs(schema_dir: Path) -> None:
+    validator = SchemaCompiler(schema_dir).validator_for("item.json")
+
+    valid = {"root": {"at": "2024-01-01", "children": [{"at": "2024-01-02", "children": []}]}, "stamp": "2024-01-03"}
+    assert validator.is_valid(valid)
+    assert list(validator.iter_errors(valid)) == []
+
+    invalid = {"root": {"at": "2024-01-01", "children": [{"at": "soon", "extra": 1}]}, "stamp": 3}
+    assert _errors(validator, invalid) == [
+        ("String does not match pattern ^\\d{4}-\\d{2}-\\d{2}$", ["root", "children", 0, "at"]),
+        ("Additional properties are not allowed ('extra')", ["root", "children", 0, "extra"]),
+        ("Expected type string, got int", ["stamp"]),
+    ]
+    assert not validator.is_valid(invalid)
+    with pytest.raises(ValidationError):
+        validator.validate(invalid)
+
+
+def test_documents_are_read_once(schema_dir: Path, monkeypatch) -> None:
+    compiler = SchemaCompiler(schema_dir)
+    opened: list = []
+    original_open = Path.open
+
+    def _open(self: Path, *args: Any, **kwargs: Any):
+        opened.append(self.name)
+        return original_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", _open)
+    validator = compiler.validator_for("item.json")
+    for _ in range(5):
+        validator.is_valid({"root": {"at": "2024-01-01"}})
+    compiler.validator_for("fields/node.json")
+
+    assert sorted(opened) == ["item.json", "node.json", "timestamp.json"]
+    assert compiler.graph.dependents("fields/timestamp.json") == ("fields/node.json", "item.json")
+
+
+def test_loader_invalidation_recompiles_in_place(schema_dir: Path, tmp_path: Path) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), tmp_path / "manifest")
+    loader.load()
+    compiler = SchemaCompiler.from_loader(loader)
+    validator = compiler.validator_for("item.json")
+    assert validator.is_valid({"stamp": "2024-01-01"})
+
+    _write(schema_dir / "fields" / "timestamp.json", {"type": "integer"})
+    report = loader.load(verify=True)
+
+    assert report.invalidated == ["fields/timestamp.json", "fields/node.json", "item.json"]
+    assert not validator.is_valid({"stamp": "2024-01-01"})
+    assert validator.is_valid({"stamp": 20240101})
+
+
+def test_one_of_dispatch_narrows_candidates(tmp_path: Path) -> None:
+    root = tmp_path / "schema"
+    _write(root / "user.json", {"type": "object", "required": ["id", "display_name"]})
+    _write(root / "link.json", {"type": "object", "properties": {"kind": {"const": "link"}}})
+    _write(root / "status.json", {"type": "string", "enum": ["open", "closed"]})
+    options = [
+        {"type": "number"},
+        {"$ref": "./status.json"},
+        {"$ref": "./user.json"},
+        {"$ref": "./link.json"},
+        {"type": "array", "items": {"$ref": "./user.json"}},
+        {"type": "array", "items": {"type": "string"}},
+    ]
+    _write(root / "item.json", {"oneOf": options})
+    compiler = SchemaCompiler(root)
+    validator = compiler.validator_for("item.json")
+    candidates = compiler._dispatch(options, "item.json")
+
+    assert len(candidates(3)) == 1
+    assert len(candidates("open")) == 1
+    assert candidates("pending") == ()
+    assert len(candidates({"id": "u1", "display_name": "Ada"})) == 2
+    assert len(candidates({"kind": "note"})) == 0
+    assert len(candidates([{"id": "u1", "display_name": "Ada"}])) == 1
+    assert len(candidates(["a", "b"])) == 1
+    assert len(candidates([])) == 2
+
+    assert validator.is_valid("open")
+    assert not validator.is_valid("pending")
+    # Matches both the user and the (unconstrained) link branch.
+    assert _errors(validator, {"id": "u1", "display_name": "Ada"}) == [("oneOf constraints not satisfied", [])]
+    assert _errors(validator, []) == [("oneOf constraints not satisfied", [])]
+
+
+def test_one_of_dispatch_matches_fallback_per_field_value() -> None:
+    stub = _stub_validator()
+    compiled = compile_validator(SCHEMA_PATH)
+    samples: list = ["text", 3, 2.5, True, None, [], {}, ["tag"], [1], {"ops": []}, [{"id": "x"}]]
+    for directory in FIXTURE_DIRS:
+        for path in sorted(directory.glob("*.json")):
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            samples.extend(payload.get("fields", {}).values())
+            samples.extend(payload.get("derived", {}).values())
+
+    envelope = json.loads((FIXTURE_DIRS[0] / "task.json").read_text(encoding="utf-8"))
+    for value in samples:
+        candidate = dict(envelope, fields={"probe": value}, derived={"probe": value})
+        assert _errors(compiled, candidate) == _errors(stub, candidate), value
+
+
+NUMERIC_SCHEMAS = (
+    {"type": "integer", "minimum": 0, "maximum": 3},
+    {"type": "number", "exclusiveMinimum": 0, "exclusiveMaximum": 3},
+    {"type": "object", "properties": {"total": {"type": "integer", "minimum": 0}}},
+)
+NUMERIC_SAMPLES = (-5, 0, 1.5, 3, 99, True, "7", {"total": -9}, {"total": 4})
+
+
+@pytest.mark.parametrize("schema", NUMERIC_SCHEMAS)
+def test_numeric_bounds_match_fallback(tmp_path: Path, schema: Mapping[str, Any]) -> None:
+    _write(tmp_path / "bounds.json", schema)
+    compiled = compile_validator(tmp_path / "bounds.json")
+    stub = Draft7Validator(schema)
+
+    for value in NUMERIC_SAMPLES:
+        assert _errors(compiled, value) == _errors(stub, value), value
+        assert compiled.is_valid(value) is (not _errors(stub, value))
+
+
+def test_minimum_and_maximum_are_enforced(tmp_path: Path) -> None:
+    _write(tmp_path / "bounds.json", {"minimum": 0, "maximum": 3})
+    validator = compile_validator(tmp_path / "bounds.json")
+
+    assert _errors(validator, -5) == [("-5 is less than the minimum of 0", [])]
+    assert _errors(validator, 99) == [("99 is greater than the maximum of 3", [])]
+    assert validator.is_valid(0) and validator.is_valid(3) and validator.is_valid("not a number")
+
+
+@pytest.mark.parametrize("schema", NUMERIC_SCHEMAS)
+def test_numeric_bounds_match_jsonschema(tmp_path: Path, schema: Mapping[str, Any]) -> None:
+    jsonschema = pytest.importorskip("jsonschema")
+    _write(tmp_path / "bounds.json", schema)
+    compiled = compile_validator(tmp_path / "bounds.json")
+    reference = jsonschema.Draft7Validator(schema)
+
+    for value in NUMERIC_SAMPLES:
+        assert compiled.is_valid(value) is reference.is_valid(value), value
+        # Type errors are worded like the fallback validator; bound errors match jsonschema.
+        expected = sorted(
+            (error.message, list(error.path)) for error in reference.iter_errors(value) if error.validator != "type"
+        )
+        assert sorted(error for error in _errors(compiled, value) if not error[0].startswith("Expected")) == expected
+
+
+@pytest.mark.parametrize(
+    "schema",
+    (
+        {"type": "integer", "multipleOf": 2},
+        {"allOf": [{"type": "string"}]},
+        {"type": "array", "items": [{"type": "string"}]},
+        {"type": "object", "propertyNames": {"maxLength": 3}},
+    ),
+)
+def test_unimplemented_keywords_are_rejected(tmp_path: Path, schema: Mapping[str, Any]) -> None:
+    _write(tmp_path / "unsupported.json", schema)
+    with pytest.raises(ValueError, match="Unsupported schema keywords in unsupported.json"):
+        compile_validator(tmp_path / "unsupported.json")
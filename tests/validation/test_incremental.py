@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+from typing import Any, Mapping
+
+import pytest
+
+from kernel.registry import SchemaLoader, TypeRegistry
+from kernel.validation import (
+    IncrementalValidator,
+    SchemaCompiler,
+    compile_validator,
+    parse_pointer,
+    touched_pointers,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCHEMA_PATH = REPO_ROOT / "schema" / "item_base.json"
+FIXTURE_DIR = REPO_ROOT / "tests" / "fixtures" / "items"
+
+
+def _write(path: Path, payload: Mapping[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _full(validator: Any, item: Any) -> list:
+    errors = [(error.message, error.path) for error in validator.iter_errors(item)]
+    return sorted(errors, key=lambda error: [str(part) for part in error[1]])
+
+
+def _errors(result: Any) -> list:
+    return [(error.message, error.path) for error in result.errors]
+
+
+@pytest.fixture()
+def schema_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "schema"
+    _write(directory / "fields" / "stamp.json", {"type": "string", "pattern": "^\\d{4}$"})
+    _write(
+        directory / "item.json",
+        {
+            "type": "object",
+            "required": ["id", "meta"],
+            "properties": {
+                "id": {"type": "string"},
+                "meta": {
+                    "type": "object",
+                    "required": ["created"],
+                    "properties": {"created": {"$ref": "./fields/stamp.json"}},
+                    "additionalProperties": False,
+                },
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "fields": {"type": "object", "additionalProperties": {"type": "integer"}},
+            },
+        },
+    )
+    return directory
+
+
+def test_parse_pointer_and_touched_pointers() -> None:
+    assert parse_pointer("") == ()
+    assert parse_pointer("/a~1b/m~0n/0") == ("a/b", "m~n", "0")
+    with pytest.raises(ValueError):
+        parse_pointer("fields")
+
+    patch = [
+        {"op": "replace", "path": "/fields/a/b", "value": 1},
+        {"op": "add", "path": "/fields/a", "value": {}},
+        {"op": "test", "path": "/id", "value": "x"},
+        {"op": "move", "from": "/tags/0", "path": "/meta/tag"},
+        {"op": "copy", "from": "/id", "path": "/fields/id"},
+    ]
+    assert touched_pointers(patch) == (("fields", "a"), ("fields", "id"), ("meta", "tag"), ("tags", "0"))
+    with pytest.raises(ValueError):
+        touched_pointers([{"op": "merge", "path": "/id"}])
+
+
+def test_patches_revalidate_only_touched_units(schema_dir: Path) -> None:
+    validator = SchemaCompiler(schema_dir).validator_for("item.json")
+    incremental = IncrementalValidator(validator)
+    item = {"id": "n1", "meta": {"created": "2024"}, "tags": ["a"], "fields": {"x": 1, "y": 2, "z": 3}}
+
+    first = incremental.validate(item)
+    assert first.valid
+    assert (first.revalidated, first.reused) == (9, 0)
+
+    item["fields"]["y"] = "two"
+    result = incremental.validate_patch(item, [{"op": "replace", "path": "/fields/y", "value": "two"}])
+    assert _errors(result) == [("Expected type integer, got str", ["fields", "y"])]
+    assert (result.revalidated, result.reused) == (1, 8)
+
+    del item["meta"]["created"]
+    item["meta"]["extra"] = True
+    result = incremental.validate_patch(
+        item,
+        [{"op": "remove", "path": "/meta/created"}, {"op": "add", "path": "/meta/extra", "value": True}],
+    )
+    assert _errors(result) == _full(validator, item)
+    assert [path for _, path in _errors(result)] == [["fields", "y"], ["meta"], ["meta", "extra"]]
+
+    item["meta"] = {"created": "2025"}
+    item["fields"]["y"] = 2
+    result = incremental.validate_patch(
+        item,
+        [{"op": "replace", "path": "/meta", "value": item["meta"]}, {"op": "replace", "path": "/fields/y", "value": 2}],
+    )
+    assert result.valid
+    assert result.revalidated == 3
+
+
+def test_patches_match_full_validation_on_fixtures() -> None:
+    validator = compile_validator(SCHEMA_PATH)
+    incremental = IncrementalValidator(validator)
+    edits = [
+        ("replace", "/title", 42),
+        ("replace", "/realm/id", "family"),
+        ("add", "/fields/extra", {"unexpected": [1, 2]}),
+        ("add", "/unknown_top_level", True),
+        ("remove", "/summary", None),
+        ("replace", "/fields", []),
+        ("replace", "", {"id": "replaced"}),
+    ]
+    for path in sorted(FIXTURE_DIR.glob("*.json")):
+        original = json.loads(path.read_text(encoding="utf-8"))
+        for op, pointer, value in edits:
+            item = copy.deepcopy(original)
+            incremental.validate(item)
+            tokens = parse_pointer(pointer)
+            if not tokens:
+                item = dict(value, id=item["id"])
+            elif op == "remove":
+                item.pop(tokens[0], None)
+            else:
+                parent = item
+                for token in tokens[:-1]:
+                    parent = parent[token]
+                parent[tokens[-1]] = copy.deepcopy(value)
+            result = incremental.validate_patch(item, [{"op": op, "path": pointer, "value": value}])
+            assert _errors(result) == _full(validator, item), (path.name, pointer)
+
+
+def test_falls_back_to_full_validation_and_bounds_state(schema_dir: Path) -> None:
+    validator = SchemaCompiler(schema_dir).validator_for("item.json")
+    incremental = IncrementalValidator(validator, max_items=1)
+    patch = [{"op": "replace", "path": "/fields/x", "value": 1}]
+
+    result = incremental.validate_patch({"id": "a", "meta": {"created": "2024"}, "fields": {"x": 1}}, patch)
+    assert result.reused == 0 and result.revalidated == 6
+    incremental.validate({"id": "b", "meta": {"created": "2024"}, "fields": {"x": 1}})
+
+    result = incremental.validate_patch({"id": "a", "meta": {"created": "2024"}, "fields": {"x": 1}}, patch)
+    assert result.reused == 0
+    result = incremental.validate_patch({"id": "a", "meta": {"created": "2024"}, "fields": {"x": 1}}, patch)
+    assert (result.revalidated, result.reused) == (1, 5)
+
+    incremental.forget("a")
+    assert incremental.validate_patch({"id": "a", "meta": {"created": "2024"}}, patch).reused == 0
+
+
+def test_schema_invalidation_drops_cached_results(schema_dir: Path, tmp_path: Path) -> None:
+    loader = SchemaLoader(schema_dir, TypeRegistry(), tmp_path / "manifest")
+    loader.load()
+    compiler = SchemaCompiler.from_loader(loader)
+    incremental = IncrementalValidator(compiler.validator_for("item.json"))
+    item = {"id": "n1", "meta": {"created": "2024"}, "fields": {"x": 1}}
+    assert incremental.validate(item).valid
+
+    _write(schema_dir / "fields" / "stamp.json", {"type": "integer"})
+    loader.load(verify=True)
+
+    item["fields"]["x"] = 2
+    result = incremental.validate_patch(item, [{"op": "replace", "path": "/fields/x", "value": 2}])
+    assert result.reused == 0
+    assert _errors(result) == [("Expected type integer, got str", ["meta", "created"])]